@@ -0,0 +1,44 @@
+# -*- coding: utf-8 -*-
+"""
+Compares HTML_PATTERN with html_headings on large HTML extract.
+
+    python3 benchmarks/html_headings_benchmark.py [sections]
+"""
+import os
+import sys
+import timeit
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from wikipediaapi.wikipedia import HTML_PATTERN, html_headings  # noqa: E402
+
+
+def extract(sections):
+    parts = ['<p><b>Summary</b> text</p>\n']
+    for i in range(sections):
+        parts.append(
+            '<h{0}><span id="s{1}"></span><span id="t{1}">Section {1}</span>'
+            '<span>Edit</span></h{0}>\n'.format(2 + i % 4, i)
+        )
+        parts.append('<p>' + 'Paragraph with <b>some</b> text. ' * 40 + '</p>\n')
+    return ''.join(parts)
+
+
+def main():
+    sections = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    text = extract(sections)
+    number = 10
+
+    regex = timeit.timeit(
+        lambda: list(HTML_PATTERN.finditer(text)), number=number
+    ) / number
+    scanner = timeit.timeit(
+        lambda: list(html_headings(text)), number=number
+    ) / number
+    print("extract:       {:10d} chars".format(len(text)))
+    print("HTML_PATTERN:  {:10.2f} ms".format(regex * 1000))
+    print("html_headings: {:10.2f} ms".format(scanner * 1000))
+
+
+if __name__ == '__main__':
+    main()
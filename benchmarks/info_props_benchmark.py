@@ -0,0 +1,44 @@
+# -*- coding: utf-8 -*-
+"""
+Compares size of prop=info responses for all inprop values and for
+projection of few attributes. It sends requests to the live API.
+
+    python3 benchmarks/info_props_benchmark.py [attribute ...]
+"""
+import json
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+import wikipediaapi  # noqa: E402
+
+TITLES = [
+    'Python (programming language)',
+    'Wikipedia',
+    'Prague',
+    'Albert Einstein',
+    'Earth',
+]
+
+
+def response_size(wiki, props):
+    page = wiki.page('|'.join(TITLES))
+    raw = wiki._query(page, wiki._info_params(page.title, props))
+    return len(json.dumps(raw, separators=(',', ':')).encode('utf-8'))
+
+
+def main():
+    attributes = sys.argv[1:] or ['length', 'lastrevid']
+    wiki = wikipediaapi.Wikipedia('en')
+    projected = wikipediaapi.info_props(attributes)
+
+    full = response_size(wiki, wikipediaapi.INFO_PROPS)
+    small = response_size(wiki, projected)
+    print("all inprop:       {:8d} B".format(full))
+    print("inprop={:10} {:8d} B".format('|'.join(projected) or '-', small))
+    print("saved:            {:8.1f} %".format(100.0 * (full - small) / full))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,64 @@
+# -*- coding: utf-8 -*-
+"""
+Memory of link titles of synthetic crawl with and without TitlePool.
+
+Links of every page are parsed from their own JSON response, so every
+title is a new string, as it is when pages are fetched.
+
+    python3 benchmarks/title_pool_benchmark.py [edges]
+"""
+import json
+import os
+import random
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from wikipediaapi.titles import TitlePool  # noqa: E402
+
+LINKS_PER_PAGE = 500
+VOCABULARY = 50000
+
+
+def responses(edges):
+    rnd = random.Random(0)
+    titles = ['Linked page number {}'.format(i) for i in range(VOCABULARY)]
+    for page in range(edges // LINKS_PER_PAGE):
+        # half of links goes to a few popular pages
+        links = [
+            {'ns': 0, 'title': titles[
+                int(rnd.paretovariate(1.2)) % VOCABULARY
+                if rnd.random() < 0.5 else rnd.randrange(VOCABULARY)
+            ]}
+            for _ in range(LINKS_PER_PAGE)
+        ]
+        yield 'Page {}'.format(page), json.dumps({'links': links})
+
+
+def crawl(edges, intern):
+    graph = {}
+    tracemalloc.start()
+    start = time.perf_counter()
+    for title, response in responses(edges):
+        graph[title] = [intern(link['title']) for link in json.loads(response)['links']]
+    elapsed = time.perf_counter() - start
+    memory, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return memory, elapsed
+
+
+def main():
+    edges = int(sys.argv[1]) if len(sys.argv) > 1 else 1000000
+    pool = TitlePool()
+    plain, plain_time = crawl(edges, lambda title: title)
+    pooled, pooled_time = crawl(edges, lambda title: pool.intern('en', title))
+    print("edges:     {:10d}".format(edges))
+    print("titles:    {:10d}".format(len(pool)))
+    print("plain:     {:10.1f} MB {:8.2f} s".format(plain / 2 ** 20, plain_time))
+    print("TitlePool: {:10.1f} MB {:8.2f} s".format(pooled / 2 ** 20, pooled_time))
+
+
+if __name__ == '__main__':
+    main()
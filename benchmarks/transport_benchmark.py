@@ -0,0 +1,53 @@
+# -*- coding: utf-8 -*-
+"""
+Compares transports on concurrent requests against local stub server.
+
+    python3 benchmarks/transport_benchmark.py [requests] [workers]
+"""
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'tests'))
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+import wikipediaapi  # noqa: E402
+from wikipediaapi.transport import RequestsTransport, HttpxTransport  # noqa: E402
+from stub_server import StubServer  # noqa: E402
+
+
+def run(transport, api_url, count, workers):
+    wiki = wikipediaapi.Wikipedia(
+        'en',
+        api_url=api_url,
+        transport=transport,
+        pool_size=workers
+    )
+    start = time.perf_counter()
+    wiki.map(lambda p: len(p.links), ['Test_1'] * count, workers=workers)
+    elapsed = time.perf_counter() - start
+    transport.close()
+    return elapsed
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 1000
+    workers = int(sys.argv[2]) if len(sys.argv) > 2 else 32
+
+    transports = [('requests', lambda: RequestsTransport(workers))]
+    try:
+        import httpx  # noqa: F401
+        transports.append(('httpx', lambda: HttpxTransport(workers)))
+    except ImportError:
+        print("httpx is not installed, skipping HttpxTransport")
+
+    with StubServer() as server:
+        for name, factory in transports:
+            elapsed = run(factory(), server.api_url, count, workers)
+            print("{:10} {:6d} requests {:8.3f}s {:10.1f} req/s".format(
+                name, count, elapsed, count / elapsed
+            ))
+
+
+if __name__ == '__main__':
+    main()
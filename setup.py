@@ -48,6 +48,9 @@ setup(
     zip_safe=False,
     extras_require={
         'testing': tests_require,
+        'http2': ['httpx[http2]'],
+        'stats': ['numpy'],
+        'arrow': ['pyarrow'],
     },
     install_requires=requires,
     platforms='any',
@@ -0,0 +1,97 @@
+# -*- coding: utf-8 -*-
+import os
+import shutil
+import tempfile
+import unittest
+
+from mock_data import create_wiki
+from wikipediaapi import bundle
+
+
+class TestBundle(unittest.TestCase):
+    def setUp(self):
+        self.wiki = create_wiki("en")
+        self.tmp_dir = tempfile.mkdtemp()
+        self.path = os.path.join(self.tmp_dir, 'pages.bundle')
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp_dir)
+
+    def fetched_page(self):
+        page = self.wiki.page('Test_1')
+        page.sections
+        page.links
+        page.langlinks
+        return page
+
+    def offline_wiki(self, **kwargs):
+        def fail(page, params):
+            raise AssertionError("Unexpected request: " + str(params))
+
+        return create_wiki("en", query=fail, **kwargs)
+
+    def test_roundtrip(self):
+        page = self.fetched_page()
+        restored = bundle.loads(self.offline_wiki(), bundle.dumps(page))
+        self.assertEqual(restored.title, 'Test 1')
+        self.assertEqual(restored.pageid, 4)
+        self.assertEqual(restored.text, page.text)
+        self.assertEqual(restored.section_titles, page.section_titles)
+        self.assertEqual(
+            restored.section_by_title('Section 4.2.1').text,
+            'Text for section 4.2.1'
+        )
+        self.assertEqual(sorted(restored.links.keys()), sorted(page.links.keys()))
+        self.assertEqual(
+            restored.langlinks['l1'].fullurl,
+            'https://l1.wikipedia.org/wiki/Test_1_-_1'
+        )
+
+    def test_called_flags(self):
+        page = self.wiki.page('Test_1')
+        page.links
+        restored = bundle.loads(self.wiki, bundle.dumps(page))
+        self.assertTrue(restored._called['links'])
+        self.assertFalse(restored._called['categories'])
+
+    def test_bundle(self):
+        page = self.fetched_page()
+        other = self.wiki.page('Test_2')
+        other.links
+        with bundle.BundleWriter(self.path) as writer:
+            writer.add(page)
+            writer.add(other)
+
+        with bundle.Bundle(self.offline_wiki(), self.path) as b:
+            self.assertEqual(len(b), 2)
+            self.assertIn('en:Test 2', b)
+            self.assertEqual(len(b['en:Test 2'].links), 5)
+            self.assertEqual(b.page('Test 1').summary, 'Summary text')
+
+    def test_invalid_bundle(self):
+        with open(self.path, 'wb') as f:
+            f.write(b'x' * 64)
+        with self.assertRaises(ValueError):
+            bundle.Bundle(self.wiki, self.path)
+
+    def test_short_bundle(self):
+        for content in [b'', b'WAPB']:
+            with open(self.path, 'wb') as f:
+                f.write(content)
+            with self.assertRaises(ValueError):
+                bundle.Bundle(self.wiki, self.path)
+
+    def test_outline_and_info_props(self):
+        wiki = create_wiki("en", lazy_sections=True)
+        page = wiki.page('Test_1')
+        page.section_titles
+        wiki.fetch_info([page], attributes=['fullurl'])
+        self.assertFalse(page._called['structured'])
+        restored = bundle.loads(
+            self.offline_wiki(lazy_sections=True),
+            bundle.dumps(page)
+        )
+        self.assertEqual(restored.section_titles, page.section_titles)
+        self.assertEqual(restored._outline, page._outline)
+        self.assertEqual(restored._info_props, page._info_props)
+        self.assertEqual(restored.fullurl, page.fullurl)
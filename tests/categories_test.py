@@ -1,15 +1,13 @@
 # -*- coding: utf-8 -*-
 from collections import defaultdict
 import unittest
-import wikipediaapi
 
-from mock_data import wikipedia_api_request
+from mock_data import create_wiki
 
 
 class TestCategories(unittest.TestCase):
     def setUp(self):
-        self.wiki = wikipediaapi.Wikipedia("en")
-        self.wiki._query = wikipedia_api_request
+        self.wiki = create_wiki("en")
 
     def test_categories_count(self):
         page = self.wiki.page('Test_1')
@@ -0,0 +1,143 @@
+# -*- coding: utf-8 -*-
+import unittest
+
+from mock_data import create_wiki, wikipedia_api_request
+from wikipediaapi.changes import ChangeTracker, RecentChangesFeed
+
+RECENT_CHANGES = [
+    {
+        "batchcomplete": "",
+        "continue": {"rccontinue": "20180101000002|3", "continue": "-||"},
+        "query": {
+            "recentchanges": [
+                {"type": "edit", "ns": 0, "title": "Test 1", "rcid": 1,
+                 "timestamp": "2018-01-01T00:00:00Z"},
+                {"type": "edit", "ns": 0, "title": "Other", "rcid": 2,
+                 "timestamp": "2018-01-01T00:00:01Z"},
+            ]
+        }
+    },
+    {
+        "batchcomplete": "",
+        "query": {
+            "recentchanges": [
+                {"type": "categorize", "ns": 14, "title": "Category:C1",
+                 "rcid": 3, "timestamp": "2018-01-01T00:00:02Z"},
+            ]
+        }
+    },
+]
+
+NEWEST_CHANGE = {
+    "batchcomplete": "",
+    "continue": {"rccontinue": "20180101000001|2", "continue": "-||"},
+    "query": {
+        "recentchanges": [
+            {"type": "edit", "ns": 0, "title": "Other", "rcid": 2,
+             "timestamp": "2018-01-01T00:00:01Z"},
+        ]
+    }
+}
+
+START = "2018-01-01T00:00:00Z"
+
+
+class ListFeed(object):
+    def __init__(self, changes):
+        self.changes = changes
+
+    def poll(self):
+        changes, self.changes = self.changes, []
+        return changes
+
+
+def recent_changes_request(page, params):
+    if params.get('list') == 'recentchanges':
+        if params['rcdir'] == 'older':
+            return NEWEST_CHANGE
+        if 'rccontinue' in params:
+            return RECENT_CHANGES[1]
+        if params['rcstart'] == START:
+            return RECENT_CHANGES[0]
+        return RECENT_CHANGES[1]
+    return wikipedia_api_request(page, params)
+
+
+class TestChanges(unittest.TestCase):
+    def setUp(self):
+        self.requests = []
+        self.wiki = create_wiki(
+            "en",
+            query=recent_changes_request,
+            requests=self.requests
+        )
+
+    def test_feed(self):
+        feed = RecentChangesFeed(self.wiki, start=START)
+        changes = feed.poll()
+        self.assertEqual([c['rcid'] for c in changes], [1, 2, 3])
+        self.assertEqual(feed.timestamp, "2018-01-01T00:00:02Z")
+        self.assertEqual(feed.poll(), [])
+        self.assertEqual(
+            self.requests[-1]['rcstart'],
+            "2018-01-01T00:00:02Z"
+        )
+
+    def test_feed_starts_now(self):
+        feed = RecentChangesFeed(self.wiki)
+        self.assertEqual(feed.poll(), [])
+        self.assertEqual(len(self.requests), 1)
+        self.assertEqual(self.requests[0]['rclimit'], 1)
+        self.assertEqual(feed.timestamp, "2018-01-01T00:00:01Z")
+        self.assertEqual(feed.last_rcid, 2)
+        self.assertEqual([c['rcid'] for c in feed.poll()], [3])
+
+    def test_feed_limits_rounds(self):
+        feed = RecentChangesFeed(self.wiki, start=START, max_rounds=1)
+        self.assertEqual([c['rcid'] for c in feed.poll()], [1, 2])
+        self.assertEqual(feed.continuation, "20180101000002|3")
+        self.assertEqual([c['rcid'] for c in feed.poll()], [3])
+        self.assertEqual(self.requests[-1]['rccontinue'], "20180101000002|3")
+        self.assertIsNone(feed.continuation)
+
+    def test_invalidate_only_fetched(self):
+        page = self.wiki.page('Test_1')
+        self.assertEqual(len(page.links), 3)
+        tracker = ChangeTracker(self.wiki, ListFeed([]))
+        tracker.track([page])
+        affected = tracker.process([{"type": "edit", "title": "Test 1"}])
+        self.assertEqual(affected, [page])
+        self.assertFalse(page._called['links'])
+        self.assertEqual(len(page._links), 0)
+        self.assertFalse(page._called['structured'])
+
+    def test_untracked_change(self):
+        page = self.wiki.page('Test_1')
+        page.links
+        tracker = ChangeTracker(self.wiki, ListFeed([]))
+        tracker.track([page])
+        self.assertEqual(tracker.process([{"title": "Other"}]), [])
+        self.assertTrue(page._called['links'])
+
+    def test_sync(self):
+        page = self.wiki.page('Test_1')
+        page.links
+        page.sections
+        category = self.wiki.page('Category:C1')
+        category.categorymembers
+        tracker = ChangeTracker(
+            self.wiki,
+            ListFeed([
+                {"type": "edit", "title": "Test 1"},
+                {"type": "categorize", "title": "Category:C1"},
+            ])
+        )
+        tracker.track([page, category])
+        del self.requests[:]
+        refreshed = tracker.sync()
+        self.assertEqual(len(refreshed), 2)
+        self.assertEqual(len(self.requests), 3)
+        self.assertEqual(len(page._links), 3)
+        self.assertEqual(len(page._section_titles), 12)
+        self.assertEqual(len(category._categorymembers), 3)
+        self.assertEqual(tracker.refresh(), [])
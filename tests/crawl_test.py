@@ -0,0 +1,134 @@
+# -*- coding: utf-8 -*-
+import os
+import tempfile
+import unittest
+
+from wikipediaapi import crawl
+from wikipediaapi.bundle import Bundle
+import wikipediaapi
+
+from stub_server import StubServer
+
+
+def summary_length(page):
+    return len(page.summary)
+
+
+def crash(page):
+    os._exit(3)
+
+
+class TestWorkQueue(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.queue = crawl.WorkQueue(
+            os.path.join(self.tmp.name, 'queue.sqlite'),
+            shards=3
+        )
+
+    def tearDown(self):
+        self.queue.close()
+        self.tmp.cleanup()
+
+    def test_shards(self):
+        titles = ['Title {}'.format(i) for i in range(30)]
+        self.queue.add(titles + titles[:10], 'en')
+        claimed = []
+        for shard in range(3):
+            batch = self.queue.claim(shard, 100)
+            self.assertTrue(all(
+                crawl.shard_of(title, 3) == shard for _, title in batch
+            ))
+            claimed += batch
+        self.assertEqual(sorted(t for _, t in claimed), sorted(titles))
+        self.assertEqual(self.queue.progress(), {crawl.RUNNING: 30})
+
+    def test_requeue(self):
+        self.queue.add(['A', 'B'], 'en')
+        batch = self.queue.claim(crawl.shard_of('A', 3), 1)
+        self.queue.complete([], [(batch[0][0], batch[0][1], 'error')])
+        self.queue.claim(crawl.shard_of('B', 3), 1)
+        self.assertEqual(self.queue.requeue(), 1)
+        self.assertEqual(
+            self.queue.progress(),
+            {crawl.PENDING: 1, crawl.FAILED: 1}
+        )
+        self.assertEqual(list(self.queue.errors()), [('en', 'A', 'error')])
+
+    def test_reshard(self):
+        titles = ['Title {}'.format(i) for i in range(30)]
+        self.queue.add(titles, 'en')
+        self.queue.close()
+
+        path = self.queue.path
+        self.queue = crawl.WorkQueue(path)
+        self.assertEqual(self.queue.shards, 3)
+        self.queue.close()
+
+        self.queue = crawl.WorkQueue(path, shards=2)
+        claimed = self.queue.claim(0, 100) + self.queue.claim(1, 100)
+        self.assertEqual(len(claimed), 30)
+        self.queue.close()
+        self.queue = crawl.WorkQueue(path)
+        self.assertEqual(self.queue.shards, 2)
+
+
+class TestCrawler(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.server = StubServer().__enter__()
+        self.path = os.path.join(self.tmp.name, 'crawl.sqlite')
+
+    def tearDown(self):
+        self.server.__exit__()
+        self.tmp.cleanup()
+
+    def crawler(self, **kwargs):
+        return crawl.Crawler(
+            self.path,
+            shards=2,
+            props=['structured'],
+            wiki_kwargs={'api_url': self.server.api_url},
+            **kwargs
+        )
+
+    def test_run_and_merge(self):
+        crawler = self.crawler()
+        crawler.add(['Test_1', 'NonExisting', 'Unknown'])
+        progress = crawler.run()
+        self.assertEqual(progress, {crawl.DONE: 2, crawl.FAILED: 1})
+
+        bundle_path = os.path.join(self.tmp.name, 'pages.bundle')
+        self.assertEqual(crawler.merge(bundle_path), 2)
+        crawler.close()
+
+        with Bundle(wikipediaapi.Wikipedia('en'), bundle_path) as bundle:
+            page = bundle.page('Test 1')
+            self.assertEqual(page.summary, 'Summary text')
+            self.assertFalse(bundle.page('NonExisting').exists())
+
+    def test_crashed_worker(self):
+        crawler = self.crawler(fn=crash)
+        crawler.add(['Test_1'])
+        with self.assertRaises(RuntimeError):
+            crawler.run()
+        self.assertEqual(crawler.queue.progress(), {crawl.RUNNING: 1})
+        crawler.close()
+
+    def test_resume(self):
+        crawler = self.crawler(fn=summary_length)
+        crawler.add(['Test_1', 'NonExisting'])
+        # simulate crash of the worker holding Test_1
+        crawler.queue.claim(crawl.shard_of('Test_1', 2), 10)
+        crawler.close()
+
+        crawler = self.crawler(fn=summary_length)
+        crawler.add(['Test_1'])
+        self.assertEqual(crawler.run(), {crawl.DONE: 2})
+        self.assertEqual(
+            list(crawler.results()),
+            [('en', 'NonExisting', 0), ('en', 'Test_1', 12)]
+        )
+        requested = [r['titles'] for r in self.server.requests]
+        self.assertEqual(sorted(requested), ['NonExisting', 'Test_1'])
+        crawler.close()
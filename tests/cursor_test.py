@@ -0,0 +1,148 @@
+# -*- coding: utf-8 -*-
+import os
+import tempfile
+import unittest
+
+import wikipediaapi
+from wikipediaapi.cursor import Cursor, ITEMS_SUFFIX
+
+from mock_data import create_wiki, wikipedia_api_request
+
+MEMBERS = [
+    {'pageid': i, 'ns': 0, 'title': 'Member {}'.format(i)}
+    for i in range(10)
+]
+
+
+class Failure(Exception):
+    pass
+
+
+class TestCursor(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp.name, 'cursor.json')
+        self.wiki = self.category_wiki()
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def category_wiki(self, fail_at=None):
+        """
+        Returns Wikipedia answering categorymembers two per round, round
+        `fail_at` fails.
+        """
+        def fake_query(page, params):
+            if params.get('list') != 'categorymembers':
+                return wikipedia_api_request(page, params)
+            start = int(params.get('cmcontinue', 0))
+            wiki.requests.append(start)
+            if start == wiki.fail_at:
+                raise Failure()
+            raw = {'query': {'categorymembers': MEMBERS[start:start + 2]}}
+            if start + 2 < len(MEMBERS):
+                raw['continue'] = {'cmcontinue': str(start + 2), 'continue': '-||'}
+            return raw
+
+        wiki = create_wiki("en", query=fake_query)
+        wiki.requests = []
+        wiki.fail_at = fail_at
+        return wiki
+
+    def category(self, wiki):
+        return wiki.page('Category:C', ns=wikipediaapi.Namespace.CATEGORY)
+
+    def test_partial_results_and_retry(self):
+        wiki = self.category_wiki(fail_at=6)
+        page = self.category(wiki)
+        with self.assertRaises(Failure):
+            page.categorymembers
+        self.assertEqual(len(wiki.partial(page, 'categorymembers')), 6)
+
+        # failed round is requested again, earlier ones are not
+        wiki.fail_at = None
+        wiki.requests.clear()
+        self.assertEqual(len(page.categorymembers), 10)
+        self.assertEqual(wiki.requests, [6, 8])
+        self.assertEqual(len(wiki.partial(page, 'categorymembers')), 10)
+
+    def test_advance_rounds(self):
+        page = self.category(self.wiki)
+        cursor = self.wiki.cursor(page, 'categorymembers')
+        self.wiki.advance(cursor, rounds=2)
+        self.assertEqual(cursor.token, '4')
+        self.assertEqual(len(cursor.items), 4)
+        self.assertFalse(cursor.done)
+
+        restored = Cursor.loads(cursor.dumps())
+        self.wiki.advance(restored)
+        self.assertTrue(restored.done)
+        self.assertEqual(restored.rounds, 5)
+        self.assertEqual(restored.items, MEMBERS)
+
+    def test_harvest_survives_restart(self):
+        wiki = self.category_wiki(fail_at=4)
+        with self.assertRaises(Failure):
+            wiki.harvest(self.category(wiki), 'categorymembers', self.path)
+        saved = Cursor.load(self.path)
+        self.assertEqual((saved.token, saved.rounds), ('4', 2))
+
+        # new process continues from the saved round
+        wiki = self.category_wiki()
+        page = self.category(wiki)
+        members = wiki.harvest(page, 'categorymembers', self.path)
+        self.assertEqual(len(members), 10)
+        self.assertEqual(wiki.requests, [4, 6, 8])
+        self.assertTrue(Cursor.load(self.path).done)
+
+        # finished cursor is not requested again
+        wiki = self.category_wiki()
+        wiki.harvest(self.category(wiki), 'categorymembers', self.path)
+        self.assertEqual(wiki.requests, [])
+
+    def test_saves_only_new_items(self):
+        wiki = self.category_wiki(fail_at=6)
+        with self.assertRaises(Failure):
+            wiki.harvest(self.category(wiki), 'categorymembers', self.path)
+        with open(self.path + ITEMS_SUFFIX, encoding='utf-8') as f:
+            self.assertEqual(len(f.readlines()), 3)
+        with open(self.path, encoding='utf-8') as f:
+            self.assertNotIn('Member', f.read())
+
+    def test_unsaved_round_is_dropped(self):
+        wiki = self.category_wiki(fail_at=4)
+        with self.assertRaises(Failure):
+            wiki.harvest(self.category(wiki), 'categorymembers', self.path)
+        # crash after items of the round were written, before the state
+        with open(self.path + ITEMS_SUFFIX, 'a', encoding='utf-8') as f:
+            f.write('[{"pageid": 4, "ns": 0, "title": "Member 4"}]\n')
+
+        wiki = self.category_wiki()
+        members = wiki.harvest(self.category(wiki), 'categorymembers', self.path)
+        self.assertEqual(list(members), [m['title'] for m in MEMBERS])
+        self.assertEqual(Cursor.load(self.path).items, MEMBERS)
+
+    def test_filtered_retry(self):
+        wiki = self.category_wiki(fail_at=4)
+        page = self.category(wiki)
+        with self.assertRaises(Failure):
+            page.filtered_categorymembers(namespace=0)
+
+        wiki.fail_at = None
+        wiki.requests.clear()
+        self.assertEqual(len(page.filtered_categorymembers(namespace=0)), 10)
+        self.assertEqual(wiki.requests, [4, 6, 8])
+        self.assertEqual(page._cursors, {})
+
+    def test_harvest_other_page(self):
+        self.wiki.cursor(self.category(self.wiki), 'backlinks').save(self.path)
+        with self.assertRaises(ValueError):
+            self.wiki.harvest(
+                self.category(self.wiki), 'categorymembers', self.path
+            )
+
+    def test_links(self):
+        page = self.wiki.page('Test_1')
+        cursor = self.wiki.advance(self.wiki.cursor(page, 'links'))
+        self.assertEqual(cursor.attributes['pageid'], 4)
+        self.assertEqual(len(cursor.items), len(page.links))
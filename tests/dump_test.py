@@ -0,0 +1,265 @@
+# -*- coding: utf-8 -*-
+import bz2
+import gzip
+import os
+import shutil
+import tempfile
+import unittest
+
+from wikipediaapi import dump
+
+HEADER = (
+    '<mediawiki xmlns="http://www.mediawiki.org/xml/export-0.10/" xml:lang="en">\n'
+    '  <siteinfo><sitename>Wikipedia</sitename></siteinfo>\n'
+)
+
+
+def page_xml(pageid, title, text, ns=0, redirect=None):
+    return (
+        '  <page>\n'
+        '    <title>{}</title>\n'
+        '    <ns>{}</ns>\n'
+        '    <id>{}</id>\n'
+        '{}'
+        '    <revision><id>{}</id><text xml:space="preserve">{}</text></revision>\n'
+        '  </page>\n'
+    ).format(
+        title, ns, pageid,
+        '    <redirect title="{}" />\n'.format(redirect) if redirect else '',
+        pageid * 100, text
+    )
+
+
+TEST_1 = (
+    "Summary text\n"
+    "== Section 1 ==\n"
+    "Text for section 1\n"
+    "=== Section 1.1 ===\n"
+    "Text for section 1.1\n"
+    "== Section 2 ==\n"
+    "Text for section 2"
+)
+
+STREAMS = [
+    HEADER,
+    page_xml(4, 'Test 1', TEST_1) + page_xml(5, 'Test 2', 'Second page'),
+    page_xml(6, 'Test One', '', redirect='Test 1') +
+    page_xml(7, 'Category:C1', 'Category page', ns=14) +
+    '</mediawiki>\n',
+]
+
+
+class TestDump(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+        self.dump_path = os.path.join(self.tmp_dir, 'pages.xml.bz2')
+        self.multistream_index = os.path.join(self.tmp_dir, 'index.txt.bz2')
+        self.index_path = os.path.join(self.tmp_dir, 'index.sqlite')
+        pagelinks = os.path.join(self.tmp_dir, 'pagelinks.sql.gz')
+        categorylinks = os.path.join(self.tmp_dir, 'categorylinks.sql.gz')
+
+        offsets = []
+        with open(self.dump_path, 'wb') as f:
+            for stream in STREAMS:
+                offsets.append(f.tell())
+                f.write(bz2.compress(stream.encode('utf-8')))
+        with bz2.open(self.multistream_index, 'wt') as f:
+            f.write('{}:4:Test 1\n{}:5:Test 2\n'.format(offsets[1], offsets[1]))
+            f.write('{}:6:Test One\n{}:7:Category:C1\n'.format(offsets[2], offsets[2]))
+        with gzip.open(pagelinks, 'wt') as f:
+            f.write("-- MySQL dump\n")
+            f.write(
+                "INSERT INTO `pagelinks` VALUES "
+                "(4,0,'Test_2',0),(4,0,'O\\'Brien',0),(5,0,'Test_1',0);\n"
+            )
+        with gzip.open(categorylinks, 'wt') as f:
+            f.write(
+                "INSERT INTO `categorylinks` VALUES "
+                "(4,'C1','TEST 1','2018-01-01 00:00:00','','uppercase','page'),"
+                "(5,'C1','TEST 2','2018-01-01 00:00:00','','uppercase','page');\n"
+            )
+
+        dump.build_index(
+            self.index_path,
+            self.dump_path,
+            pagelinks=pagelinks,
+            categorylinks=categorylinks
+        )
+        self.wiki = dump.DumpWikipedia(self.dump_path, self.index_path)
+
+    def tearDown(self):
+        self.wiki.close()
+        shutil.rmtree(self.tmp_dir)
+
+    def test_iter_pages(self):
+        titles = [p['title'] for p in dump.iter_pages(self.dump_path)]
+        self.assertEqual(titles, ['Test 1', 'Test 2', 'Test One', 'Category:C1'])
+
+    def test_iter_pages_parallel(self):
+        pages = list(dump.iter_pages(
+            self.dump_path,
+            multistream_index=self.multistream_index,
+            workers=2
+        ))
+        self.assertEqual([p['pageid'] for p in pages], [4, 5, 6, 7])
+        self.assertEqual(pages[2]['redirect'], 'Test 1')
+
+    def test_scan_streams_without_text(self):
+        records = [
+            r
+            for _, stream in dump._scan_streams(
+                self.dump_path, self.multistream_index, workers=1, text=False
+            )
+            for r in stream
+        ]
+        self.assertEqual([r['pageid'] for r in records], [4, 5, 6, 7])
+        self.assertNotIn('text', records[0])
+
+    def test_scan_streams_sequential(self):
+        read_size = dump.READ_SIZE
+        dump.READ_SIZE = 64
+        try:
+            streams = list(dump._scan_streams(self.dump_path, text=False))
+        finally:
+            dump.READ_SIZE = read_size
+        self.assertEqual(
+            [(offset, r['pageid']) for offset, stream in streams for r in stream],
+            [(o, r['pageid'])
+             for o, stream in dump._scan_streams(
+                 self.dump_path, self.multistream_index, workers=1
+             )
+             for r in stream]
+        )
+
+    def test_build_index_parallel(self):
+        index_path = os.path.join(self.tmp_dir, 'parallel.sqlite')
+        dump.build_index(
+            index_path,
+            self.dump_path,
+            multistream_index=self.multistream_index,
+            workers=2
+        )
+        wiki = dump.DumpWikipedia(self.dump_path, index_path)
+        self.assertEqual(wiki.page('Test One').summary, 'Summary text')
+
+    def test_stream_offsets(self):
+        offsets = dump.stream_offsets(self.multistream_index)
+        self.assertEqual(len(offsets), 2)
+        self.assertIn('Test 2', dump.read_stream(self.dump_path, offsets[0]))
+
+    def test_sections(self):
+        page = self.wiki.page('Test_1')
+        self.assertEqual(page.pageid, 4)
+        self.assertEqual(page.summary, 'Summary text')
+        self.assertEqual(
+            page.section_titles,
+            ['Section 1', 'Section 1.1', 'Section 2']
+        )
+        self.assertEqual(
+            page.section_by_title('Section 1.1').text,
+            'Text for section 1.1'
+        )
+
+    def test_iter_sections(self):
+        page = self.wiki.page('Test 1')
+        self.assertEqual(
+            [(path, s.text) for path, s in page.iter_sections()],
+            [
+                (('Section 1',), 'Text for section 1'),
+                (('Section 1', 'Section 1.1'), 'Text for section 1.1'),
+                (('Section 2',), 'Text for section 2'),
+            ]
+        )
+        self.assertFalse(page._called['structured'])
+
+    def test_lazy_section(self):
+        wiki = dump.DumpWikipedia(self.dump_path, self.index_path)
+        wiki.lazy_sections = True
+        page = wiki.page('Test 1')
+        self.assertEqual(
+            page.section_titles,
+            ['Section 1', 'Section 1.1', 'Section 2']
+        )
+        self.assertEqual(
+            page.section_by_title('Section 1.1').text,
+            'Text for section 1.1'
+        )
+        self.assertEqual(page.section_by_title('Section 2').level, 1)
+        self.assertFalse(page._called['structured'])
+
+    def test_extract(self):
+        page = self.wiki.page('Test 1')
+        self.assertEqual(page.extract(chars=7), 'Summary...')
+        self.assertEqual(
+            self.wiki._extract(page, {'exintro': 1})['extract'],
+            'Summary text'
+        )
+        self.assertEqual(self.wiki.page('NonExisting').extract(chars=7), '')
+
+    def test_redirect(self):
+        page = self.wiki.page('Test One')
+        self.assertEqual(page.summary, 'Summary text')
+        self.assertEqual(page.title, 'Test 1')
+
+    def test_info(self):
+        page = self.wiki.page('Test One')
+        self.assertEqual(page.fullurl, 'https://en.wikipedia.org/wiki/Test_1')
+        self.assertEqual(page.displaytitle, 'Test 1')
+        self.assertEqual(page.pageid, 4)
+
+    def test_fetch_info(self):
+        pages = [self.wiki.page('Test 1'), self.wiki.page('NonExisting')]
+        self.wiki.fetch_info(pages, attributes=['length', 'fullurl'])
+        self.assertTrue(pages[0]._called['info'])
+        self.assertEqual(
+            pages[0].editurl,
+            'https://en.wikipedia.org/w/index.php?title=Test_1&action=edit'
+        )
+        self.assertFalse(pages[1].exists())
+
+    def test_resolve(self):
+        results = self.wiki.resolve(['Test_2', 'Test One', 'NonExisting'])
+        self.assertEqual(
+            results['Test_2'],
+            dump.Resolution('Test_2', True, 5, 'Test 2', None)
+        )
+        self.assertEqual(results['Test One'].redirect, 'Test 1')
+        self.assertEqual(results['Test One'].pageid, 4)
+        self.assertFalse(results['NonExisting'].exists)
+        self.assertEqual(
+            self.wiki.exists_many(['Test 1', 'NonExisting']),
+            {'Test 1': True, 'NonExisting': False}
+        )
+
+    def test_nonexisting(self):
+        page = self.wiki.page('NonExisting')
+        self.assertFalse(page.exists())
+
+    def test_links(self):
+        page = self.wiki.page('Test 1')
+        self.assertEqual(sorted(page.links.keys()), ["O'Brien", 'Test 2'])
+
+    def test_backlinks(self):
+        page = self.wiki.page('Test 1')
+        self.assertEqual(list(page.backlinks.keys()), ['Test 2'])
+
+    def test_categories(self):
+        page = self.wiki.page('Test 1')
+        self.assertEqual(list(page.categories.keys()), ['Category:C1'])
+
+    def test_categorymembers(self):
+        page = self.wiki.page('Category:C1')
+        self.assertEqual(
+            sorted(page.categorymembers.keys()),
+            ['Test 1', 'Test 2']
+        )
+
+    def test_filtered_categorymembers(self):
+        page = self.wiki.page('Category:C1')
+        self.assertEqual(
+            sorted(page.filtered_categorymembers(namespace=0).keys()),
+            ['Test 1', 'Test 2']
+        )
+        self.assertEqual(len(page.filtered_categorymembers(namespace=14)), 0)
+        with self.assertRaises(ValueError):
+            page.filtered_categorymembers(sort='timestamp')
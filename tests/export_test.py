@@ -0,0 +1,108 @@
+# -*- coding: utf-8 -*-
+import json
+import os
+import tempfile
+import unittest
+
+from wikipediaapi import export
+
+from mock_data import create_wiki
+
+try:
+    import pyarrow
+except ImportError:
+    pyarrow = None
+
+
+class TestExport(unittest.TestCase):
+    def setUp(self):
+        self.wiki = create_wiki("en")
+        self.tmp = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def read(self, table):
+        with open(os.path.join(self.tmp.name, table + '.jsonl')) as f:
+            return [json.loads(line) for line in f]
+
+    def test_jsonl(self):
+        page = self.wiki.page('Test_1')
+        with export.Exporter(self.tmp.name) as exporter:
+            self.assertEqual(exporter.write([page]), 1)
+
+        pages = self.read('pages')
+        self.assertEqual(len(pages), 1)
+        self.assertEqual(pages[0]['title'], 'Test 1')
+        self.assertEqual(pages[0]['summary'], page.summary)
+
+        sections = self.read('sections')
+        self.assertEqual(len(sections), len(page.section_titles))
+        sub = sections[page.section_index.id(['Section 4', 'Section 4.1'])]
+        self.assertEqual(sub['path'], ['Section 4', 'Section 4.1'])
+        self.assertEqual(sub['level'], 2)
+        self.assertEqual(sections[sub['parent_id']]['path'], ['Section 4'])
+
+        self.assertEqual(
+            sorted(r['target'] for r in self.read('links')),
+            sorted(page.links.keys())
+        )
+        self.assertEqual(
+            sorted(r['category'] for r in self.read('categories')),
+            sorted(page.categories.keys())
+        )
+        langlinks = self.read('langlinks')
+        self.assertEqual(len(langlinks), len(page.langlinks))
+        self.assertTrue(all(r['url'] for r in langlinks))
+
+    def test_row_groups(self):
+        written = []
+
+        class RecordingWriter(object):
+            def __init__(self, path, table):
+                pass
+
+            def write(self, rows):
+                written.append(len(rows))
+
+            def close(self):
+                pass
+
+        export.WRITERS['recording'] = RecordingWriter
+        try:
+            exporter = export.Exporter(
+                self.tmp.name,
+                format='recording',
+                tables=['sections'],
+                row_group_size=4
+            )
+            exporter.write(self.wiki.fetch_all(
+                [self.wiki.page('Test_1')], ['structured']
+            ))
+            exporter.close()
+        finally:
+            del export.WRITERS['recording']
+        total = len(self.wiki.page('Test_1').section_titles)
+        self.assertEqual(sum(written), total)
+        self.assertTrue(all(n == 4 for n in written[:-1]))
+
+    def test_unknown_format(self):
+        with self.assertRaises(ValueError):
+            export.Exporter(self.tmp.name, format='csv')
+
+    @unittest.skipIf(pyarrow is None, 'pyarrow is not installed')
+    def test_parquet(self):
+        import pyarrow.parquet
+        page = self.wiki.page('Test_1')
+        with export.Exporter(
+                self.tmp.name, format='parquet', row_group_size=3
+        ) as exporter:
+            exporter.add(page)
+        sections = pyarrow.parquet.ParquetFile(
+            os.path.join(self.tmp.name, 'sections.parquet')
+        )
+        self.assertEqual(
+            sections.metadata.num_rows,
+            len(page.section_titles)
+        )
+        self.assertEqual(sections.metadata.row_group(0).num_rows, 3)
@@ -2,14 +2,12 @@
 from collections import defaultdict
 import unittest
 
-from mock_data import wikipedia_api_request
-import wikipediaapi
+from mock_data import create_wiki
 
 
 class TestErrorsExtracts(unittest.TestCase):
     def setUp(self):
-        self.wiki = wikipediaapi.Wikipedia("en")
-        self.wiki._query = wikipedia_api_request
+        self.wiki = create_wiki("en")
 
     def test_title_before_fetching(self):
         page = self.wiki.page('NonExisting')
@@ -3,16 +3,15 @@ from collections import defaultdict
 import unittest
 import wikipediaapi
 
-from mock_data import wikipedia_api_request
+from mock_data import create_wiki
 
 
 class TestHtmlFormatExtracts(unittest.TestCase):
     def setUp(self):
-        self.wiki = wikipediaapi.Wikipedia(
+        self.wiki = create_wiki(
             "en",
             extract_format=wikipediaapi.ExtractFormat.HTML
         )
-        self.wiki._query = wikipedia_api_request
 
     def test_title_before_fetching(self):
         page = self.wiki.page('Test_1')
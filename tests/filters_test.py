@@ -0,0 +1,97 @@
+# -*- coding: utf-8 -*-
+import unittest
+
+import wikipediaapi
+from mock_data import create_wiki
+
+MEMBERS = [
+    {'pageid': 1, 'ns': 0, 'title': 'Page 1'},
+    {'pageid': 2, 'ns': 14, 'title': 'Category:Sub'},
+    {'pageid': 3, 'ns': 0, 'title': 'Page 2'},
+    {'pageid': 4, 'ns': 6, 'title': 'File:Image.png'},
+]
+
+
+def fake_query(page, params):
+    """
+    Answers backlinks and categorymembers from MEMBERS, two per request.
+    Only namespace filter is evaluated.
+    """
+    prefix = params['list'][0] + ('l' if params['list'] == 'backlinks' else 'm')
+    members = MEMBERS
+    if prefix + 'namespace' in params:
+        namespaces = [int(n) for n in params[prefix + 'namespace'].split('|')]
+        members = [m for m in members if m['ns'] in namespaces]
+    start = int(params.get(prefix + 'continue', 0))
+    raw = {'query': {params['list']: members[start:start + 2]}}
+    if start + 2 < len(members):
+        raw['continue'] = {prefix + 'continue': str(start + 2)}
+    return raw
+
+
+class TestFilters(unittest.TestCase):
+    def setUp(self):
+        self.requests = []
+        self.wiki = create_wiki("en", query=fake_query, requests=self.requests)
+
+    def test_backlinks_namespace(self):
+        page = self.wiki.page('Test 1')
+        backlinks = page.filtered_backlinks(
+            namespace=[wikipediaapi.Namespace.MAIN, wikipediaapi.Namespace.FILE]
+        )
+        self.assertEqual(
+            list(backlinks.keys()),
+            ['Page 1', 'Page 2', 'File:Image.png']
+        )
+        self.assertEqual(self.requests[0]['blnamespace'], '0|6')
+        self.assertEqual(self.requests[1]['blcontinue'], '2')
+        self.assertFalse(page._called['backlinks'])
+
+    def test_backlinks_redirects(self):
+        page = self.wiki.page('Test 1')
+        page.filtered_backlinks(redirects=False)
+        self.assertEqual(self.requests[0]['blfilterredir'], 'nonredirects')
+        page.filtered_backlinks(redirects=True)
+        self.assertEqual(self.requests[-1]['blfilterredir'], 'redirects')
+
+    def test_categorymembers_params(self):
+        page = self.wiki.page('Category:C', ns=wikipediaapi.Namespace.CATEGORY)
+        page.filtered_categorymembers(
+            type=['subcat', 'file'],
+            sort='timestamp',
+            start='2020-01-01T00:00:00Z'
+        )
+        params = self.requests[0]
+        self.assertEqual(params['cmtype'], 'subcat|file')
+        self.assertEqual(params['cmsort'], 'timestamp')
+        self.assertEqual(params['cmstart'], '2020-01-01T00:00:00Z')
+
+        page.filtered_categorymembers(start='B', end='C')
+        params = self.requests[-1]
+        self.assertEqual(params['cmstartsortkeyprefix'], 'B')
+        self.assertEqual(params['cmendsortkeyprefix'], 'C')
+
+    def test_cached_under_distinct_keys(self):
+        page = self.wiki.page('Category:C', ns=wikipediaapi.Namespace.CATEGORY)
+        main = page.filtered_categorymembers(namespace=0)
+        self.assertIs(page.filtered_categorymembers(namespace=0), main)
+        count = len(self.requests)
+        subcats = page.filtered_categorymembers(namespace=14)
+        self.assertGreater(len(self.requests), count)
+        self.assertEqual(list(subcats.keys()), ['Category:Sub'])
+        self.assertEqual(main['Page 1'].pageid, 1)
+
+        page._invalidate('categorymembers')
+        self.assertIsNot(page.filtered_categorymembers(namespace=0), main)
+
+    def test_local_filter(self):
+        page = self.wiki.page('Category:C', ns=wikipediaapi.Namespace.CATEGORY)
+        self.assertEqual(len(page.categorymembers), 4)
+        count = len(self.requests)
+        members = page.filtered_categorymembers(namespace=0)
+        self.assertEqual(len(self.requests), count)
+        self.assertEqual(list(members.keys()), ['Page 1', 'Page 2'])
+
+    def test_no_filters(self):
+        page = self.wiki.page('Category:C', ns=wikipediaapi.Namespace.CATEGORY)
+        self.assertIs(page.filtered_categorymembers(), page.categorymembers)
@@ -0,0 +1,68 @@
+# -*- coding: utf-8 -*-
+import random
+import unittest
+
+from mock_data import _MOCK_DATA
+from wikipediaapi.wikipedia import HTML_PATTERN, HTML_TITLE, HTML_LEVEL, html_headings
+
+FRAGMENTS = [
+    '<p>Text</p>',
+    '<p><b>Bold</b> text</p>',
+    '\n', '\n\n', ' ', '  ',
+    '<h2>', '<h3>', '<h4 id="x">', '</h2>', '</h3>', '</h4>',
+    '<h2>Title</h2>',
+    '<h3><span id="a">Title</span></h3>',
+    '<h2><span id="a"></span><span id="b">Title</span></h2>',
+    '<h3><span id="e">With Edit</span><span>Edit</span></h3>',
+    '<h2> <span id="s">Spaced </span> </h2>',
+    '<h5><i>Italic</i> title</h5>',
+    '<span id="x"></span>', '<span>', '</span>', '<span>Edit</span>',
+    'Title', '<hr>', '<head>', '<h', '</h', '>',
+]
+
+
+def regex_headings(extract):
+    return [
+        (m.start(), m.end(), HTML_TITLE(m), HTML_LEVEL(m))
+        for m in HTML_PATTERN.finditer(extract)
+    ]
+
+
+class TestHtmlHeadings(unittest.TestCase):
+    def assertSameHeadings(self, extract):
+        self.assertEqual(
+            list(html_headings(extract)),
+            regex_headings(extract),
+            repr(extract)
+        )
+
+    def test_mock_extracts(self):
+        for k, v in _MOCK_DATA.items():
+            if 'prop=extracts' in k and 'explaintext' not in k:
+                for page in v['query']['pages'].values():
+                    self.assertSameHeadings(page['extract'])
+
+    def test_random_extracts(self):
+        rnd = random.Random(42)
+        for _ in range(3000):
+            extract = ''.join(
+                rnd.choice(FRAGMENTS) for _ in range(rnd.randint(1, 20))
+            )
+            self.assertSameHeadings(extract)
+
+    def test_edit_span(self):
+        self.assertEqual(
+            list(html_headings(
+                '<p>A</p>\n<h3><span id="e">Section</span><span>Edit</span></h3>\n<p>B</p>'
+            )),
+            [(8, 63, 'Section', 3)]
+        )
+
+    def test_unclosed_headings_on_long_line(self):
+        self.assertSameHeadings('<p>' + '<h2>x' * 10 + '</p>\n<h2>Title</h2>')
+        # regular expression backtracks here, so it is not compared
+        extract = '<p>' + '<h2>x' * 100000 + '</p>\n<h2>Title</h2>'
+        self.assertEqual(
+            [title for _, _, title, _ in html_headings(extract)],
+            ['Title']
+        )
@@ -0,0 +1,49 @@
+# -*- coding: utf-8 -*-
+import os
+import subprocess
+import sys
+import unittest
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+
+# Cumulative import time of wikipediaapi in microseconds. Importing
+# requests alone takes more on most machines.
+BUDGET = 100000
+
+# Modules, which should be imported only when they are used
+LAZY_MODULES = ['requests', 'urllib3', 'html.parser', 'wikipediaapi.natlang']
+
+
+def import_time():
+    """
+    Returns cumulative import time of wikipediaapi reported by
+    python -X importtime and names of all imported modules.
+    """
+    out = subprocess.run(
+        [
+            sys.executable, '-X', 'importtime', '-c',
+            'import sys, wikipediaapi; print("\\n".join(sys.modules))'
+        ],
+        cwd=ROOT,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.PIPE,
+        universal_newlines=True,
+        check=True
+    )
+    for line in out.stderr.splitlines():
+        _, _, cumulative, name = [p.strip() for p in line.replace(':', '|').split('|')]
+        if name == 'wikipediaapi':
+            return int(cumulative), set(out.stdout.split())
+    raise AssertionError('wikipediaapi was not imported')
+
+
+class TestImportTime(unittest.TestCase):
+    def test_lazy_modules(self):
+        _, modules = import_time()
+        for module in LAZY_MODULES:
+            self.assertNotIn(module, modules)
+
+    def test_budget(self):
+        # the first run may compile sources
+        best = min(import_time()[0] for _ in range(3))
+        self.assertLess(best, BUDGET)
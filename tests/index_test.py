@@ -0,0 +1,55 @@
+# -*- coding: utf-8 -*-
+import unittest
+
+from mock_data import create_wiki
+from wikipediaapi.index import Index, Postings
+
+
+class TestIndex(unittest.TestCase):
+    def setUp(self):
+        self.wiki = create_wiki("en")
+        self.index = Index()
+        self.index.add(self.wiki.page('Test_1'))
+
+    def test_postings_roundtrip(self):
+        postings = Postings()
+        for doc, tf in [(0, 1), (3, 2), (300, 1), (70000, 5)]:
+            postings.add(doc, tf)
+        self.assertEqual(
+            list(postings),
+            [(0, 1), (3, 2), (300, 1), (70000, 5)]
+        )
+
+    def test_search(self):
+        hits = self.index.search('text 4.2.1')
+        self.assertEqual(hits[0].title, 'Test 1')
+        self.assertEqual(
+            hits[0].section,
+            ('Section 4', 'Section 4.2', 'Section 4.2.1')
+        )
+
+    def test_search_summary(self):
+        hits = self.index.search('summary')
+        self.assertEqual(len(hits), 1)
+        self.assertEqual(hits[0].section, ())
+
+    def test_search_all_words(self):
+        self.assertEqual(self.index.search('summary 4.2.1'), [])
+        self.assertEqual(self.index.search('unknown'), [])
+
+    def test_search_in_section(self):
+        hits = self.index.search('text', section='Section 4', limit=100)
+        self.assertEqual(
+            sorted(h.section[-1] for h in hits),
+            ['Section 4.1', 'Section 4.2', 'Section 4.2.1', 'Section 4.2.2']
+        )
+
+    def test_readd_replaces_page(self):
+        self.index.add(self.wiki.page('Test_1'))
+        self.assertEqual(len(self.index), 1)
+        self.assertEqual(len(self.index.search('summary')), 1)
+
+    def test_titles(self):
+        self.assertEqual(self.index.titles('test'), ['Test 1'])
+        self.assertEqual(self.index.titles('TEST 1'), ['Test 1'])
+        self.assertEqual(self.index.titles('x'), [])
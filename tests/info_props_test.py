@@ -0,0 +1,65 @@
+# -*- coding: utf-8 -*-
+import unittest
+
+from mock_data import create_wiki
+import wikipediaapi
+
+
+class TestInfoProps(unittest.TestCase):
+    def setUp(self):
+        self.requests = []
+        self.wiki = create_wiki(
+            "en",
+            requests=self.requests,
+            info_attributes=['length', 'lastrevid']
+        )
+
+    def test_info_props(self):
+        self.assertEqual(wikipediaapi.info_props(['length']), [])
+        self.assertEqual(
+            wikipediaapi.info_props(['canonicalurl', 'restrictiontypes', 'fullurl']),
+            ['protection', 'url']
+        )
+
+    def test_default_requests_all(self):
+        wiki = wikipediaapi.Wikipedia("en")
+        self.assertEqual(wiki.info_props, wikipediaapi.INFO_PROPS)
+
+    def test_projection(self):
+        page = self.wiki.page('Test_1')
+        self.assertEqual(page.length, 456)
+        self.assertEqual(page.lastrevid, 123)
+        self.assertEqual(len(self.requests), 1)
+        self.assertNotIn('inprop', self.requests[0])
+
+    def test_missing_prop_fetched_on_access(self):
+        page = self.wiki.page('Test_1')
+        self.assertEqual(page.length, 456)
+        self.assertEqual(page.fullurl, 'https://en.wikipedia.org/wiki/Test_1')
+        self.assertEqual(self.requests[1]['inprop'], 'url')
+        self.assertEqual(
+            page.canonicalurl,
+            'https://en.wikipedia.org/wiki/Test_1'
+        )
+        self.assertEqual(len(self.requests), 2)
+
+    def test_batch_projection(self):
+        pages = [self.wiki.page('Test_1'), self.wiki.page('NonExisting')]
+        self.wiki.fetch_info(pages, attributes=['length'])
+        self.assertEqual(pages[0].length, 456)
+        self.assertFalse(pages[1].exists())
+        self.assertNotIn('inprop', self.requests[0])
+
+    def test_unknown_keys_are_ignored(self):
+        def query(page, params):
+            return {'query': {'pages': {'4': {
+                'pageid': 4, 'ns': 0, 'title': 'Test 1', 'length': 456,
+                'summary': 'Not a summary', 'exists': True, '_called': {},
+            }}}}
+
+        wiki = create_wiki("en", query=query, info_attributes=['length'])
+        page = wiki.page('Test_1')
+        self.assertEqual(page.length, 456)
+        self.assertTrue(page.exists())
+        self.assertNotIn('summary', vars(page))
+        self.assertTrue(page._called['info'])
@@ -0,0 +1,59 @@
+# -*- coding: utf-8 -*-
+import unittest
+
+from mock_data import create_wiki
+
+PATHS = [
+    ('Section 1',),
+    ('Section 1', 'Section 1.1'),
+    ('Section 1', 'Section 1.2'),
+    ('Section 2',),
+    ('Section 3',),
+    ('Section 4',),
+    ('Section 4', 'Section 4.1'),
+    ('Section 4', 'Section 4.2'),
+    ('Section 4', 'Section 4.2', 'Section 4.2.1'),
+    ('Section 4', 'Section 4.2', 'Section 4.2.2'),
+    ('Section 5',),
+    ('Section 5', 'Section 5.1'),
+]
+
+
+class TestIterSections(unittest.TestCase):
+    def setUp(self):
+        self.wiki = create_wiki("en")
+
+    def test_streamed_paths(self):
+        page = self.wiki.page('Test_1')
+        self.assertEqual([p for p, _ in page.iter_sections()], PATHS)
+        self.assertFalse(page._called['structured'])
+        self.assertEqual(page._sections, [])
+
+    def test_streamed_text(self):
+        page = self.wiki.page('Test_1')
+        sections = dict(page.iter_sections())
+        self.assertEqual(
+            sections[('Section 4', 'Section 4.2', 'Section 4.2.1')].text,
+            'Text for section 4.2.1'
+        )
+        self.assertEqual(sections[('Section 4',)].text, '')
+        self.assertEqual(sections[('Section 5', 'Section 5.1')].text, 'Text for section 5.1')
+
+    def test_fetched_paths(self):
+        page = self.wiki.page('Test_1')
+        page.sections
+        self.assertEqual([p for p, _ in page.iter_sections()], PATHS)
+
+    def test_same_as_sections(self):
+        streamed = [
+            (p, s.level, s.text)
+            for p, s in self.wiki.page('Test_1').iter_sections()
+        ]
+        page = self.wiki.page('Test_1')
+        page.sections
+        fetched = [(p, s.level, s.text) for p, s in page.iter_sections()]
+        self.assertEqual(streamed, fetched)
+
+    def test_nonexisting(self):
+        page = self.wiki.page('NonExisting')
+        self.assertEqual(list(page.iter_sections()), [])
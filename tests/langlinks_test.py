@@ -1,15 +1,13 @@
 # -*- coding: utf-8 -*-
 from collections import defaultdict
 import unittest
-import wikipediaapi
 
-from mock_data import wikipedia_api_request
+from mock_data import create_wiki
 
 
 class TestLangLinks(unittest.TestCase):
     def setUp(self):
-        self.wiki = wikipediaapi.Wikipedia("en")
-        self.wiki._query = wikipedia_api_request
+        self.wiki = create_wiki("en")
 
     def test_langlinks_count(self):
         page = self.wiki.page('Test_1')
@@ -50,3 +48,56 @@ class TestLangLinks(unittest.TestCase):
         p1 = langlinks['l1']
         self.assertEqual(p1.language, 'l1')
         self.assertEqual(p1.pageid, 10)
+
+    def test_fetch_all(self):
+        page = self.wiki.page('Test_1')
+        fetched = list(page.langlinks.fetch_all())
+        self.assertEqual(
+            list(sorted(map(lambda p: (p.language, p.pageid), fetched))),
+            [('l1', 10), ('l2', 20), ('l3', 30)]
+        )
+        self.assertTrue(all(p._called['info'] for p in fetched))
+
+    def test_fetch_all_batches_langlinks(self):
+        requests = []
+
+        def langlink(lang, title):
+            return {
+                'lang': lang, '*': title,
+                'url': 'https://{}.wikipedia.org/wiki/{}'.format(lang, title)
+            }
+
+        def query(page, params):
+            pages = {
+                '4': {'pageid': 4, 'ns': 0, 'title': 'Test 1'},
+                '5': {'pageid': 5, 'ns': 0, 'title': 'Test 2'},
+                '-1': {'ns': 0, 'title': 'Missing', 'missing': ''},
+            }
+            if 'llcontinue' not in params:
+                pages['4']['langlinks'] = [langlink('l1', 'T1')]
+                return {
+                    'continue': {'llcontinue': '4|l2', 'continue': '||'},
+                    'query': {
+                        'normalized': [{'from': 'Test_1', 'to': 'Test 1'}],
+                        'pages': pages,
+                    }
+                }
+            pages['4']['langlinks'] = [langlink('l2', 'T1')]
+            pages['5']['langlinks'] = [langlink('l1', 'T2')]
+            return {'batchcomplete': '', 'query': {'pages': pages}}
+
+        wiki = create_wiki("en", query=query, requests=requests)
+        pages = [
+            wiki.page('Test_1'),
+            wiki.page('Test 2'),
+            wiki.page('Missing'),
+        ]
+        list(wiki.fetch_all(pages, ['langlinks']))
+        self.assertEqual(len(requests), 2)
+        self.assertEqual(requests[0]['titles'], 'Test_1|Test 2|Missing')
+        self.assertEqual(requests[1]['llcontinue'], '4|l2')
+        self.assertEqual(sorted(pages[0].langlinks.keys()), ['l1', 'l2'])
+        self.assertEqual(pages[0].title, 'Test 1')
+        self.assertEqual(pages[1].langlinks['l1'].title, 'T2')
+        self.assertFalse(pages[2].exists())
+        self.assertEqual(len(requests), 2)
@@ -0,0 +1,249 @@
+# -*- coding: utf-8 -*-
+import threading
+import unittest
+from unittest import mock
+from urllib.parse import urlsplit
+
+import wikipediaapi
+from wikipediaapi import latency
+from wikipediaapi.latency import Deadlines, Hedger, LatencyTracker
+from mock_data import wikipedia_api_response
+from stub_server import StubServer
+
+API_URL = 'https://{language}.primary.test/api.php'
+HEDGE_API_URL = 'https://{language}.secondary.test/api.php'
+
+
+class FakeClock(object):
+    def __init__(self):
+        self.now = 0.0
+
+    def monotonic(self):
+        return self.now
+
+
+class FakeTransport(object):
+    """
+    Answers from mock data. Request takes `delay(url)` seconds of the fake
+    `clock`, requests longer than their timeout fail.
+    """
+
+    def __init__(self, clock=None, delay=lambda url: 0.0):
+        self.clock = clock
+        self.delay = delay
+        self.requests = []
+
+    def get(self, url, params, headers, timeout):
+        self.requests.append(url)
+        seconds = self.delay(url)
+        if seconds > timeout:
+            self.clock.now += timeout
+            raise TimeoutError('Request timed out')
+        if self.clock is not None:
+            self.clock.now += seconds
+        params = {
+            k: v for k, v in params.items() if k not in ['format', 'redirects']
+        }
+        return wikipedia_api_response(
+            urlsplit(url).hostname.split('.')[0],
+            params
+        )
+
+
+class TestDeadlines(unittest.TestCase):
+    def test_nested_budget_is_not_longer(self):
+        deadlines = Deadlines()
+        with deadlines.budget(0.5) as outer:
+            with deadlines.budget(10.0) as inner:
+                self.assertIs(inner, outer)
+            with deadlines.budget(0.1) as inner:
+                self.assertIsNot(inner, outer)
+                self.assertLessEqual(deadlines.timeout(10.0), 0.1)
+            self.assertIs(deadlines.current, outer)
+        self.assertIsNone(deadlines.current)
+        self.assertEqual(deadlines.timeout(10.0), 10.0)
+
+    def test_expired(self):
+        deadlines = Deadlines()
+        with deadlines.budget(0.0):
+            with self.assertRaises(wikipediaapi.DeadlineExceeded):
+                deadlines.timeout(10.0)
+
+    def test_percentile(self):
+        tracker = LatencyTracker(window=100)
+        for i in range(200):
+            tracker.record(i)
+        self.assertEqual(len(tracker), 100)
+        self.assertEqual(tracker.percentile(50), 150)
+        self.assertEqual(tracker.percentile(100), 199)
+
+
+class TestOperationTimeout(unittest.TestCase):
+    def setUp(self):
+        self.clock = FakeClock()
+        patcher = mock.patch.object(latency, 'time', self.clock)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_shared_by_continuation(self):
+        # each round fits into `timeout`, but both do not
+        transport = FakeTransport(self.clock, delay=lambda url: 0.15)
+        wiki = wikipediaapi.Wikipedia(
+            "en",
+            api_url=API_URL,
+            transport=transport,
+            timeout=1.0,
+            operation_timeout=0.2
+        )
+        page = wiki.page('Category:C2', ns=wikipediaapi.Namespace.CATEGORY)
+        with self.assertRaises(wikipediaapi.DeadlineExceeded):
+            page.categorymembers
+        self.assertEqual(len(transport.requests), 2)
+        self.assertFalse(page._called['categorymembers'])
+
+    def test_within_budget(self):
+        transport = FakeTransport(self.clock, delay=lambda url: 0.15)
+        wiki = wikipediaapi.Wikipedia(
+            "en",
+            api_url=API_URL,
+            transport=transport,
+            operation_timeout=1.0
+        )
+        page = wiki.page('Category:C2', ns=wikipediaapi.Namespace.CATEGORY)
+        self.assertEqual(len(page.categorymembers), 5)
+
+    def test_deadline_context(self):
+        transport = FakeTransport(self.clock, delay=lambda url: 0.15)
+        wiki = wikipediaapi.Wikipedia(
+            "en",
+            api_url=API_URL,
+            transport=transport
+        )
+        with self.assertRaises(wikipediaapi.DeadlineExceeded):
+            with wiki.deadline(0.2):
+                wiki.page('Test_1').pageid
+                wiki.page('Test_2').pageid
+        self.assertEqual(len(transport.requests), 2)
+
+
+class TestHedging(unittest.TestCase):
+    def setUp(self):
+        # slow primary requests wait until the test is finished
+        self.release = threading.Event()
+        self.addCleanup(self.release.set)
+
+    def slow_primary(self):
+        self.release.wait(10)
+        return 'primary'
+
+    def test_slow_primary(self):
+        hedger = Hedger(delay=0.01, workers=2)
+        self.addCleanup(hedger.close)
+        result = hedger.get(self.slow_primary, lambda: 'secondary', 10.0)
+        self.assertEqual(result, 'secondary')
+        self.assertEqual(hedger.hedged, 1)
+
+    def test_fast_primary(self):
+        hedger = Hedger(delay=10.0, workers=2)
+        self.addCleanup(hedger.close)
+        secondary = mock.Mock(return_value='secondary')
+        result = hedger.get(lambda: 'primary', secondary, 10.0)
+        self.assertEqual(result, 'primary')
+        self.assertEqual(hedger.hedged, 0)
+        secondary.assert_not_called()
+
+    def test_hedge_delay(self):
+        hedger = Hedger(percentile=50.0, delay=0.5, min_samples=4)
+        self.addCleanup(hedger.close)
+        for seconds in [0.1, 0.2, 0.3]:
+            hedger.latency.record(seconds)
+        self.assertEqual(hedger.hedge_delay(), 0.5)
+        hedger.latency.record(0.4)
+        self.assertEqual(hedger.hedge_delay(), 0.3)
+
+    def test_wikipedia(self):
+        def delay(url):
+            if 'primary' in url:
+                self.release.wait(10)
+            return 0.0
+
+        transport = FakeTransport(delay=delay)
+        wiki = wikipediaapi.Wikipedia(
+            "en",
+            api_url=API_URL,
+            hedge_api_url=HEDGE_API_URL,
+            transport=transport
+        )
+        self.addCleanup(wiki.close)
+        wiki.hedger.delay = 0.01
+        self.assertEqual(wiki.page('Test_1').pageid, 4)
+        self.assertEqual(wiki.hedger.hedged, 1)
+        self.assertEqual(
+            sorted(urlsplit(url).hostname for url in transport.requests),
+            ['en.primary.test', 'en.secondary.test']
+        )
+
+    def test_failing_primary(self):
+        with StubServer() as secondary:
+            wiki = wikipediaapi.Wikipedia(
+                "en",
+                api_url='http://127.0.0.1:1/{language}/api.php',
+                hedge_api_url=secondary.api_url
+            )
+            self.addCleanup(wiki.close)
+            self.assertEqual(wiki.page('Test_1').pageid, 4)
+            self.assertEqual(wiki.hedger.hedged, 1)
+
+    def test_queued_primary_is_not_hedged(self):
+        hedger = Hedger(delay=0.01, workers=2)
+        self.addCleanup(hedger.close)
+        # all threads are busy, so the primary request waits for one
+        for _ in range(2):
+            hedger._executor.submit(self.release.wait, 10)
+        queued = threading.Event()
+        submit = hedger._executor.submit
+
+        def recording_submit(*args):
+            future = submit(*args)
+            queued.set()
+            return future
+
+        hedger._executor.submit = recording_submit
+        results = []
+        thread = threading.Thread(target=lambda: results.append(
+            hedger.get(lambda: 'primary', lambda: 'secondary', 10.0)
+        ))
+        thread.start()
+        queued.wait(10)
+        self.release.set()
+        thread.join(10)
+        self.assertEqual(results, ['primary'])
+        self.assertEqual(hedger.hedged, 0)
+
+    def test_pool_size(self):
+        wiki = wikipediaapi.Wikipedia(
+            "en",
+            pool_size=20,
+            hedge_api_url='http://127.0.0.1:1/{language}/api.php'
+        )
+        self.addCleanup(wiki.close)
+        self.assertEqual(wiki.hedger._executor._max_workers, 40)
+
+
+class TestClose(unittest.TestCase):
+    def test_close(self):
+        with wikipediaapi.Wikipedia(
+                "en",
+                hedge_api_url='http://127.0.0.1:1/{language}/api.php'
+        ) as wiki:
+            transport = wiki.transport
+        self.assertTrue(wiki.hedger._executor._shutdown)
+        self.assertIsNone(wiki._transport)
+        self.assertIsNot(wiki.transport, transport)
+
+    def test_given_transport_stays_open(self):
+        transport = mock.Mock()
+        wiki = wikipediaapi.Wikipedia("en", transport=transport)
+        wiki.close()
+        transport.close.assert_not_called()
+        self.assertIs(wiki.transport, transport)
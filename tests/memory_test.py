@@ -0,0 +1,137 @@
+# -*- coding: utf-8 -*-
+import gc
+import unittest
+
+from mock_data import create_wiki, wikipedia_api_request
+from wikipediaapi.memory import footprint
+
+BACKLINKS = [
+    {'ns': 0, 'title': 'Page 1'},
+    {'ns': 14, 'title': 'Category:Sub'},
+]
+
+
+def backlinks_request(page, params):
+    if params.get('list') != 'backlinks':
+        return wikipedia_api_request(page, params)
+    namespace = int(params.get('blnamespace', -1))
+    return {'query': {'backlinks': [
+        b for b in BACKLINKS if namespace in (-1, b['ns'])
+    ]}}
+
+
+class TestMemoryBudget(unittest.TestCase):
+    def test_no_budget(self):
+        wiki = create_wiki("en")
+        wiki.page('Test_1').links
+        self.assertIsNone(wiki.memory)
+        self.assertEqual(wiki.memory_footprint, 0)
+
+    def test_footprint(self):
+        wiki = create_wiki("en", memory_budget=10 ** 9)
+        page = wiki.page('Test_1')
+        page.links
+        page.sections
+        self.assertEqual(
+            wiki.memory_footprint,
+            footprint(page, 'links') + footprint(page, 'structured')
+        )
+        self.assertEqual(len(wiki.memory), 2)
+
+    def test_evicts_least_recently_used(self):
+        wiki = create_wiki("en", memory_budget=10 ** 9)
+        p1 = wiki.page('Test_1')
+        p2 = wiki.page('Test_2')
+        p1.links
+        p2.links
+        p1.links
+        wiki.memory.limit = footprint(p1, 'links') + footprint(p2, 'links')
+        p1.sections
+        self.assertTrue(p1._called['links'])
+        self.assertTrue(p1._called['structured'])
+        self.assertFalse(p2._called['links'])
+        self.assertEqual(len(p2._links), 0)
+        self.assertLessEqual(wiki.memory_footprint, wiki.memory.limit)
+
+    def test_refetch_after_eviction(self):
+        wiki = create_wiki("en", memory_budget=1)
+        p1 = wiki.page('Test_1')
+        p2 = wiki.page('Test_2')
+        links = p1.links
+        p2.links
+        self.assertFalse(p1._called['links'])
+        self.assertEqual(len(links), 3)
+        self.assertEqual(len(p1.links), 3)
+        self.assertFalse(p2._called['links'])
+
+    def test_collected_pages_are_forgotten(self):
+        wiki = create_wiki("en", memory_budget=10 ** 9)
+        page = wiki.page('Test_1')
+        page.links
+        self.assertGreater(wiki.memory_footprint, 0)
+        del page
+        gc.collect()
+        self.assertEqual(wiki.memory_footprint, 0)
+        self.assertEqual(len(wiki.memory), 0)
+
+    def test_filtered_lists(self):
+        wiki = create_wiki(
+            "en",
+            query=backlinks_request,
+            memory_budget=10 ** 9
+        )
+        page = wiki.page('Test_1')
+        page.filtered_backlinks(namespace=0)
+        key = ('backlinks', (('blnamespace', '0'),))
+        self.assertEqual(wiki.memory_footprint, footprint(page, key))
+        self.assertGreater(wiki.memory_footprint, 0)
+
+        page.links
+        wiki.memory.limit = footprint(page, 'links')
+        page.filtered_backlinks(namespace=0)
+        page.sections
+        self.assertNotIn(key, page._filtered)
+        self.assertFalse(page._called['links'])
+        self.assertEqual(len(page.filtered_backlinks(namespace=0)), 1)
+
+    def test_invalidate_forgets_filtered_lists(self):
+        wiki = create_wiki(
+            "en",
+            query=backlinks_request,
+            memory_budget=10 ** 9
+        )
+        page = wiki.page('Test_1')
+        page.filtered_backlinks(namespace=0)
+        page._invalidate('backlinks')
+        self.assertEqual(page._filtered, {})
+        self.assertEqual(wiki.memory_footprint, 0)
+
+    def test_refetch_aliased_calls_after_eviction(self):
+        # intro and outline are tracked as structured
+        def query(page, params):
+            # responses are recorded for the title before normalization
+            params = dict(params)
+            for name in ['titles', 'page']:
+                if name in params:
+                    params[name] = params[name].replace(' ', '_')
+            return wikipedia_api_request(page, params)
+
+        wiki = create_wiki(
+            "en",
+            query=query,
+            memory_budget=1,
+            lazy_sections=True
+        )
+        p1 = wiki.page('Test_1')
+        p2 = wiki.page('Test_2')
+        self.assertEqual(p1.summary, 'Summary text')
+        p2.links
+        self.assertFalse(p1._called['intro'])
+        self.assertEqual(p1._summary, '')
+        self.assertEqual(p1.summary, 'Summary text')
+
+        titles = p1.section_titles
+        p2.links
+        self.assertFalse(p1._called['outline'])
+        self.assertEqual(p1._section_titles, [])
+        self.assertEqual(p1.section_titles, titles)
@@ -1,12 +1,40 @@
 # -*- coding: utf-8 -*-
+import wikipediaapi
+
+
+def create_wiki(
+        language='en',
+        query=None,
+        requests=None,
+        **kwargs
+):
+    """
+    Returns Wikipedia answering requests by `query`, mock data by default.
+    When `requests` list is given, parameters of every request are
+    appended to it.
+    """
+    wiki = wikipediaapi.Wikipedia(language, **kwargs)
+    query = query or wikipedia_api_request
+
+    def recording_query(page, params):
+        if requests is not None:
+            requests.append(dict(params))
+        return query(page, params)
+
+    wiki._query = recording_query
+    return wiki
 
 
 def wikipedia_api_request(page, params):
+    return wikipedia_api_response(page.language, params)
+
+
+def wikipedia_api_response(language, params):
     query = ""
     for k in sorted(params.keys()):
         query += k + "=" + str(params[k]) + "&"
 
-    return _MOCK_DATA[page.language + ":" + query]
+    return _MOCK_DATA[language + ":" + query]
 
 
 _MOCK_DATA = {
@@ -268,6 +296,207 @@ _MOCK_DATA = {
             }
         }
     },
+    'en:action=query&inprop=protection|talkid|watched|watchers|visitingwatchers|notificationtimestamp|subjectid|url|readable|preload|displaytitle&prop=info&titles=Test_1|NonExisting&': {
+        "batchcomplete": "",
+        "query": {
+            "normalized": [
+                {
+                    "from": "Test_1",
+                    "to": "Test 1"
+                }
+            ],
+            "pages": {
+                "-1": {
+                    "ns": 0,
+                    "title": "NonExisting",
+                    "missing": "",
+                    "contentmodel": "wikitext",
+                    "pagelanguage": "en",
+                    "pagelanguagehtmlcode": "en",
+                    "pagelanguagedir": "ltr",
+                    "fullurl": "https://en.wikipedia.org/wiki/NonExisting",
+                    "displaytitle": "NonExisting"
+                },
+                "4": {
+                    "pageid": 4,
+                    "ns": 0,
+                    "title": "Test 1",
+                    "contentmodel": "wikitext",
+                    "pagelanguage": "en",
+                    "pagelanguagehtmlcode": "en",
+                    "pagelanguagedir": "ltr",
+                    "lastrevid": 123,
+                    "length": 456,
+                    "fullurl": "https://en.wikipedia.org/wiki/Test_1",
+                    "canonicalurl": "https://en.wikipedia.org/wiki/Test_1",
+                    "displaytitle": "Test 1"
+                }
+            }
+        }
+    },
+    'en:action=query&exintro=1&explaintext=1&exsectionformat=wiki&prop=extracts&titles=Test_1&': {
+        "batchcomplete": "",
+        "query": {
+            "normalized": [
+                {
+                    "from": "Test_1",
+                    "to": "Test 1"
+                }
+            ],
+            "pages": {
+                "4": {
+                    "pageid": 4,
+                    "ns": 0,
+                    "title": "Test 1",
+                    "extract": "Summary text\n"
+                }
+            }
+        }
+    },
+    'en:action=query&exchars=7&explaintext=1&exsectionformat=wiki&prop=extracts&titles=Test_1&': {
+        "batchcomplete": "",
+        "query": {
+            "pages": {
+                "4": {
+                    "pageid": 4,
+                    "ns": 0,
+                    "title": "Test 1",
+                    "extract": "Summary..."
+                }
+            }
+        }
+    },
+    'en:action=query&explaintext=1&exsectionformat=wiki&exsentences=1&prop=extracts&titles=NonExisting&': {
+        "batchcomplete": "",
+        "query": {
+            "pages": {
+                "-1": {
+                    "ns": 0,
+                    "title": "NonExisting",
+                    "missing": ""
+                }
+            }
+        }
+    },
+    'en:action=parse&page=Test_1&prop=sections&': {
+        "parse": {
+            "title": "Test 1",
+            "pageid": 4,
+            "sections": [
+                {"toclevel": 1, "level": "2", "line": "Section 1", "number": "1", "index": "1"},
+                {"toclevel": 2, "level": "3", "line": "Section <i>1.1</i>", "number": "1.1", "index": "2"},
+                {"toclevel": 1, "level": "2", "line": "Section 2 &amp; 3", "number": "2", "index": "3"}
+            ]
+        }
+    },
+    'en:action=parse&disableeditsection=1&disabletoc=1&page=Test 1&prop=text&section=2&': {
+        "parse": {
+            "title": "Test 1",
+            "pageid": 4,
+            "text": {
+                "*": "<div class=\"mw-parser-output\"><h3><span class=\"mw-headline\" id=\"Section_1.1\">Section <i>1.1</i></span></h3>\n<p>Text for <b>section</b> 1.1</p>\n</div>"
+            }
+        }
+    },
+    'en:action=parse&disableeditsection=1&disabletoc=1&page=Test 1&prop=text&section=1&': {
+        "parse": {
+            "title": "Test 1",
+            "pageid": 4,
+            "text": {
+                "*": "<div class=\"mw-parser-output\"><h2><span class=\"mw-headline\" id=\"Section_1\">Section 1</span></h2>\n<p>Text for section 1</p>\n<h3><span class=\"mw-headline\" id=\"Section_1.1\">Section <i>1.1</i></span></h3>\n<p>Text for section 1.1</p>\n</div>"
+            }
+        }
+    },
+    'en:action=parse&page=NonExisting&prop=sections&': {
+        "error": {
+            "code": "missingtitle",
+            "info": "The page you specified doesn't exist."
+        }
+    },
+    'en:action=query&prop=info&titles=Test_1&': {
+        "batchcomplete": "",
+        "query": {
+            "normalized": [
+                {
+                    "from": "Test_1",
+                    "to": "Test 1"
+                }
+            ],
+            "pages": {
+                "4": {
+                    "pageid": 4,
+                    "ns": 0,
+                    "title": "Test 1",
+                    "contentmodel": "wikitext",
+                    "pagelanguage": "en",
+                    "pagelanguagehtmlcode": "en",
+                    "pagelanguagedir": "ltr",
+                    "touched": "2018-01-01T00:00:00Z",
+                    "lastrevid": 123,
+                    "length": 456
+                }
+            }
+        }
+    },
+    'en:action=query&inprop=url&prop=info&titles=Test 1&': {
+        "batchcomplete": "",
+        "query": {
+            "pages": {
+                "4": {
+                    "pageid": 4,
+                    "ns": 0,
+                    "title": "Test 1",
+                    "contentmodel": "wikitext",
+                    "pagelanguage": "en",
+                    "pagelanguagehtmlcode": "en",
+                    "pagelanguagedir": "ltr",
+                    "touched": "2018-01-01T00:00:00Z",
+                    "lastrevid": 123,
+                    "length": 456,
+                    "fullurl": "https://en.wikipedia.org/wiki/Test_1",
+                    "editurl": "https://en.wikipedia.org/w/index.php?title=Test_1&action=edit",
+                    "canonicalurl": "https://en.wikipedia.org/wiki/Test_1"
+                }
+            }
+        }
+    },
+    'en:action=query&prop=info&titles=Test_1|NonExisting&': {
+        "batchcomplete": "",
+        "query": {
+            "normalized": [
+                {
+                    "from": "Test_1",
+                    "to": "Test 1"
+                }
+            ],
+            "pages": {
+                "-1": {
+                    "ns": 0,
+                    "title": "NonExisting",
+                    "missing": ""
+                },
+                "4": {
+                    "pageid": 4,
+                    "ns": 0,
+                    "title": "Test 1",
+                    "lastrevid": 123,
+                    "length": 456
+                }
+            }
+        }
+    },
+    'en:action=query&explaintext=1&exsectionformat=wiki&prop=extracts&titles=NonExisting&': {
+        "batchcomplete": "",
+        "query": {
+            "pages": {
+                "-1": {
+                    "ns": 0,
+                    "title": "NonExisting",
+                    "missing": ""
+                }
+            }
+        }
+    },
     'en:action=query&lllimit=500&llprop=url&prop=langlinks&titles=Test_1&': {
         "batchcomplete": "",
         "query": {
@@ -462,3 +691,33 @@ _MOCK_DATA = {
     },
 
 }
+
+# Pages are renamed to their normalized title after the first request.
+for _prop in [
+    'explaintext=1&exsectionformat=wiki&prop=extracts',
+    'lllimit=500&llprop=url&prop=langlinks',
+    'pllimit=500&prop=links',
+    'cllimit=500&prop=categories',
+]:
+    _MOCK_DATA['en:action=query&' + _prop + '&titles=Test 1&'] = \
+        _MOCK_DATA['en:action=query&' + _prop + '&titles=Test_1&']
+
+for _i in [2, 3]:
+    _MOCK_DATA[
+        'l{}:action=query&inprop=protection|talkid|watched|watchers|visitingwatchers|notificationtimestamp|subjectid|url|readable|preload|displaytitle&prop=info&titles=Test 1 - {}&'.format(_i, _i)
+    ] = {
+        "batchcomplete": "",
+        "query": {
+            "pages": {
+                str(10 * _i): {
+                    "pageid": 10 * _i,
+                    "ns": 0,
+                    "title": "Test 1 - {}".format(_i),
+                    "contentmodel": "wikitext",
+                    "pagelanguage": "l{}".format(_i),
+                    "fullurl": "https://l{}.wikipedia.org/wiki/Test 1 - {}".format(_i, _i),
+                    "displaytitle": "Test 1 - {}".format(_i)
+                }
+            }
+        }
+    }
@@ -0,0 +1,121 @@
+# -*- coding: utf-8 -*-
+import threading
+import unittest
+
+from mock_data import create_wiki, wikipedia_api_request
+from wikipediaapi.prefetch import Prefetcher
+
+
+class TestPrefetch(unittest.TestCase):
+    def prefetching_wiki(self, prefetcher):
+        self.requests = []
+        self.threads = []
+
+        def query(page, params):
+            self.threads.append(threading.current_thread())
+            return wikipedia_api_request(page, params)
+
+        return create_wiki(
+            "en",
+            query=query,
+            requests=self.requests,
+            prefetcher=prefetcher
+        )
+
+    def props(self):
+        return [params['prop'] for params in self.requests]
+
+    def test_without_prefetcher(self):
+        wiki = self.prefetching_wiki(None)
+        wiki.page('Test_1').summary
+        self.assertEqual(self.props(), ['extracts'])
+
+    def test_plan(self):
+        prefetcher = Prefetcher(plan={'structured': ['categories', 'langlinks']})
+        wiki = self.prefetching_wiki(prefetcher)
+        page = wiki.page('Test_1')
+        page.summary
+        prefetcher.wait()
+        self.assertTrue(page._called['categories'])
+        self.assertTrue(page._called['langlinks'])
+        self.assertFalse(page._called['links'])
+        self.assertEqual(prefetcher.prefetched, 2)
+        self.assertIsNot(self.threads[1], threading.current_thread())
+
+        self.assertEqual(len(page.categories), 3)
+        self.assertEqual(len(page.langlinks), 3)
+        self.assertEqual(
+            sorted(self.props()),
+            ['categories', 'extracts', 'langlinks']
+        )
+
+    def test_plan_sequence(self):
+        prefetcher = Prefetcher(plan=['structured', 'links'])
+        self.assertEqual(
+            prefetcher.plan,
+            {'structured': ['links'], 'links': ['structured']}
+        )
+        wiki = self.prefetching_wiki(prefetcher)
+        page = wiki.page('Test_1')
+        page.links
+        prefetcher.wait()
+        self.assertTrue(page._called['structured'])
+
+    def test_learns_access_pattern(self):
+        prefetcher = Prefetcher(min_pages=2)
+        wiki = self.prefetching_wiki(prefetcher)
+        for _ in range(2):
+            page = wiki.page('Test_1')
+            page.summary
+            page.categories
+            page.langlinks
+        self.assertEqual(prefetcher.prefetched, 0)
+        self.assertEqual(
+            sorted(prefetcher.predict('structured')),
+            ['categories', 'langlinks']
+        )
+        self.assertEqual(prefetcher.predict('langlinks'), [])
+
+        page = wiki.page('Test_1')
+        page.summary
+        prefetcher.wait()
+        self.assertTrue(page._called['categories'])
+        self.assertTrue(page._called['langlinks'])
+        self.assertEqual(prefetcher.prefetched, 2)
+
+    def test_rare_access_is_not_predicted(self):
+        prefetcher = Prefetcher(min_pages=1, threshold=0.6)
+        wiki = self.prefetching_wiki(prefetcher)
+        wiki.page('Test_1').summary
+        wiki.page('Test_1').summary
+        page = wiki.page('Test_1')
+        page.summary
+        page.links
+        self.assertEqual(prefetcher.predict('structured'), [])
+
+    def test_repeated_access_is_counted_once(self):
+        prefetcher = Prefetcher()
+        wiki = self.prefetching_wiki(prefetcher)
+        page = wiki.page('Test_1')
+        self.assertTrue(prefetcher.accessed(page, 'structured'))
+        self.assertFalse(prefetcher.accessed(page, 'structured'))
+        page.summary
+        page.sections
+        self.assertEqual(prefetcher._seen['structured'], 1)
+
+    def test_failed_prefetch_is_fetched_again(self):
+        prefetcher = Prefetcher(plan={'structured': ['links']})
+        fail = [True]
+
+        def query(page, params):
+            if params['prop'] == 'links' and fail[0]:
+                raise ConnectionError('failed')
+            return wikipedia_api_request(page, params)
+
+        wiki = create_wiki("en", query=query, prefetcher=prefetcher)
+        page = wiki.page('Test_1')
+        page.summary
+        prefetcher.wait()
+        self.assertFalse(page._called['links'])
+        fail[0] = False
+        self.assertEqual(len(page.links), 3)
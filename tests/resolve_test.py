@@ -0,0 +1,95 @@
+# -*- coding: utf-8 -*-
+import unittest
+
+import wikipediaapi
+from mock_data import create_wiki
+
+PAGES = {
+    'Test 1': 4,
+    'Test 2': 5,
+}
+REDIRECTS = {
+    'Test One': 'Test 1',
+}
+
+
+def fake_query(page, params):
+    """
+    Answers action=query&titles=... for PAGES and REDIRECTS.
+    """
+    query = {'normalized': [], 'redirects': [], 'pages': {}}
+    missing = 0
+    for title in params['titles'].split('|'):
+        name = title.replace('_', ' ')
+        if name != title:
+            query['normalized'].append({'from': title, 'to': name})
+        if name in REDIRECTS:
+            query['redirects'].append({'from': name, 'to': REDIRECTS[name]})
+            name = REDIRECTS[name]
+        if name in PAGES:
+            query['pages'][str(PAGES[name])] = {
+                'pageid': PAGES[name], 'ns': 0, 'title': name
+            }
+        else:
+            missing -= 1
+            query['pages'][str(missing)] = {
+                'ns': 0, 'title': name, 'missing': ''
+            }
+    return {'batchcomplete': '', 'query': query}
+
+
+class TestResolve(unittest.TestCase):
+    def setUp(self):
+        self.requests = []
+        self.wiki = create_wiki("en", query=fake_query, requests=self.requests)
+
+    def batches(self):
+        return [params['titles'].split('|') for params in self.requests]
+
+    def test_resolve(self):
+        results = self.wiki.resolve(['Test_1', 'Test One', 'Missing'])
+        self.assertEqual(
+            results['Test_1'],
+            wikipediaapi.Resolution('Test_1', True, 4, 'Test 1', None)
+        )
+        self.assertEqual(
+            results['Test One'],
+            wikipediaapi.Resolution('Test One', True, 4, 'Test One', 'Test 1')
+        )
+        self.assertEqual(
+            results['Missing'],
+            wikipediaapi.Resolution('Missing', False, -1, 'Missing', None)
+        )
+
+    def test_batches(self):
+        titles = ['Title {}'.format(i) for i in range(120)] + ['Test 2']
+        results = self.wiki.resolve(titles + titles, workers=3)
+        self.assertEqual(len(results), 121)
+        self.assertEqual(
+            sorted(len(batch) for batch in self.batches()),
+            [21, 50, 50]
+        )
+        self.assertTrue(results['Test 2'].exists)
+
+    def test_resume(self):
+        results = self.wiki.resolve(['Test_1'])
+        self.wiki.resolve(['Test_1', 'Test_2'], results=results)
+        self.assertEqual(self.batches(), [['Test_1'], ['Test_2']])
+        self.assertEqual(len(results), 2)
+
+    def test_exists_many(self):
+        self.assertEqual(
+            self.wiki.exists_many(['Test_1', 'Missing']),
+            {'Test_1': True, 'Missing': False}
+        )
+
+    def test_without_pages(self):
+        # e.g. only invalid titles, which are reported as `interwiki`
+        wiki = create_wiki("en", query=lambda page, params: {
+            'batchcomplete': '',
+            'query': {'interwiki': [{'title': 'fr:Test', 'iw': 'fr'}]}
+        })
+        self.assertEqual(
+            wiki.resolve(['fr:Test'])['fr:Test'],
+            wikipediaapi.Resolution('fr:Test', False, -1, 'fr:Test', None)
+        )
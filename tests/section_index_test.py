@@ -0,0 +1,114 @@
+# -*- coding: utf-8 -*-
+import unittest
+
+from wikipediaapi import bundle
+
+from mock_data import create_wiki
+
+EXTRACT = (
+    "Summary\n\n"
+    "== History ==\nHistory text\n\n"
+    "=== References ===\nHistory references\n\n"
+    "== Geography ==\nGeography text\n\n"
+    "=== History ===\nGeography history\n\n"
+    "=== References ===\nGeography references"
+)
+
+
+class TestSectionIndex(unittest.TestCase):
+    def setUp(self):
+        self.wiki = create_wiki("en")
+        self.page = self.wiki.page('Duplicates')
+        self.wiki._build_structured({'extract': EXTRACT}, self.page)
+        self.page._called['structured'] = True
+
+    def test_section_by_path(self):
+        self.assertEqual(
+            self.page.section_by_path('History', 'References').text,
+            'History references'
+        )
+        self.assertEqual(
+            self.page.section_by_path('Geography', 'References').text,
+            'Geography references'
+        )
+        with self.assertRaises(KeyError):
+            self.page.section_by_path('References')
+
+    def test_duplicate_titles(self):
+        self.assertEqual(
+            [s.text for s in self.page.sections_by_title('History')],
+            ['History text', 'Geography history']
+        )
+        self.assertEqual(
+            self.page.section_by_title('History').text,
+            'Geography history'
+        )
+
+    def test_repeated_path(self):
+        page = self.wiki.page('Repeated')
+        self.wiki._build_structured(
+            {'extract': "Summary\n\n== Notes ==\nFirst\n\n== Notes ==\nSecond"},
+            page
+        )
+        page._called['structured'] = True
+        self.assertEqual(page.section_by_path('Notes').text, 'Second')
+        self.assertIs(
+            page.section_by_path('Notes'),
+            page.section_by_title('Notes')
+        )
+        self.assertEqual(page.section_index.id(['Notes']), 1)
+
+    def test_sections_at_level(self):
+        self.assertEqual(
+            [s.title for s in self.page.sections_at_level(1)],
+            ['History', 'Geography']
+        )
+        self.assertEqual(
+            [s.text for s in self.page.sections_at_level(2)],
+            ['History references', 'Geography history', 'Geography references']
+        )
+
+    def test_ids_and_offsets(self):
+        index = self.page.section_index
+        self.assertEqual(len(index), 5)
+        self.assertEqual(list(index.parents), [-1, 0, -1, 2, 2])
+        self.assertEqual(index.id(('Geography', 'History')), 3)
+        self.assertEqual(index.paths[4], ('Geography', 'References'))
+        for i in range(len(index)):
+            self.assertTrue(
+                EXTRACT[index.starts[i]:index.ends[i]].strip().endswith(
+                    index[i].text
+                )
+            )
+        self.assertTrue(
+            EXTRACT[index.starts[0]:].lstrip().startswith('== History ==')
+        )
+        self.assertEqual(index.ends[4], len(EXTRACT))
+
+    def test_iter_sections(self):
+        self.assertEqual(
+            [path for path, _ in self.page.iter_sections()],
+            list(self.page.section_index.paths)
+        )
+
+    def test_bundle(self):
+        restored = bundle.loads(self.wiki, bundle.dumps(self.page))
+        self.assertEqual(
+            restored.section_by_path('Geography', 'History').text,
+            'Geography history'
+        )
+        self.assertEqual(
+            list(restored.section_index.starts),
+            list(self.page.section_index.starts)
+        )
+
+    def test_mock_page(self):
+        page = self.wiki.page('Test_1')
+        self.assertEqual(
+            page.section_by_path('Section 4', 'Section 4.2', 'Section 4.2.1'),
+            page.section_by_title('Section 4.2.1')
+        )
+        self.assertEqual(
+            len(page.section_index),
+            len(page.section_titles)
+        )
@@ -0,0 +1,92 @@
+# -*- coding: utf-8 -*-
+import unittest
+
+from mock_data import create_wiki
+import wikipediaapi
+
+
+class TestSelectiveFetch(unittest.TestCase):
+    def setUp(self):
+        self.requests = []
+        self.wiki = create_wiki(
+            "en",
+            requests=self.requests,
+            lazy_sections=True
+        )
+
+    def test_summary_fetches_intro(self):
+        page = self.wiki.page('Test_1')
+        self.assertEqual(page.summary, 'Summary text')
+        self.assertEqual(len(self.requests), 1)
+        self.assertEqual(self.requests[0]['exintro'], 1)
+        self.assertFalse(page._called['structured'])
+
+    def test_section_titles_fetch_outline(self):
+        page = self.wiki.page('Test_1')
+        self.assertEqual(
+            page.section_titles,
+            ['Section 1', 'Section 1.1', 'Section 2 & 3']
+        )
+        self.assertEqual(self.requests[0]['action'], 'parse')
+        self.assertEqual(page.pageid, 4)
+
+    def test_outline_nonexisting(self):
+        page = self.wiki.page('NonExisting')
+        self.assertEqual(page.section_titles, [])
+        self.assertFalse(page.exists())
+
+    def test_sections_after_summary(self):
+        page = self.wiki.page('Test_1')
+        self.assertEqual(page.summary, 'Summary text')
+        page.sections
+        self.assertEqual(
+            page.section_by_title('Section 4.2.1').text,
+            'Text for section 4.2.1'
+        )
+        self.assertEqual(len(page.section_titles), 12)
+        self.assertEqual(page.summary, 'Summary text')
+        self.assertEqual(len(self.requests), 2)
+
+    def test_section_by_title_fetches_section(self):
+        page = self.wiki.page('Test_1')
+        section = page.section_by_title('Section 1')
+        self.assertEqual(section.text, 'Text for section 1')
+        self.assertEqual(section.level, 1)
+        self.assertEqual(
+            page.section_by_title('Section 1.1').text,
+            'Text for section 1.1'
+        )
+        self.assertIs(page.section_by_title('Section 1'), section)
+        self.assertEqual(
+            [(r['action'], r.get('section')) for r in self.requests],
+            [('parse', None), ('parse', 1), ('parse', 2)]
+        )
+        self.assertFalse(page._called['structured'])
+        self.assertEqual(sorted(page._lazy_sections), [1, 2])
+        with self.assertRaises(KeyError):
+            page.section_by_title('Unknown')
+
+    def test_section_html(self):
+        wiki = create_wiki(
+            "en",
+            lazy_sections=True,
+            extract_format=wikipediaapi.ExtractFormat.HTML
+        )
+        self.assertEqual(
+            wiki.page('Test_1').section_by_title('Section 1.1').text,
+            '<p>Text for <b>section</b> 1.1</p>\n</div>'
+        )
+
+    def test_text_fetches_once(self):
+        page = self.wiki.page('Test_1')
+        self.assertTrue(page.text.startswith('Summary text'))
+        self.assertEqual(len(self.requests), 1)
+
+    def test_extract_chars(self):
+        page = self.wiki.page('Test_1')
+        self.assertEqual(page.extract(chars=7), 'Summary...')
+
+    def test_extract_nonexisting(self):
+        page = self.wiki.page('NonExisting')
+        self.assertEqual(page.extract(sentences=1), '')
+        self.assertEqual(page.pageid, -1)
@@ -0,0 +1,66 @@
+# -*- coding: utf-8 -*-
+import unittest
+
+from wikipediaapi.stats import SectionTable
+
+from mock_data import create_wiki
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+EXTRACT = (
+    "Summary of  the page\n\n"
+    "== History ==\nČeská\u00a0historie  v\tpěti slovech\n\n"
+    "=== Sources ===\n\n\n"
+    "== Geography ==\nhills"
+)
+
+
+class TestSectionTable(unittest.TestCase):
+    def setUp(self):
+        self.wiki = create_wiki("en")
+        self.page = self.wiki.page('Stats')
+        self.wiki._build_structured({'extract': EXTRACT}, self.page)
+        self.page._called['structured'] = True
+
+    def test_rows(self):
+        table = SectionTable.from_pages([self.page, self.wiki.page('Test_1')])
+        test_1 = self.wiki.page('Test_1')
+        self.assertEqual(table.titles, [('en', 'Stats'), ('en', 'Test 1')])
+        self.assertEqual(len(table), 4 + 1 + len(test_1.section_titles))
+        self.assertEqual(list(table.level[:4]), [0, 1, 2, 1])
+        self.assertEqual(list(table.parent[:4]), [-1, -1, 1, -1])
+        self.assertEqual(table.parent[6], 5)
+        offsets = table.text_offsets
+        self.assertEqual(
+            table.text[offsets[1]:offsets[2]].decode('utf-8'),
+            self.page.section_by_title('History').text
+        )
+
+    def test_statistics(self):
+        table = SectionTable.from_pages([self.page])
+        statistics = table.statistics()
+        # no-break space does not separate words
+        self.assertEqual(list(statistics['words']), [4, 4, 0, 1])
+        self.assertEqual(list(statistics['length']), [20, 30, 0, 5])
+        self.assertEqual(list(statistics['density'])[2:], [0.0, 0.2])
+        self.assertEqual(list(table.per_page(statistics['words'])), [9])
+
+    def test_matches_split(self):
+        page = self.wiki.page('Test_1')
+        table = SectionTable.from_pages([page])
+        texts = [page.summary] + [s.text for _, s in page.iter_sections()]
+        self.assertEqual(
+            list(table.words()),
+            [len(t.split()) for t in texts]
+        )
+
+    @unittest.skipIf(numpy is None, 'numpy is not installed')
+    def test_numpy_views(self):
+        table = SectionTable.from_pages([self.page])
+        columns = table.to_numpy()
+        self.assertEqual(list(columns['level']), [0, 1, 2, 1])
+        table.length[0] = 100
+        self.assertEqual(columns['length'][0], 100)
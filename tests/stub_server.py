@@ -0,0 +1,70 @@
+# -*- coding: utf-8 -*-
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import json
+import threading
+import time
+from urllib.parse import urlparse, parse_qsl
+
+from mock_data import wikipedia_api_response
+
+
+class StubServer(object):
+    """
+    Local HTTP server answering API requests from mock data.
+    Language is the first part of the path: /<language>/api.php
+    """
+
+    def __init__(self, delay=lambda params: 0.0):
+        self.delay = delay
+        self.requests = []
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'
+
+            def do_GET(self):
+                url = urlparse(self.path)
+                language = url.path.split('/')[1]
+                params = dict(parse_qsl(url.query))
+                server.requests.append(dict(params))
+                params.pop('format', None)
+                params.pop('redirects', None)
+                time.sleep(server.delay(params))
+                try:
+                    body = json.dumps(
+                        wikipedia_api_response(language, params)
+                    ).encode('utf-8')
+                    self.send_response(200)
+                except KeyError:
+                    body = b'{}'
+                    self.send_response(404)
+                self.send_header('Content-Type', 'application/json')
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                try:
+                    self.wfile.write(body)
+                except ConnectionError:
+                    # client gave up waiting, e.g. after its deadline
+                    self.close_connection = True
+
+            def log_message(self, *args):
+                pass
+
+        self.httpd = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+        self.httpd.daemon_threads = True
+        self.api_url = 'http://127.0.0.1:{}/{{language}}/api.php'.format(
+            self.httpd.server_address[1]
+        )
+        self.thread = threading.Thread(
+            target=self.httpd.serve_forever,
+            kwargs={'poll_interval': 0.01}
+        )
+        self.thread.daemon = True
+
+    def __enter__(self):
+        self.thread.start()
+        return self
+
+    def __exit__(self, *args):
+        self.httpd.shutdown()
+        self.httpd.server_close()
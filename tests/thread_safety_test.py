@@ -0,0 +1,65 @@
+# -*- coding: utf-8 -*-
+from collections import Counter
+import threading
+import time
+import unittest
+
+from mock_data import create_wiki, wikipedia_api_request
+
+
+class TestThreadSafety(unittest.TestCase):
+    def setUp(self):
+        self.requests = Counter()
+        self.requests_lock = threading.Lock()
+
+        def counting_request(page, params):
+            with self.requests_lock:
+                self.requests[params.get('prop', params.get('list'))] += 1
+            # give other threads a chance to race
+            time.sleep(0.01)
+            return wikipedia_api_request(page, params)
+
+        self.wiki = create_wiki("en", query=counting_request)
+
+    def run_threads(self, fn, count=16):
+        barrier = threading.Barrier(count)
+        results = [None] * count
+
+        def worker(i):
+            barrier.wait()
+            results[i] = fn()
+
+        threads = [
+            threading.Thread(target=worker, args=(i,)) for i in range(count)
+        ]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        return results
+
+    def test_links_fetched_once(self):
+        page = self.wiki.page('Test_2')
+        results = self.run_threads(lambda: len(page.links))
+        self.assertEqual(results, [5] * 16)
+        self.assertEqual(self.requests['links'], 2)
+
+    def test_structured_fetched_once(self):
+        page = self.wiki.page('Test_1')
+        results = self.run_threads(lambda: len(page.section_titles))
+        self.assertEqual(results, [12] * 16)
+        self.assertEqual(self.requests['extracts'], 1)
+
+    def test_attribute_fetched_once(self):
+        page = self.wiki.page('Test_1')
+        results = self.run_threads(lambda: page.pageid)
+        self.assertEqual(results, [4] * 16)
+        self.assertEqual(self.requests['info'], 1)
+
+    def test_map(self):
+        results = self.wiki.map(
+            lambda p: (len(p.links), p.title),
+            ['Test_1', 'Test_2'] * 4,
+            workers=4
+        )
+        self.assertEqual(results, [(3, 'Test 1'), (5, 'Test 2')] * 4)
@@ -0,0 +1,85 @@
+# -*- coding: utf-8 -*-
+import os
+import tempfile
+import unittest
+
+import wikipediaapi
+from wikipediaapi.titles import TitleCache
+
+from mock_data import create_wiki
+from tests.resolve_test import fake_query
+
+
+class TestTitleCache(unittest.TestCase):
+    def setUp(self):
+        self.cache = TitleCache()
+        self.requests = []
+        self.wiki = create_wiki(
+            "en",
+            query=fake_query,
+            requests=self.requests,
+            title_cache=self.cache
+        )
+
+    def batches(self):
+        return [params['titles'].split('|') for params in self.requests]
+
+    def test_learn(self):
+        self.cache.learn('en', fake_query(None, {'titles': 'Test_One'})['query'])
+        self.assertEqual(self.cache.normalized('en', 'Test_One'), 'Test One')
+        self.assertEqual(self.cache.canonical('en', 'Test_One'), 'Test 1')
+        self.assertEqual(
+            self.cache.lookup('en', 'Test_One'),
+            ('Test One', 'Test 1', 4)
+        )
+        self.assertIsNone(self.cache.lookup('en', 'Test_2'))
+        self.assertEqual(self.cache.canonical('de', 'Test_One'), 'Test_One')
+
+    def test_page_is_canonical(self):
+        self.wiki.resolve(['Test One'])
+        self.assertEqual(self.wiki.page('Test One').title, 'Test 1')
+        self.assertEqual(self.wiki.page('Other').title, 'Other')
+
+    def test_resolve_served_locally(self):
+        self.wiki.resolve(['Test_1', 'Missing'])
+        results = self.wiki.resolve(['Test_1', 'Missing'])
+        self.assertEqual(self.batches(), [['Test_1', 'Missing']])
+        self.assertEqual(
+            results['Test_1'],
+            wikipediaapi.Resolution('Test_1', True, 4, 'Test 1', None)
+        )
+        self.assertFalse(results['Missing'].exists)
+
+    def test_resolve_deduplicates_aliases(self):
+        self.cache.learn('en', {
+            'redirects': [{'from': 'Test One', 'to': 'Test 1'}]
+        })
+        results = self.wiki.resolve(['Test 1', 'Test One'])
+        self.assertEqual(self.batches(), [['Test 1']])
+        self.assertEqual(
+            results['Test One'],
+            wikipediaapi.Resolution('Test One', True, 4, 'Test One', 'Test 1')
+        )
+
+    def test_common_attributes(self):
+        page = self.wiki.page('Test_One')
+        self.wiki.fetch_info([page])
+        self.assertEqual(page.pageid, 4)
+        self.assertEqual(self.cache.canonical('en', 'Test_One'), 'Test 1')
+
+    def test_persistence(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, 'titles.jsonl')
+            cache = TitleCache(path)
+            cache.learn('en', fake_query(None, {'titles': 'Test_One'})['query'])
+            cache.learn('en', fake_query(None, {'titles': 'Test_One'})['query'])
+            cache.close()
+            with open(path) as f:
+                self.assertEqual(len(f.readlines()), 3)
+
+            cache = TitleCache(path)
+            self.assertEqual(
+                cache.lookup('en', 'Test_One'),
+                ('Test One', 'Test 1', 4)
+            )
+            cache.close()
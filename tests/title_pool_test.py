@@ -0,0 +1,70 @@
+# -*- coding: utf-8 -*-
+import unittest
+
+import wikipediaapi
+from wikipediaapi.titles import TitlePool
+
+from mock_data import create_wiki
+
+
+class TestTitlePool(unittest.TestCase):
+    def test_normalize(self):
+        pool = TitlePool()
+        self.assertEqual(pool.title('en', 'test__page_ 1 '), 'Test page 1')
+        self.assertEqual(pool.title('en', 'éclair'), 'Éclair')
+        self.assertEqual(pool.title('de', 'ßtraße'), 'ßtraße')
+        self.assertEqual(pool.title('tr', 'istanbul'), 'İstanbul')
+        self.assertEqual(pool.title('en', 'istanbul'), 'Istanbul')
+        self.assertEqual(pool.title('hr', 'ǆemal'), 'ǅemal')
+
+    def test_case_sensitive(self):
+        pool = TitlePool()
+        self.assertEqual(pool.title('jbo', 'lojban'), 'lojban')
+        pool = TitlePool(case_sensitive=['xx'])
+        self.assertEqual(pool.title('xx', 'iPod_nano'), 'iPod nano')
+        self.assertEqual(pool.title('en', 'iPod_nano'), 'IPod nano')
+
+    def test_intern_keeps_title(self):
+        pool = TitlePool()
+        self.assertEqual(pool.intern('jbo', 'lojban'), 'lojban')
+        self.assertEqual(pool.intern('en', 'iPod'), 'iPod')
+
+    def test_identity(self):
+        pool = TitlePool()
+        first = pool.title('en', ''.join(['Test', ' 1']))
+        self.assertIs(pool.title('en', 'Test_1'), first)
+        self.assertIs(pool.intern('en', ''.join(['Test', ' 1'])), first)
+        self.assertEqual(len(pool), 1)
+        pool.clear()
+        self.assertEqual(len(pool), 0)
+
+    def test_max_size(self):
+        pool = TitlePool(max_size=2)
+        first = pool.intern('en', ''.join(['Test', ' 1']))
+        pool.intern('en', 'Test 2')
+        pool.intern('en', 'Test 3')
+        self.assertEqual(len(pool), 2)
+        self.assertIsNot(pool.intern('en', ''.join(['Test', ' 1'])), first)
+
+    def test_disabled_by_default(self):
+        wiki = wikipediaapi.Wikipedia("en")
+        self.assertIsNone(wiki.title_pool)
+
+    def test_shared_by_builders(self):
+        pool = TitlePool()
+        wiki = create_wiki("en", title_pool=pool)
+        page = wiki.page('Test_1')
+        for title, link in page.links.items():
+            self.assertIs(link.title, title)
+            self.assertIs(pool.intern('en', title), title)
+        for language, link in page.langlinks.items():
+            self.assertIs(pool.intern(language, link.title), link.title)
+        self.assertIs(pool.intern('en', 'Test 1'), page.title)
+
+    def test_page_title(self):
+        pool = TitlePool()
+        wiki = create_wiki("en", title_pool=pool)
+        page = wiki.page('test_1')
+        self.assertEqual(page.title, 'Test 1')
+        self.assertIs(page.title, pool.intern('en', 'Test 1'))
+        self.assertIs(wiki.page('Test 1').title, page.title)
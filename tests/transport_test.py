@@ -0,0 +1,45 @@
+# -*- coding: utf-8 -*-
+import unittest
+
+import wikipediaapi
+from wikipediaapi.transport import RequestsTransport, HttpxTransport
+from stub_server import StubServer
+
+try:
+    import httpx
+except ImportError:
+    httpx = None
+
+
+class TestTransport(unittest.TestCase):
+    def setUp(self):
+        self.server = StubServer().__enter__()
+
+    def tearDown(self):
+        self.server.__exit__()
+
+    def check_transport(self, transport):
+        wiki = wikipediaapi.Wikipedia(
+            "en",
+            api_url=self.server.api_url,
+            transport=transport
+        )
+        page = wiki.page('Test_1')
+        self.assertEqual(len(page.links), 3)
+        self.assertEqual(page.title, 'Test 1')
+        self.assertEqual(self.server.requests[0]['format'], 'json')
+        transport.close()
+
+    def test_default_url_is_https(self):
+        wiki = wikipediaapi.Wikipedia("cs")
+        self.assertEqual(
+            wiki.api_url.format(language='cs'),
+            'https://cs.wikipedia.org/w/api.php'
+        )
+
+    def test_requests_transport(self):
+        self.check_transport(RequestsTransport())
+
+    @unittest.skipIf(httpx is None, 'httpx is not installed')
+    def test_httpx_transport(self):
+        self.check_transport(HttpxTransport())
@@ -1,15 +1,13 @@
 # -*- coding: utf-8 -*-
 from collections import defaultdict
 import unittest
-import wikipediaapi
 
-from mock_data import wikipedia_api_request
+from mock_data import create_wiki
 
 
 class TestWikipediaPage(unittest.TestCase):
     def setUp(self):
-        self.wiki = wikipediaapi.Wikipedia("en")
-        self.wiki._query = wikipedia_api_request
+        self.wiki = create_wiki("en")
 
     def test_repr_before_fetching(self):
         page = self.wiki.page('Test_1')
@@ -38,3 +36,28 @@ class TestWikipediaPage(unittest.TestCase):
         p = self.wiki.page('Test_1')
         a = self.wiki.article('Test_1')
         self.assertEqual(p.pageid, a.pageid)
+
+    def test_attribute_cached_on_instance(self):
+        page = self.wiki.page('Test_1')
+        self.assertNotIn('pageid', vars(page))
+        self.assertEqual(page.pageid, 4)
+        self.assertEqual(vars(page)['pageid'], 4)
+
+    def test_missing_attribute_after_fetching(self):
+        page = self.wiki.page('Test_1')
+        self.assertEqual(page.pageid, 4)
+        with self.assertRaises(AttributeError):
+            page.watchers
+
+    def test_fetch_info(self):
+        pages = [
+            self.wiki.page('Test_1'),
+            self.wiki.page('NonExisting'),
+        ]
+        self.wiki.fetch_info(pages)
+        self.assertEqual(pages[0].pageid, 4)
+        self.assertEqual(pages[0].title, 'Test 1')
+        self.assertEqual(pages[0].lastrevid, 123)
+        self.assertEqual(pages[1].pageid, -1)
+        self.assertFalse(pages[1].exists())
+        self.assertTrue(all(p._called['info'] for p in pages))
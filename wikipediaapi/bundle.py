@@ -0,0 +1,248 @@
+'''
+Compact serialization of fetched pages.
+
+Single page is stored as zlib compressed JSON document. Bundle is a file
+with many such documents followed by an index, so it can be memory-mapped
+and only pages, which are really accessed, are decoded.
+
+Layout of the bundle::
+
+    MAGIC | VERSION | page 1 | page 2 | ... | index | index offset | MAGIC
+'''
+import json
+import mmap
+import os
+import struct
+import zlib
+from typing import Dict, Any, List, Iterator, Tuple
+
+from .wikipedia import Wikipedia, WikipediaPage, WikipediaPageSection
+
+MAGIC = b'WAPB'
+VERSION = 1
+HEADER = struct.Struct('<4sH')
+TRAILER = struct.Struct('<QQ4s')
+
+LINK_PROPERTIES = [
+    'langlinks',
+    'links',
+    'backlinks',
+    'categories',
+    'categorymembers',
+]
+
+
+def _public_attributes(page: WikipediaPage) -> Dict[str, Any]:
+    return {
+        k: v for k, v in vars(page).items()
+        if not k.startswith('_') and k != 'wiki'
+    }
+
+
+def _section_to_list(section: WikipediaPageSection) -> List[Any]:
+    return [
+        section.title,
+        section.level,
+        section.text,
+        [_section_to_list(s) for s in section.sections]
+    ]
+
+
+def _section_from_list(
+        page: WikipediaPage,
+        data: List[Any],
+        parent: int,
+        offsets: Iterator[List[int]]
+):
+    section = WikipediaPageSection(data[0], data[1], data[2])
+    start, end = next(offsets, (-1, -1))
+    i = page._section_index.add(section, parent, start, end)
+    page._section_titles.append(section.title)
+    for sub in data[3]:
+        section._sections.append(_section_from_list(page, sub, i, offsets))
+    return section
+
+
+def page_to_dict(page: WikipediaPage) -> Dict[str, Any]:
+    '''
+    Returns JSON serializable representation of already fetched data.
+    Nothing is fetched by this function.
+    '''
+    data = {
+        'attributes': _public_attributes(page),
+        'called': dict(page._called),
+        'summary': page._summary,
+        'sections': [_section_to_list(s) for s in page._sections],
+        'offsets': [
+            [start, end] for start, end in zip(
+                page._section_index.starts,
+                page._section_index.ends
+            )
+        ],
+        'outline': page._outline,
+        'info_props': sorted(page._info_props),
+    }
+    if not page._called['structured']:
+        # titles fetched with the outline, sections are not known
+        data['section_titles'] = page._section_titles
+    for prop in LINK_PROPERTIES:
+        data[prop] = {
+            k: _public_attributes(p)
+            for k, p in getattr(page, '_' + prop).items()
+        }
+    return data
+
+
+def page_from_dict(wiki: Wikipedia, data: Dict[str, Any]) -> WikipediaPage:
+    attributes = dict(data['attributes'])
+    page = WikipediaPage(
+        wiki,
+        title=attributes.pop('title'),
+        ns=attributes.pop('ns'),
+        language=attributes.pop('language')
+    )
+    for k, v in attributes.items():
+        setattr(page, k, v)
+
+    page._called.update(data['called'])
+    page._summary = data['summary']
+    # offsets are missing in bundles written by older versions
+    offsets = iter(data.get('offsets', []))
+    for s in data['sections']:
+        page._sections.append(_section_from_list(page, s, -1, offsets))
+    if 'section_titles' in data:
+        page._section_titles = list(data['section_titles'])
+    page._outline = [tuple(s) for s in data.get('outline', [])]
+    page._info_props.update(data.get('info_props', []))
+
+    for prop in LINK_PROPERTIES:
+        links = getattr(page, '_' + prop)
+        for k, link_attributes in data[prop].items():
+            link_attributes = dict(link_attributes)
+            link = WikipediaPage(
+                wiki,
+                title=link_attributes.pop('title'),
+                ns=link_attributes.pop('ns'),
+                language=link_attributes.pop('language')
+            )
+            for name, v in link_attributes.items():
+                setattr(link, name, v)
+            links[k] = link
+
+    return page
+
+
+def dumps(page: WikipediaPage) -> bytes:
+    return zlib.compress(
+        json.dumps(page_to_dict(page), separators=(',', ':')).encode('utf-8')
+    )
+
+
+def loads(wiki: Wikipedia, data) -> WikipediaPage:
+    '''
+    Restores page from `data`, which can be any object supporting buffer
+    protocol, e.g. memoryview of memory-mapped file.
+    '''
+    return page_from_dict(
+        wiki,
+        json.loads(zlib.decompress(data).decode('utf-8'))
+    )
+
+
+def page_key(page: WikipediaPage) -> str:
+    return page.language + ':' + page.title
+
+
+class BundleWriter(object):
+    def __init__(self, path: str) -> None:
+        self._file = open(path, 'wb')
+        self._file.write(HEADER.pack(MAGIC, VERSION))
+        self._index = {}  # type: Dict[str, Tuple[int, int]]
+
+    def add(self, page: WikipediaPage) -> None:
+        blob = dumps(page)
+        self._index[page_key(page)] = (self._file.tell(), len(blob))
+        self._file.write(blob)
+
+    def close(self) -> None:
+        if self._file.closed:
+            return
+        index = zlib.compress(
+            json.dumps(self._index, separators=(',', ':')).encode('utf-8')
+        )
+        index_offset = self._file.tell()
+        self._file.write(index)
+        self._file.write(TRAILER.pack(index_offset, len(index), MAGIC))
+        self._file.close()
+
+    def __enter__(self) -> 'BundleWriter':
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.close()
+
+
+class Bundle(object):
+    '''
+    Read-only view of bundle. Pages are decoded on access directly from
+    the memory-mapped file and are not cached.
+    '''
+
+    def __init__(self, wiki: Wikipedia, path: str) -> None:
+        self.wiki = wiki
+        self._file = open(path, 'rb')
+        if os.fstat(self._file.fileno()).st_size < HEADER.size + TRAILER.size:
+            self._file.close()
+            raise ValueError("Not a page bundle: {}".format(path))
+        self._mmap = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        self._view = memoryview(self._mmap)
+
+        magic, version = HEADER.unpack_from(self._mmap, 0)
+        index_offset, index_length, end_magic = TRAILER.unpack_from(
+            self._mmap,
+            len(self._mmap) - TRAILER.size
+        )
+        if magic != MAGIC or end_magic != MAGIC:
+            self.close()
+            raise ValueError("Not a page bundle: {}".format(path))
+        if version != VERSION:
+            self.close()
+            raise ValueError(
+                "Unsupported bundle version {} in {}".format(version, path)
+            )
+
+        self._index = json.loads(zlib.decompress(
+            self._view[index_offset:index_offset + index_length]
+        ).decode('utf-8'))
+
+    def page(self, title: str, language: str = None) -> WikipediaPage:
+        return self[(language or self.wiki.language) + ':' + title]
+
+    def __getitem__(self, key: str) -> WikipediaPage:
+        offset, length = self._index[key]
+        return loads(self.wiki, self._view[offset:offset + length])
+
+    def __contains__(self, key: str) -> bool:
+        return key in self._index
+
+    def __len__(self) -> int:
+        return len(self._index)
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._index)
+
+    def keys(self):
+        return self._index.keys()
+
+    def close(self) -> None:
+        if self._file.closed:
+            return
+        self._view.release()
+        self._mmap.close()
+        self._file.close()
+
+    def __enter__(self) -> 'Bundle':
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.close()
@@ -0,0 +1,171 @@
+'''
+Keeping fetched pages up to date by following recent changes.
+
+https://www.mediawiki.org/wiki/API:RecentChanges
+'''
+from typing import Dict, Any, List, Iterable, Set, Tuple
+
+from .wikipedia import Wikipedia, WikipediaPage
+
+# Data invalidated by each type of change.
+# Edit of the page changes its wikitext and thus everything parsed from it.
+# Change of type `categorize` is reported with the title of the category,
+# whose members were changed.
+INVALIDATED_CALLS = {
+    'edit': ['structured', 'info', 'links', 'categories', 'langlinks'],
+    'new': ['structured', 'info', 'links', 'categories', 'langlinks'],
+    'log': ['structured', 'info', 'links', 'categories', 'langlinks'],
+    'categorize': ['categorymembers'],
+}
+
+Change = Dict[str, Any]
+
+
+def _key(language: str, title: str) -> Tuple[str, str]:
+    return language, title.replace('_', ' ')
+
+
+class RecentChangesFeed(object):
+    '''
+    Returns changes, which happened since the previous call of `poll`.
+
+    Without `start`, the first call only finds the newest change and
+    returns nothing, so the feed starts at that time. Every call requests
+    at most `max_rounds` batches, the rest is returned by the next calls.
+    '''
+
+    def __init__(
+            self,
+            wiki: Wikipedia,
+            language: str = None,
+            start: str = None,
+            batch_size: int = 500,
+            max_rounds: int = 10
+    ) -> None:
+        self.wiki = wiki
+        self.language = language or wiki.language
+        self.timestamp = start
+        self.last_rcid = 0
+        self.batch_size = batch_size
+        self.max_rounds = max_rounds
+        # rccontinue of the list not finished by the previous call
+        self.continuation = None  # type: str
+
+    def poll(self) -> List[Change]:
+        # only language of the page is used for the request
+        page = WikipediaPage(self.wiki, title='', language=self.language)
+        if self.timestamp is None:
+            self._start(page)
+            return []
+
+        params = {
+            'action': 'query',
+            'list': 'recentchanges',
+            'rcprop': 'title|ids|timestamp',
+            'rcdir': 'newer',
+            'rcstart': self.timestamp,
+            'rclimit': self.batch_size,
+        }
+        changes = []  # type: List[Change]
+        for _ in range(self.max_rounds):
+            if self.continuation is not None:
+                params['rccontinue'] = self.continuation
+            raw = self.wiki._query(page, params)
+            changes += raw['query']['recentchanges']
+            self.continuation = raw.get('continue', {}).get('rccontinue')
+            if self.continuation is None:
+                break
+
+        # rcstart is inclusive, so the last seen changes are returned again
+        changes = [c for c in changes if c['rcid'] > self.last_rcid]
+        for change in changes:
+            change.setdefault('language', self.language)
+        if changes:
+            self.timestamp = changes[-1]['timestamp']
+            self.last_rcid = max(c['rcid'] for c in changes)
+        return changes
+
+    def _start(self, page: WikipediaPage) -> None:
+        raw = self.wiki._query(
+            page,
+            {
+                'action': 'query',
+                'list': 'recentchanges',
+                'rcprop': 'ids|timestamp',
+                'rcdir': 'older',
+                'rclimit': 1,
+            }
+        )
+        for change in raw['query']['recentchanges']:
+            self.timestamp = change['timestamp']
+            self.last_rcid = change['rcid']
+
+
+class ChangeTracker(object):
+    '''
+    Invalidates data of tracked pages affected by changes and refetches
+    them in batches. Only data, which were already fetched, are refetched.
+    '''
+
+    def __init__(
+            self,
+            wiki: Wikipedia,
+            feed=None,
+            workers: int = 8
+    ) -> None:
+        self.wiki = wiki
+        self.feed = feed if feed is not None else RecentChangesFeed(wiki)
+        self.workers = workers
+        self._pages = {}  # type: Dict[Tuple[str, str], List[WikipediaPage]]
+        self._pending = {}  # type: Dict[WikipediaPage, Set[str]]
+
+    def track(self, pages: Iterable[WikipediaPage]) -> None:
+        for page in pages:
+            pages_with_title = self._pages.setdefault(
+                _key(page.language, page.title), []
+            )
+            if page not in pages_with_title:
+                pages_with_title.append(page)
+
+    def process(self, changes: Iterable[Change]) -> List[WikipediaPage]:
+        '''
+        Invalidates data of affected pages and returns them.
+        '''
+        affected = []
+        for change in changes:
+            calls = INVALIDATED_CALLS.get(change.get('type', 'edit'), [])
+            key = _key(
+                change.get('language', self.wiki.language),
+                change['title']
+            )
+            for page in self._pages.get(key, []):
+                fetched = [c for c in calls if page._called[c]]
+                for call in fetched:
+                    page._invalidate(call)
+                if fetched:
+                    if page not in self._pending:
+                        affected.append(page)
+                    self._pending.setdefault(page, set()).update(fetched)
+        return affected
+
+    def refresh(self) -> List[WikipediaPage]:
+        '''
+        Refetches invalidated data. Pages, which need the same data, are
+        fetched together, so `info` is requested in batches.
+        '''
+        by_calls = {}  # type: Dict[Tuple[str, ...], List[WikipediaPage]]
+        for page, calls in self._pending.items():
+            by_calls.setdefault(tuple(sorted(calls)), []).append(page)
+        self._pending = {}
+
+        refreshed = []
+        for calls, pages in by_calls.items():
+            refreshed += self.wiki.fetch_all(pages, calls, self.workers)
+        return refreshed
+
+    def sync(self) -> List[WikipediaPage]:
+        '''
+        Polls the feed, invalidates affected pages and refetches them.
+        '''
+        self.process(self.feed.poll())
+        return self.refresh()
@@ -0,0 +1,359 @@
+'''
+Crawling many pages with several processes.
+
+Titles are split into shards by their hash and kept in SQLite work queue
+together with results. Every shard is processed by its own process with
+its own `Wikipedia` client. Finished batches are committed, so crawl
+interrupted by a crash continues where it stopped, when it is run again.
+
+    crawler = Crawler('crawl.sqlite', shards=4, props=['structured'])
+    crawler.add(titles)
+    crawler.run()
+    crawler.merge('pages.bundle')
+'''
+import json
+import multiprocessing
+import os
+import sqlite3
+import zlib
+from typing import Dict, Any, Callable, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+from .wikipedia import Wikipedia, WikipediaPage
+
+PENDING = 0
+RUNNING = 1
+DONE = 2
+FAILED = 3
+
+SCHEMA = '''
+CREATE TABLE IF NOT EXISTS tasks (
+    language TEXT NOT NULL,
+    title TEXT NOT NULL,
+    shard INTEGER NOT NULL,
+    state INTEGER NOT NULL DEFAULT 0,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    result TEXT,
+    error TEXT,
+    PRIMARY KEY (language, title)
+);
+CREATE INDEX IF NOT EXISTS tasks_shard ON tasks (shard, state);
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value INTEGER NOT NULL
+);
+'''
+
+
+def shard_of(title: str, shards: int) -> int:
+    '''
+    Returns shard of the title, which is the same in every process.
+    '''
+    return zlib.crc32(title.encode('utf-8')) % shards
+
+
+def page_to_dict(page: WikipediaPage) -> Dict[str, Any]:
+    # imported lazily, bundle is needed only by the default result
+    from .bundle import page_to_dict
+    return page_to_dict(page)
+
+
+class WorkQueue(object):
+    '''
+    SQLite table of titles with their state and results. It can be
+    opened by several processes at once.
+
+    Number of shards is stored with the titles. Without `shards`, the
+    stored number is used, otherwise titles are assigned to `shards`
+    again, when it differs.
+    '''
+
+    def __init__(self, path: str, shards: int = None) -> None:
+        self.path = path
+        self._db = sqlite3.connect(path, timeout=60, isolation_level=None)
+        self._db.execute('PRAGMA journal_mode=WAL')
+        self._db.executescript(SCHEMA)
+        stored = self._stored_shards()
+        self.shards = shards or stored or os.cpu_count() or 1
+        if self.shards != stored:
+            self.reshard(self.shards)
+
+    def _stored_shards(self) -> Optional[int]:
+        row = self._db.execute(
+            "SELECT value FROM meta WHERE key = 'shards'"
+        ).fetchone()
+        return row[0] if row else None
+
+    def reshard(self, shards: int) -> None:
+        '''
+        Assigns all titles to `shards` shards. No worker may be running.
+        '''
+        self._db.execute('BEGIN IMMEDIATE')
+        self._db.executemany(
+            'UPDATE tasks SET shard = ? WHERE language = ? AND title = ?',
+            [
+                (shard_of(title, shards), language, title)
+                for language, title in self._db.execute(
+                    'SELECT language, title FROM tasks'
+                ).fetchall()
+            ]
+        )
+        self._db.execute(
+            "INSERT OR REPLACE INTO meta (key, value) VALUES ('shards', ?)",
+            (shards,)
+        )
+        self._db.execute('COMMIT')
+        self.shards = shards
+
+    def add(self, titles: Iterable[str], language: str) -> None:
+        '''
+        Adds titles, which are not in the queue yet.
+        '''
+        self._db.execute('BEGIN IMMEDIATE')
+        self._db.executemany(
+            'INSERT OR IGNORE INTO tasks (language, title, shard) '
+            'VALUES (?, ?, ?)',
+            (
+                (language, title, shard_of(title, self.shards))
+                for title in titles
+            )
+        )
+        self._db.execute('COMMIT')
+
+    def claim(self, shard: int, limit: int) -> List[Tuple[str, str]]:
+        '''
+        Marks up to `limit` pending titles of the shard as running and
+        returns them.
+        '''
+        self._db.execute('BEGIN IMMEDIATE')
+        rows = self._db.execute(
+            'SELECT language, title FROM tasks '
+            'WHERE shard = ? AND state = ? LIMIT ?',
+            (shard, PENDING, limit)
+        ).fetchall()
+        self._db.executemany(
+            'UPDATE tasks SET state = ?, attempts = attempts + 1 '
+            'WHERE language = ? AND title = ?',
+            ((RUNNING, language, title) for language, title in rows)
+        )
+        self._db.execute('COMMIT')
+        return rows
+
+    def complete(
+            self,
+            done: Sequence[Tuple[str, str, Any]],
+            failed: Sequence[Tuple[str, str, str]] = ()
+    ) -> None:
+        '''
+        Stores results and errors of one batch in single transaction.
+        '''
+        self._db.execute('BEGIN IMMEDIATE')
+        self._db.executemany(
+            'UPDATE tasks SET state = ?, result = ?, error = NULL '
+            'WHERE language = ? AND title = ?',
+            (
+                (DONE, json.dumps(result), language, title)
+                for language, title, result in done
+            )
+        )
+        self._db.executemany(
+            'UPDATE tasks SET state = ?, error = ? '
+            'WHERE language = ? AND title = ?',
+            (
+                (FAILED, error, language, title)
+                for language, title, error in failed
+            )
+        )
+        self._db.execute('COMMIT')
+
+    def requeue(self, states: Sequence[int] = (RUNNING,)) -> int:
+        '''
+        Returns titles in `states` back to pending, e.g. titles, which
+        were running, when the crawl crashed.
+        '''
+        cursor = self._db.execute(
+            'UPDATE tasks SET state = ? WHERE state IN ({})'.format(
+                ','.join('?' * len(states))
+            ),
+            (PENDING,) + tuple(states)
+        )
+        return cursor.rowcount
+
+    def progress(self) -> Dict[int, int]:
+        '''
+        Returns number of titles in every state.
+        '''
+        return dict(self._db.execute(
+            'SELECT state, COUNT(*) FROM tasks GROUP BY state'
+        ).fetchall())
+
+    def results(self) -> Iterator[Tuple[str, str, Any]]:
+        for language, title, result in self._db.execute(
+            'SELECT language, title, result FROM tasks '
+            'WHERE state = ? ORDER BY language, title',
+            (DONE,)
+        ):
+            yield language, title, json.loads(result)
+
+    def errors(self) -> Iterator[Tuple[str, str, str]]:
+        return iter(self._db.execute(
+            'SELECT language, title, error FROM tasks WHERE state = ?',
+            (FAILED,)
+        ).fetchall())
+
+    def close(self) -> None:
+        self._db.close()
+
+
+def _fetch(wiki: Wikipedia, page: WikipediaPage, props: Sequence[str]) -> None:
+    for prop in props:
+        if prop == 'info':
+            wiki.fetch_info([page])
+        else:
+            page._fetch(prop)
+
+
+def _work(
+        path: str,
+        shard: int,
+        shards: int,
+        props: Sequence[str],
+        fn: Callable[[WikipediaPage], Any],
+        batch_size: int,
+        wiki_kwargs: Dict[str, Any]
+) -> int:
+    '''
+    Processes all pending titles of the shard, runs in worker process.
+    '''
+    queue = WorkQueue(path, shards)
+    clients = {}  # type: Dict[str, Wikipedia]
+    processed = 0
+    try:
+        while True:
+            batch = queue.claim(shard, batch_size)
+            if not batch:
+                return processed
+
+            pages = []
+            for language, title in batch:
+                if language not in clients:
+                    clients[language] = Wikipedia(language, **wiki_kwargs)
+                pages.append(clients[language].page(title))
+            if 'info' in props:
+                # info of the whole batch is requested at once, failures
+                # are retried page by page
+                for wiki in clients.values():
+                    try:
+                        wiki.fetch_info(
+                            [p for p in pages if p.wiki is wiki]
+                        )
+                    except Exception:
+                        pass
+
+            done = []
+            failed = []
+            for (language, title), page in zip(batch, pages):
+                try:
+                    _fetch(page.wiki, page, props)
+                    done.append((language, title, fn(page)))
+                except Exception as e:
+                    failed.append((language, title, repr(e)))
+            queue.complete(done, failed)
+            processed += len(batch)
+    finally:
+        queue.close()
+
+
+class Crawler(object):
+    '''
+    Fetches `props` of queued titles in `shards` worker processes, by
+    default the number stored in `path` or number of CPUs, and
+    stores `fn(page)` for every page. Results have to be JSON
+    serializable and `fn` has to be picklable, i.e. a module level
+    function. By default, all fetched data of the page are stored.
+
+    `wiki_kwargs` are passed to `Wikipedia` of every worker.
+    '''
+
+    def __init__(
+            self,
+            path: str,
+            language: str = 'en',
+            shards: int = None,
+            props: Sequence[str] = ('info',),
+            fn: Callable[[WikipediaPage], Any] = page_to_dict,
+            batch_size: int = 50,
+            wiki_kwargs: Dict[str, Any] = None
+    ) -> None:
+        self.path = path
+        self.language = language
+        self.props = list(props)
+        self.fn = fn
+        self.batch_size = batch_size
+        self.wiki_kwargs = dict(wiki_kwargs or {})
+        self.queue = WorkQueue(path, shards)
+        self.shards = self.queue.shards
+
+    def add(self, titles: Iterable[str], language: str = None) -> None:
+        self.queue.add(titles, language or self.language)
+
+    def run(self, retry_failed: bool = False) -> Dict[int, int]:
+        '''
+        Processes all pending titles and returns progress. Titles left
+        running by previous crashed run are processed again, failed
+        ones only with `retry_failed`. When a worker process crashes,
+        `RuntimeError` is raised after all of them finish.
+        '''
+        states = [RUNNING, FAILED] if retry_failed else [RUNNING]
+        self.queue.requeue(states)
+
+        processes = [
+            multiprocessing.Process(
+                target=_work,
+                args=(
+                    self.path, shard, self.shards, self.props, self.fn,
+                    self.batch_size, self.wiki_kwargs
+                )
+            )
+            for shard in range(self.shards)
+        ]
+        for process in processes:
+            process.start()
+        for process in processes:
+            process.join()
+        crashed = [
+            (shard, process.exitcode)
+            for shard, process in enumerate(processes)
+            if process.exitcode != 0
+        ]
+        if crashed:
+            raise RuntimeError(
+                'Workers of shards crashed with exit codes: {}'.format(
+                    ', '.join('{}: {}'.format(*c) for c in crashed)
+                )
+            )
+        return self.queue.progress()
+
+    def results(self) -> Iterator[Tuple[str, str, Any]]:
+        '''
+        Yields language, title and result of all finished titles.
+        '''
+        return self.queue.results()
+
+    def merge(self, bundle_path: str) -> int:
+        '''
+        Writes pages stored by default `fn` into single bundle.
+        '''
+        from .bundle import BundleWriter, page_from_dict
+
+        wikis = {}  # type: Dict[str, Wikipedia]
+        count = 0
+        with BundleWriter(bundle_path) as writer:
+            for language, _, data in self.results():
+                if language not in wikis:
+                    wikis[language] = Wikipedia(language)
+                writer.add(page_from_dict(wikis[language], data))
+                count += 1
+        return count
+
+    def close(self) -> None:
+        self.queue.close()
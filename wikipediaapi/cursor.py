@@ -0,0 +1,161 @@
+'''
+State of continuation of long lists.
+
+Cursor keeps parameters of the request, the last continuation token
+(`plcontinue`, `blcontinue` or `cmcontinue`) and all items received so
+far. It can be saved after every round, so fetching of long list
+continues from the last round after restart. Items of every round are
+appended to `<path>.items` and only the small state in `path` is
+replaced, so saving does not grow with the number of rounds.
+
+https://www.mediawiki.org/wiki/API:Continue
+'''
+import json
+import os
+from typing import Dict, Any, List
+
+# Suffix of the file with items next to the saved state
+ITEMS_SUFFIX = '.items'
+
+# Prefixes of parameters of modules returning continued lists
+PREFIXES = {
+    'links': 'pl',
+    'backlinks': 'bl',
+    'categorymembers': 'cm',
+}
+
+
+class Cursor(object):
+    def __init__(
+            self,
+            call: str,
+            language: str,
+            title: str,
+            params: Dict[str, Any],
+            path: str = None
+    ) -> None:
+        self.call = call
+        self.language = language
+        self.title = title
+        self.params = params
+        self.token = None  # type: str
+        self.items = []  # type: List[Dict[str, Any]]
+        # attributes of the page, e.g. pageid, returned with `links`
+        self.attributes = {}  # type: Dict[str, Any]
+        self.missing = False
+        self.done = False
+        self.rounds = 0
+        self.path = path
+        # valid length of the items file, None when it was not written
+        self._items_size = None  # type: int
+
+    @property
+    def token_name(self) -> str:
+        return PREFIXES[self.call] + 'continue'
+
+    def update(
+            self,
+            items: List[Dict[str, Any]],
+            raw: Dict[str, Any]
+    ) -> None:
+        '''
+        Adds items of one round and the token for the next one.
+        '''
+        self.items += items
+        self.rounds += 1
+        self.token = raw.get('continue', {}).get(self.token_name)
+        self.done = self.token is None
+        if self.path is None:
+            return
+        if self._items_size is None:
+            self.save(self.path)
+        else:
+            self._append_items(self.path, items)
+            self._save_state(self.path)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            'call': self.call,
+            'language': self.language,
+            'title': self.title,
+            'params': self.params,
+            'token': self.token,
+            'items': self.items,
+            'attributes': self.attributes,
+            'missing': self.missing,
+            'done': self.done,
+            'rounds': self.rounds,
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any], path: str = None) -> 'Cursor':
+        cursor = cls(
+            data['call'],
+            data['language'],
+            data['title'],
+            data['params'],
+            path
+        )
+        for name in ['token', 'items', 'attributes', 'missing', 'done', 'rounds']:
+            setattr(cursor, name, data[name])
+        return cursor
+
+    def dumps(self) -> str:
+        return json.dumps(self.to_dict(), ensure_ascii=False)
+
+    @classmethod
+    def loads(cls, data: str, path: str = None) -> 'Cursor':
+        return cls.from_dict(json.loads(data), path)
+
+    def save(self, path: str) -> None:
+        '''
+        Writes all items and the state. State is replaced at once, so it
+        is never left half written.
+        '''
+        with open(path + ITEMS_SUFFIX, 'wb') as f:
+            f.write(_items_line(self.items))
+            self._items_size = f.tell()
+        self._save_state(path)
+
+    def _append_items(self, path: str, items: List[Dict[str, Any]]) -> None:
+        with open(path + ITEMS_SUFFIX, 'r+b') as f:
+            # drops items of a round, whose state was not saved
+            f.truncate(self._items_size)
+            f.seek(self._items_size)
+            f.write(_items_line(items))
+            self._items_size = f.tell()
+
+    def _save_state(self, path: str) -> None:
+        state = self.to_dict()
+        del state['items']
+        state['items_size'] = self._items_size
+        tmp = path + '.tmp'
+        with open(tmp, 'w', encoding='utf-8') as f:
+            json.dump(state, f, ensure_ascii=False)
+        os.replace(tmp, path)
+
+    @classmethod
+    def load(cls, path: str) -> 'Cursor':
+        '''
+        Loads cursor, which keeps saving itself into `path`.
+        '''
+        with open(path, encoding='utf-8') as f:
+            state = json.load(f)
+        with open(path + ITEMS_SUFFIX, 'rb') as f:
+            lines = f.read(state['items_size']).splitlines()
+        state['items'] = [
+            item for line in lines for item in json.loads(line.decode('utf-8'))
+        ]
+        cursor = cls.from_dict(state, path)
+        cursor._items_size = state['items_size']
+        return cursor
+
+    def __repr__(self) -> str:
+        return 'Cursor({}, {}:{}, items: {}, rounds: {}, done: {})'.format(
+            self.call, self.language, self.title,
+            len(self.items), self.rounds, self.done
+        )
+
+
+def _items_line(items: List[Dict[str, Any]]) -> bytes:
+    return (json.dumps(items, ensure_ascii=False) + '\n').encode('utf-8')
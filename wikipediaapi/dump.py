@@ -0,0 +1,680 @@
+'''
+Offline backend reading pages from Wikipedia database dumps.
+
+https://meta.wikimedia.org/wiki/Data_dumps
+https://en.wikipedia.org/wiki/Wikipedia:Database_download
+
+Random access needs the multistream variant of pages-articles dump
+(``*-pages-articles-multistream.xml.bz2``) and an index built by
+``build_index``. Link tables are read from ``*-pagelinks.sql.gz`` and
+``*-categorylinks.sql.gz``.
+
+Text of the page is the raw wikitext. Headings are recognized the same
+way as in ``ExtractFormat.WIKI``, but the markup itself is kept as it is.
+Link tables store titles without namespace prefix, so links outside of
+the main namespace keep the bare title from the dump.
+'''
+import bz2
+import collections
+import functools
+import gzip
+import os
+import re
+import sqlite3
+import threading
+import xml.etree.ElementTree as ElementTree
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, Any, Iterable, List, Iterator, Tuple, Optional
+from urllib.parse import quote
+
+from .wikipedia import (
+    Wikipedia, WikipediaPage, ExtractFormat, PagesDict, Resolution, info_props
+)
+
+READ_SIZE = 1 << 20
+# Streams parsed or waiting for the consumer per worker process
+STREAMS_PER_WORKER = 2
+
+# Urls of pages, titles are encoded in the same way as by MediaWiki
+ARTICLE_URL = 'https://{language}.wikipedia.org/wiki/{title}'
+EDIT_URL = 'https://{language}.wikipedia.org/w/index.php?title={title}&action=edit'
+URL_SAFE = ';@$!*(),/~:'
+
+PAGE_PATTERN = re.compile(r'<page>.*?</page>', re.DOTALL)
+HEADING_PATTERN = re.compile(r'\n*^(=+) *(.*?) *\1 *$\n?', re.MULTILINE)
+SQL_ROW_PATTERN = re.compile(r"\(((?:'(?:[^'\\]|\\.)*'|[^'()])*)\)")
+SQL_VALUE_PATTERN = re.compile(r"'((?:[^'\\]|\\.)*)'|(NULL)|([^,]+)")
+SQL_ESCAPE_PATTERN = re.compile(r'\\(.)')
+SENTENCE_END_PATTERN = re.compile(r'(?<=[.!?])\s+')
+
+SCHEMA = '''
+CREATE TABLE IF NOT EXISTS pages (
+    pageid INTEGER PRIMARY KEY,
+    ns INTEGER,
+    title TEXT,
+    redirect TEXT,
+    offset INTEGER
+);
+CREATE INDEX IF NOT EXISTS pages_title ON pages (title);
+CREATE TABLE IF NOT EXISTS pagelinks (
+    from_id INTEGER,
+    ns INTEGER,
+    title TEXT
+);
+CREATE INDEX IF NOT EXISTS pagelinks_from ON pagelinks (from_id);
+CREATE INDEX IF NOT EXISTS pagelinks_title ON pagelinks (title);
+CREATE TABLE IF NOT EXISTS categorylinks (
+    from_id INTEGER,
+    category TEXT
+);
+CREATE INDEX IF NOT EXISTS categorylinks_from ON categorylinks (from_id);
+CREATE INDEX IF NOT EXISTS categorylinks_category ON categorylinks (category);
+'''
+
+
+def _local_name(tag: str) -> str:
+    return tag.rsplit('}', 1)[-1]
+
+
+def _page_record(element) -> Dict[str, Any]:
+    record = {
+        'title': None,
+        'ns': 0,
+        'pageid': None,
+        'redirect': None,
+        'text': '',
+    }
+    for child in element:
+        name = _local_name(child.tag)
+        if name == 'title':
+            record['title'] = child.text
+        elif name == 'ns':
+            record['ns'] = int(child.text)
+        elif name == 'id':
+            record['pageid'] = int(child.text)
+        elif name == 'redirect':
+            record['redirect'] = child.get('title')
+        elif name == 'revision':
+            for rev_child in child:
+                if _local_name(rev_child.tag) == 'text':
+                    record['text'] = rev_child.text or ''
+    return record
+
+
+def _parse_chunk(chunk: str) -> List[Dict[str, Any]]:
+    return [
+        _page_record(ElementTree.fromstring(match.group(0)))
+        for match in PAGE_PATTERN.finditer(chunk)
+    ]
+
+
+def read_stream(path: str, offset: int) -> str:
+    '''
+    Decompresses single bz2 stream of multistream dump starting at `offset`.
+    '''
+    decompressor = bz2.BZ2Decompressor()
+    parts = []
+    with open(path, 'rb') as f:
+        f.seek(offset)
+        while not decompressor.eof:
+            block = f.read(READ_SIZE)
+            if not block:
+                break
+            parts.append(decompressor.decompress(block))
+    return b''.join(parts).decode('utf-8')
+
+
+def iter_streams(path: str) -> Iterator[Tuple[int, str]]:
+    '''
+    Yields offset and decompressed content of every stream in the file.
+    '''
+    with open(path, 'rb') as f:
+        offset = 0
+        decompressor = bz2.BZ2Decompressor()
+        parts = []
+        block = f.read(READ_SIZE)
+        while block:
+            parts.append(decompressor.decompress(block))
+            if decompressor.eof:
+                unused = decompressor.unused_data
+                yield offset, b''.join(parts).decode('utf-8')
+                offset = f.tell() - len(unused)
+                decompressor = bz2.BZ2Decompressor()
+                parts = []
+                block = unused or f.read(READ_SIZE)
+            else:
+                block = f.read(READ_SIZE)
+
+
+def stream_offsets(multistream_index: str) -> List[int]:
+    '''
+    Reads distinct stream offsets from ``*-multistream-index.txt.bz2``,
+    where every line has format ``offset:pageid:title``.
+    '''
+    offsets = set()
+    with bz2.open(multistream_index, 'rt', encoding='utf-8') as f:
+        for line in f:
+            offset, _ = line.split(':', 1)
+            offsets.add(int(offset))
+    return sorted(offsets)
+
+
+def _scan_stream(
+        path: str,
+        offset: int,
+        text: bool
+) -> Tuple[int, List[Dict[str, Any]]]:
+    records = _parse_chunk(read_stream(path, offset))
+    if not text:
+        # only metadata are sent back to the parent process
+        for record in records:
+            del record['text']
+    return offset, records
+
+
+def _parse_streams(
+        path: str,
+        text: bool
+) -> Iterator[Tuple[int, List[Dict[str, Any]]]]:
+    '''
+    Parses the dump sequentially block by block and yields offset of the
+    stream together with pages finished in the block. Streams of the
+    multistream dump together form a single document, so they are fed to
+    the same parser.
+    '''
+    parser = ElementTree.XMLPullParser(events=('start', 'end'))
+    root = None
+    with open(path, 'rb') as f:
+        offset = 0
+        decompressor = bz2.BZ2Decompressor()
+        block = f.read(READ_SIZE)
+        while block:
+            parser.feed(decompressor.decompress(block))
+            records = []
+            for event, element in parser.read_events():
+                if root is None:
+                    root = element
+                if event != 'end' or _local_name(element.tag) != 'page':
+                    continue
+                record = _page_record(element)
+                if not text:
+                    del record['text']
+                records.append(record)
+                # finished pages are not kept in the tree
+                root.clear()
+            if records:
+                yield offset, records
+            if decompressor.eof:
+                unused = decompressor.unused_data
+                offset = f.tell() - len(unused)
+                decompressor = bz2.BZ2Decompressor()
+                block = unused or f.read(READ_SIZE)
+            else:
+                block = f.read(READ_SIZE)
+    parser.close()
+
+
+def iter_pages(
+        path: str,
+        multistream_index: str = None,
+        workers: int = None
+) -> Iterator[Dict[str, Any]]:
+    '''
+    Yields pages from the dump as dictionaries with keys `pageid`, `ns`,
+    `title`, `redirect` and `text`.
+
+    When `multistream_index` is given, streams are decompressed in parallel
+    by `workers` processes. Otherwise the file is parsed sequentially
+    while it is read.
+    '''
+    if multistream_index is not None:
+        for _, records in _scan_streams(path, multistream_index, workers):
+            for record in records:
+                yield record
+        return
+
+    for _, records in _parse_streams(path, text=True):
+        for record in records:
+            yield record
+
+
+def _scan_streams(
+        path: str,
+        multistream_index: str = None,
+        workers: int = None,
+        text: bool = True
+) -> Iterator[Tuple[int, List[Dict[str, Any]]]]:
+    if multistream_index is None:
+        for item in _parse_streams(path, text):
+            yield item
+        return
+
+    # streams are submitted gradually, so a slow consumer does not keep
+    # results of all of them in memory
+    window = (workers or os.cpu_count() or 1) * STREAMS_PER_WORKER
+    pending = collections.deque()  # type: collections.deque
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        for offset in stream_offsets(multistream_index):
+            pending.append(executor.submit(_scan_stream, path, offset, text))
+            if len(pending) >= window:
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
+
+
+def _sql_value(match):
+    text, null, other = match.groups()
+    if text is not None:
+        return SQL_ESCAPE_PATTERN.sub(r'\1', text)
+    if null is not None:
+        return None
+    other = other.strip()
+    try:
+        return int(other)
+    except ValueError:
+        return float(other)
+
+
+def iter_sql_rows(path: str) -> Iterator[Tuple[Any, ...]]:
+    '''
+    Yields rows of ``INSERT INTO ... VALUES`` statements from gzipped
+    MySQL dump.
+    '''
+    with gzip.open(path, 'rt', encoding='utf-8', errors='replace') as f:
+        for line in f:
+            if not line.startswith('INSERT INTO'):
+                continue
+            values = line[line.index(' VALUES ') + 8:]
+            for row in SQL_ROW_PATTERN.finditer(values):
+                yield tuple(
+                    _sql_value(v)
+                    for v in SQL_VALUE_PATTERN.finditer(row.group(1))
+                )
+
+
+def _dump_title(title: str) -> str:
+    return title.replace('_', ' ')
+
+
+def build_index(
+        index_path: str,
+        dump_path: str,
+        multistream_index: str = None,
+        pagelinks: str = None,
+        categorylinks: str = None,
+        workers: int = None
+) -> None:
+    '''
+    Builds SQLite index with title, namespace, redirect and stream offset
+    of every page, and optionally with page and category links.
+    '''
+    db = sqlite3.connect(index_path)
+    db.executescript(SCHEMA)
+
+    for offset, records in _scan_streams(
+        dump_path, multistream_index, workers, text=False
+    ):
+        db.executemany(
+            'INSERT OR REPLACE INTO pages VALUES (?, ?, ?, ?, ?)',
+            [
+                (r['pageid'], r['ns'], r['title'], r['redirect'], offset)
+                for r in records
+            ]
+        )
+
+    if pagelinks is not None:
+        # pl_from, pl_namespace, pl_title, pl_from_namespace
+        db.executemany(
+            'INSERT INTO pagelinks VALUES (?, ?, ?)',
+            (
+                (row[0], row[1], _dump_title(row[2]))
+                for row in iter_sql_rows(pagelinks)
+            )
+        )
+
+    if categorylinks is not None:
+        # cl_from, cl_to, cl_sortkey, ...
+        db.executemany(
+            'INSERT INTO categorylinks VALUES (?, ?)',
+            (
+                (row[0], _dump_title(row[1]))
+                for row in iter_sql_rows(categorylinks)
+            )
+        )
+
+    db.commit()
+    db.close()
+
+
+def wikitext_extract(text: str) -> str:
+    '''
+    Rewrites headings of wikitext to the shape used by plain text extracts.
+    '''
+    return HEADING_PATTERN.sub(
+        lambda m: '\n\n{} {} {}\n'.format(m.group(1), m.group(2), m.group(1)),
+        text
+    )
+
+
+class DumpWikipedia(Wikipedia):
+    '''
+    Wikipedia reading pages from local dump instead of the API.
+    Language links are not part of the supported dumps.
+    '''
+
+    def __init__(
+            self,
+            dump_path: str,
+            index_path: str,
+            language: str = 'en',
+            category_prefix: str = 'Category',
+            cache_streams: int = 16
+    ) -> None:
+        super(DumpWikipedia, self).__init__(
+            language=language,
+            extract_format=ExtractFormat.WIKI
+        )
+        self.dump_path = dump_path
+        self.category_prefix = category_prefix + ':'
+        self._db = sqlite3.connect(index_path, check_same_thread=False)
+        self._db_lock = threading.Lock()
+        self._read_stream = functools.lru_cache(maxsize=cache_streams)(
+            self._stream_texts
+        )
+
+    def close(self) -> None:
+        super(DumpWikipedia, self).close()
+        with self._db_lock:
+            self._db.close()
+
+    def _query(self, page, params):
+        raise RuntimeError(
+            'DumpWikipedia does not send requests: {}'.format(params)
+        )
+
+    def _select(self, sql: str, args: Tuple[Any, ...]) -> List[Tuple[Any, ...]]:
+        with self._db_lock:
+            return self._db.execute(sql, args).fetchall()
+
+    def _stream_texts(self, offset: int) -> Dict[int, str]:
+        return {
+            r['pageid']: r['text']
+            for r in _parse_chunk(read_stream(self.dump_path, offset))
+        }
+
+    def _lookup(self, page: WikipediaPage) -> Optional[Tuple[Any, ...]]:
+        '''
+        Finds page in the index and follows redirects. Attributes of the
+        page are updated in the same way as from API response.
+        '''
+        title = _dump_title(page.title)
+        seen = set()
+        redirects = []
+        while title not in seen:
+            seen.add(title)
+            rows = self._select(
+                'SELECT pageid, ns, title, redirect, offset '
+                'FROM pages WHERE title = ?',
+                (title,)
+            )
+            if not rows:
+                page.pageid = -1
+                return None
+            row = rows[0]
+            if row[3] is None:
+                break
+            redirects.append({'from': row[2], 'to': row[3]})
+            title = row[3]
+
+        if redirects:
+            page.redirects = redirects
+        self._common_attributes(
+            {'pageid': row[0], 'ns': row[1], 'title': row[2]},
+            page
+        )
+        return row
+
+    def resolve(
+            self,
+            titles: Iterable[str],
+            workers: int = 4,
+            results: Dict[str, Resolution] = None
+    ) -> Dict[str, Resolution]:
+        # titles are answered from the index, workers are not needed
+        if results is None:
+            results = {}
+        for title in titles:
+            if title in results:
+                continue
+            normalized = _dump_title(title)
+            row = self._lookup(
+                WikipediaPage(self, title=title, language=self.language)
+            )
+            if row is None:
+                results[title] = Resolution(title, False, -1, normalized, None)
+                continue
+            results[title] = Resolution(
+                title=title,
+                exists=True,
+                pageid=row[0],
+                normalized=normalized,
+                redirect=row[2] if row[2] != normalized else None
+            )
+        return results
+
+    def exists_many(
+            self,
+            titles: Iterable[str],
+            workers: int = 4
+    ) -> Dict[str, bool]:
+        return {
+            title: resolution.exists
+            for title, resolution in self.resolve(titles).items()
+        }
+
+    def _page_extract(self, page: WikipediaPage) -> Optional[Dict[str, Any]]:
+        row = self._lookup(page)
+        if row is None:
+            return None
+        text = self._read_stream(row[4]).get(row[0], '')
+        return {
+            'pageid': row[0],
+            'ns': row[1],
+            'title': row[2],
+            'extract': wikitext_extract(text),
+        }
+
+    def _structured(self, page: WikipediaPage) -> WikipediaPage:
+        v = self._page_extract(page)
+        if v is None:
+            return page
+        return self._build_structured(v, page)
+
+    def _outline(self, page: WikipediaPage) -> WikipediaPage:
+        v = self._page_extract(page)
+        if v is None:
+            return page
+        page._section_titles = []
+        page._outline = []
+        for index, (_, _, title, level) in enumerate(
+            self.headings(v['extract']), 1
+        ):
+            page._section_titles.append(title)
+            page._outline.append((index, level - 1, title))
+        return page
+
+    def _section(self, page: WikipediaPage, index: int) -> Optional[str]:
+        v = self._page_extract(page)
+        if v is None:
+            return None
+        sections = self._iter_extract(v['extract'])
+        for i, (section, text, _, _) in enumerate(sections):
+            if i == index:
+                return text
+        return None
+
+    def _extract(
+            self,
+            page: WikipediaPage,
+            limits: Dict[str, Any]
+    ) -> Optional[Dict[str, Any]]:
+        # limits are applied in the same way as by TextExtracts
+        v = self._page_extract(page)
+        if v is None:
+            return None
+        extract = v['extract']
+        if limits.get('exintro'):
+            for start, _, _, _ in self.headings(extract):
+                extract = extract[:start]
+                break
+        if limits.get('exsentences'):
+            sentences = SENTENCE_END_PATTERN.split(extract.strip())
+            extract = ' '.join(sentences[:limits['exsentences']])
+        if limits.get('exchars') and len(extract) > limits['exchars']:
+            extract = extract[:limits['exchars']] + '...'
+        v['extract'] = extract
+        return v
+
+    def _info(
+            self,
+            page: WikipediaPage,
+            props: List[str] = None
+    ) -> WikipediaPage:
+        # only urls and display title can be derived from the dump
+        if props is None:
+            props = self.info_props
+        page._info_props.update(props)
+        row = self._lookup(page)
+        if row is None:
+            return page
+        title = quote(row[2].replace(' ', '_'), safe=URL_SAFE)
+        if 'url' in props:
+            url = ARTICLE_URL.format(language=page.language, title=title)
+            page.fullurl = url
+            page.canonicalurl = url
+            page.editurl = EDIT_URL.format(language=page.language, title=title)
+        if 'displaytitle' in props:
+            page.displaytitle = row[2]
+        return page
+
+    def fetch_info(
+            self,
+            pages: List[WikipediaPage],
+            attributes: Iterable[str] = None
+    ) -> List[WikipediaPage]:
+        props = self.info_props
+        if attributes is not None:
+            props = info_props(attributes)
+        for page in pages:
+            with page._lock:
+                if not page._called['info']:
+                    self._info(page, props)
+                    page._called['info'] = True
+        return pages
+
+    def _fetch_batched(
+            self,
+            pages: List[WikipediaPage],
+            call: str
+    ) -> List[WikipediaPage]:
+        for page in pages:
+            page._fetch(call)
+        return pages
+
+    def _langlinks(self, page: WikipediaPage) -> WikipediaPage:
+        return page
+
+    def _links(self, page: WikipediaPage) -> WikipediaPage:
+        row = self._lookup(page)
+        if row is None:
+            return page
+        return self._build_links(
+            {
+                'links': [
+                    {'ns': ns, 'title': title}
+                    for ns, title in self._select(
+                        'SELECT ns, title FROM pagelinks WHERE from_id = ?',
+                        (row[0],)
+                    )
+                ]
+            },
+            page
+        )
+
+    def _backlinks(self, page: WikipediaPage) -> WikipediaPage:
+        row = self._lookup(page)
+        if row is None:
+            return page
+        title = row[2]
+        if row[1] != 0:
+            title = title.split(':', 1)[-1]
+        return self._build_backlinks(
+            {
+                'backlinks': [
+                    {'ns': ns, 'title': title}
+                    for ns, title in self._select(
+                        'SELECT p.ns, p.title FROM pagelinks l '
+                        'JOIN pages p ON p.pageid = l.from_id '
+                        'WHERE l.title = ? AND l.ns = ?',
+                        (title, row[1])
+                    )
+                ]
+            },
+            page
+        )
+
+    def _categories(self, page: WikipediaPage) -> WikipediaPage:
+        row = self._lookup(page)
+        if row is None:
+            return page
+        return self._build_categories(
+            {
+                'categories': [
+                    {'ns': 14, 'title': self.category_prefix + category}
+                    for category, in self._select(
+                        'SELECT category FROM categorylinks WHERE from_id = ?',
+                        (row[0],)
+                    )
+                ]
+            },
+            page
+        )
+
+    def _categorymembers(self, page: WikipediaPage) -> WikipediaPage:
+        row = self._lookup(page)
+        if row is None:
+            return page
+        category = row[2]
+        if category.startswith(self.category_prefix):
+            category = category[len(self.category_prefix):]
+        return self._build_categorymembers(
+            {
+                'categorymembers': [
+                    {'pageid': pageid, 'ns': ns, 'title': title}
+                    for pageid, ns, title in self._select(
+                        'SELECT p.pageid, p.ns, p.title FROM categorylinks c '
+                        'JOIN pages p ON p.pageid = c.from_id '
+                        'WHERE c.category = ?',
+                        (category,)
+                    )
+                ]
+            },
+            page
+        )
+
+    def _filtered(
+            self,
+            page: WikipediaPage,
+            call: str,
+            filters: Dict[str, str]
+    ) -> PagesDict:
+        # dump does not know redirects or sort keys of category members
+        page._use(call)
+        pages = self._filter_locally(getattr(page, '_' + call), filters)
+        if pages is None:
+            raise ValueError(
+                'Only namespace filter is supported by dump: {}'.format(
+                    ', '.join(filters)
+                )
+            )
+        return pages
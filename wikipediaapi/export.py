@@ -0,0 +1,262 @@
+'''
+Exporting pages into tables.
+
+Pages are turned into rows of tables `pages`, `sections`, `links`,
+`categories` and `langlinks`. Rows are buffered and written in groups
+of `row_group_size`, so memory stays bounded regardless of number of
+pages. JSONL needs nothing else, Arrow and Parquet require
+``pip install pyarrow``.
+'''
+import json
+import os
+from typing import Dict, Any, Iterable, Iterator, List, Sequence, Tuple
+
+from .wikipedia import WikipediaPage
+
+Row = Tuple[Any, ...]
+
+# Column names and types of every table
+SCHEMAS = {
+    'pages': [
+        ('language', 'string'),
+        ('title', 'string'),
+        ('pageid', 'int64'),
+        ('ns', 'int64'),
+        ('summary', 'string'),
+    ],
+    'sections': [
+        ('language', 'string'),
+        ('title', 'string'),
+        ('section_id', 'int64'),
+        ('parent_id', 'int64'),
+        ('level', 'int64'),
+        ('path', 'list<string>'),
+        ('text', 'string'),
+    ],
+    'links': [
+        ('language', 'string'),
+        ('title', 'string'),
+        ('target', 'string'),
+        ('target_ns', 'int64'),
+    ],
+    'categories': [
+        ('language', 'string'),
+        ('title', 'string'),
+        ('category', 'string'),
+    ],
+    'langlinks': [
+        ('language', 'string'),
+        ('title', 'string'),
+        ('target_language', 'string'),
+        ('target_title', 'string'),
+        ('url', 'string'),
+    ],
+}
+
+TABLES = list(SCHEMAS.keys())
+
+
+def page_rows(page: WikipediaPage) -> Iterator[Row]:
+    # title may be normalized by the request
+    summary = page.summary
+    yield page.language, page.title, page.pageid, page.ns, summary
+
+
+def section_rows(page: WikipediaPage) -> Iterator[Row]:
+    index = page.section_index
+    for i in range(len(index)):
+        yield (
+            page.language,
+            page.title,
+            i,
+            index.parents[i],
+            index.levels[i],
+            list(index.paths[i]),
+            index[i].text,
+        )
+
+
+def link_rows(page: WikipediaPage) -> Iterator[Row]:
+    for link in page.links.values():
+        yield page.language, page.title, link.title, link.ns
+
+
+def category_rows(page: WikipediaPage) -> Iterator[Row]:
+    for category in page.categories.keys():
+        yield page.language, page.title, category
+
+
+def langlink_rows(page: WikipediaPage) -> Iterator[Row]:
+    for language, link in page.langlinks.items():
+        yield (
+            page.language,
+            page.title,
+            language,
+            link.title,
+            getattr(link, 'fullurl', None),
+        )
+
+
+ROWS = {
+    'pages': page_rows,
+    'sections': section_rows,
+    'links': link_rows,
+    'categories': category_rows,
+    'langlinks': langlink_rows,
+}
+
+
+def _pyarrow():
+    try:
+        import pyarrow
+    except ImportError:
+        raise ImportError('Arrow export requires pyarrow: pip install pyarrow')
+    return pyarrow
+
+
+def arrow_schema(table: str):
+    pa = _pyarrow()
+    types = {
+        'string': pa.string(),
+        'int64': pa.int64(),
+        'list<string>': pa.list_(pa.string()),
+    }
+    return pa.schema([
+        (name, types[column_type]) for name, column_type in SCHEMAS[table]
+    ])
+
+
+def record_batch(table: str, rows: Sequence[Row]):
+    '''
+    Returns Arrow record batch with given rows of the table.
+    '''
+    pa = _pyarrow()
+    schema = arrow_schema(table)
+    columns = list(zip(*rows)) if rows else [[] for _ in schema]
+    return pa.RecordBatch.from_arrays(
+        [
+            pa.array(column, type=field.type)
+            for column, field in zip(columns, schema)
+        ],
+        schema=schema
+    )
+
+
+class JsonlWriter(object):
+    def __init__(self, path: str, table: str) -> None:
+        self.names = [name for name, _ in SCHEMAS[table]]
+        self._file = open(path, 'w', encoding='utf-8')
+
+    def write(self, rows: Sequence[Row]) -> None:
+        self._file.write(''.join(
+            json.dumps(dict(zip(self.names, row)), ensure_ascii=False) + '\n'
+            for row in rows
+        ))
+
+    def close(self) -> None:
+        self._file.close()
+
+
+class ParquetWriter(object):
+    '''
+    Every call of `write` produces one row group.
+    '''
+
+    def __init__(self, path: str, table: str) -> None:
+        _pyarrow()
+        import pyarrow.parquet
+        self.table = table
+        self._writer = pyarrow.parquet.ParquetWriter(path, arrow_schema(table))
+
+    def write(self, rows: Sequence[Row]) -> None:
+        self._writer.write_batch(record_batch(self.table, rows))
+
+    def close(self) -> None:
+        self._writer.close()
+
+
+WRITERS = {
+    'jsonl': JsonlWriter,
+    'parquet': ParquetWriter,
+}
+
+
+class Exporter(object):
+    '''
+    Writes tables into `directory` as `<table>.<format>` files.
+
+    Only `tables` are exported and pages are fetched as needed for them,
+    e.g. `links` table fetches links of every page. Pages can come from
+    `fetch_all` or `map`, so they are exported as they are fetched:
+
+        with Exporter('out', tables=['pages', 'links']) as exporter:
+            exporter.write(wiki.fetch_all(pages, ['structured', 'links']))
+    '''
+
+    def __init__(
+            self,
+            directory: str,
+            format: str = 'jsonl',
+            tables: Iterable[str] = TABLES,
+            row_group_size: int = 10000
+    ) -> None:
+        if format not in WRITERS:
+            raise ValueError('Unknown format: {}'.format(format))
+        os.makedirs(directory, exist_ok=True)
+        self.row_group_size = row_group_size
+        self._writers = {}  # type: Dict[str, Any]
+        self._buffers = {}  # type: Dict[str, List[Row]]
+        for table in tables:
+            path = os.path.join(directory, table + '.' + format)
+            self._writers[table] = WRITERS[format](path, table)
+            self._buffers[table] = []
+
+    def add(self, page: WikipediaPage) -> None:
+        for table, buffer in self._buffers.items():
+            for row in ROWS[table](page):
+                buffer.append(row)
+                if len(buffer) >= self.row_group_size:
+                    self._flush(table)
+                    buffer = self._buffers[table]
+
+    def write(self, pages: Iterable[WikipediaPage]) -> int:
+        count = 0
+        for page in pages:
+            self.add(page)
+            count += 1
+        return count
+
+    def _flush(self, table: str) -> None:
+        if self._buffers[table]:
+            self._writers[table].write(self._buffers[table])
+            self._buffers[table] = []
+
+    def close(self) -> None:
+        for table, writer in self._writers.items():
+            self._flush(table)
+            writer.close()
+
+    def __enter__(self) -> 'Exporter':
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.close()
+
+
+def iter_record_batches(
+        table: str,
+        pages: Iterable[WikipediaPage],
+        row_group_size: int = 10000
+) -> Iterator[Any]:
+    '''
+    Yields Arrow record batches of the table with `row_group_size` rows.
+    '''
+    rows = []  # type: List[Row]
+    for page in pages:
+        for row in ROWS[table](page):
+            rows.append(row)
+            if len(rows) >= row_group_size:
+                yield record_batch(table, rows)
+                rows = []
+    if rows:
+        yield record_batch(table, rows)
@@ -0,0 +1,192 @@
+'''
+Local full-text index over fetched pages.
+
+Every section of the page (and its summary) is indexed as separate
+document. Postings are kept as delta and varint encoded byte arrays of
+document ids and term frequencies, so they stay small and can be
+extended as new pages are added.
+'''
+import bisect
+import collections
+import re
+from typing import Dict, List, Tuple, Iterator, Set
+
+from .wikipedia import WikipediaPage, WikipediaPageSection
+
+TOKEN_PATTERN = re.compile(r'\w+', re.UNICODE)
+
+SectionPath = Tuple[str, ...]
+
+Hit = collections.namedtuple('Hit', ['title', 'language', 'section', 'score'])
+
+
+def tokenize(text: str) -> List[str]:
+    return TOKEN_PATTERN.findall(text.lower())
+
+
+def _encode_varint(value: int, out: bytearray) -> None:
+    while value >= 0x80:
+        out.append((value & 0x7f) | 0x80)
+        value >>= 7
+    out.append(value)
+
+
+def _decode_varints(data: bytearray) -> Iterator[int]:
+    value = 0
+    shift = 0
+    for byte in data:
+        value |= (byte & 0x7f) << shift
+        if byte & 0x80:
+            shift += 7
+        else:
+            yield value
+            value = 0
+            shift = 0
+
+
+class Postings(object):
+    '''
+    Document ids in increasing order with term frequencies.
+    '''
+
+    __slots__ = ['data', 'last']
+
+    def __init__(self) -> None:
+        self.data = bytearray()
+        self.last = -1
+
+    def add(self, doc: int, tf: int) -> None:
+        _encode_varint(doc - self.last - 1, self.data)
+        _encode_varint(tf, self.data)
+        self.last = doc
+
+    def __iter__(self) -> Iterator[Tuple[int, int]]:
+        doc = -1
+        values = _decode_varints(self.data)
+        for delta in values:
+            doc += delta + 1
+            yield doc, next(values)
+
+
+class Index(object):
+    def __init__(self) -> None:
+        self._postings = {}  # type: Dict[str, Postings]
+        # document id -> (language, title, section path)
+        self._docs = []  # type: List[Tuple[str, str, SectionPath]]
+        self._deleted = set()  # type: Set[int]
+        self._page_docs = {}  # type: Dict[Tuple[str, str], List[int]]
+        self._titles = []  # type: List[Tuple[str, str, str]]
+
+    def add(self, page: WikipediaPage) -> None:
+        '''
+        Indexes summary and all sections of the page. When the page was
+        already indexed, its previous version is replaced.
+        '''
+        sections = page.sections
+        key = (page.language, page.title)
+        if key in self._page_docs:
+            self._deleted.update(self._page_docs[key])
+        else:
+            bisect.insort(
+                self._titles,
+                (page.title.lower(), page.title, page.language)
+            )
+        docs = []
+        self._page_docs[key] = docs
+
+        docs.append(self._add_document(key, (), page.summary))
+        for section in sections:
+            self._add_section(key, (), section, docs)
+
+    def _add_section(
+            self,
+            key: Tuple[str, str],
+            parent: SectionPath,
+            section: WikipediaPageSection,
+            docs: List[int]
+    ) -> None:
+        path = parent + (section.title,)
+        docs.append(
+            self._add_document(key, path, section.title + '\n' + section.text)
+        )
+        for sub in section.sections:
+            self._add_section(key, path, sub, docs)
+
+    def _add_document(
+            self,
+            key: Tuple[str, str],
+            path: SectionPath,
+            text: str
+    ) -> int:
+        doc = len(self._docs)
+        self._docs.append((key[0], key[1], path))
+        for token, tf in collections.Counter(tokenize(text)).items():
+            postings = self._postings.get(token)
+            if postings is None:
+                postings = self._postings[token] = Postings()
+            postings.add(doc, tf)
+        return doc
+
+    def search(
+            self,
+            query: str,
+            section: str = None,
+            limit: int = 10
+    ) -> List[Hit]:
+        '''
+        Returns sections containing all words of the query ordered by
+        number of occurrences. With `section`, only sections with this
+        title or their subsections are searched.
+        '''
+        tokens = set(tokenize(query))
+        if not tokens:
+            return []
+
+        postings = []
+        for token in tokens:
+            if token not in self._postings:
+                return []
+            postings.append(self._postings[token])
+        postings.sort(key=lambda p: len(p.data))
+
+        scores = dict(iter(postings[0]))
+        for other in postings[1:]:
+            scores = {
+                doc: scores[doc] + tf
+                for doc, tf in other if doc in scores
+            }
+            if not scores:
+                return []
+
+        hits = []
+        for doc, score in scores.items():
+            if doc in self._deleted:
+                continue
+            language, title, path = self._docs[doc]
+            if section is not None and section not in path:
+                continue
+            hits.append(Hit(title, language, path, score))
+
+        hits.sort(key=lambda h: (-h.score, h.title, h.section))
+        return hits[:limit]
+
+    def titles(self, prefix: str, limit: int = 10) -> List[str]:
+        '''
+        Returns indexed titles starting with `prefix` ignoring case.
+        '''
+        prefix = prefix.lower()
+        result = []
+        i = bisect.bisect_left(self._titles, (prefix,))
+        while i < len(self._titles) and len(result) < limit:
+            lowered, title, _ = self._titles[i]
+            if not lowered.startswith(prefix):
+                break
+            result.append(title)
+            i += 1
+        return result
+
+    def __len__(self) -> int:
+        return len(self._page_docs)
+
+    def __contains__(self, page: WikipediaPage) -> bool:
+        return (page.language, page.title) in self._page_docs
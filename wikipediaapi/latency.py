@@ -0,0 +1,177 @@
+'''
+Bounding time spent waiting for the API.
+
+Deadline is shared by all requests of one operation, e.g. all rounds of
+continuation, and hedged requests are sent to the second endpoint, when
+the first one is slower than usual.
+
+https://research.google/pubs/the-tail-at-scale/
+'''
+import collections
+import contextlib
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from typing import Any, Callable, Dict, Iterator, Optional
+
+
+class DeadlineExceeded(TimeoutError):
+    pass
+
+
+class Deadline(object):
+    def __init__(self, seconds: float) -> None:
+        self.expires = time.monotonic() + seconds
+
+    def remaining(self) -> float:
+        return self.expires - time.monotonic()
+
+
+class Deadlines(object):
+    '''
+    Deadlines of operations running in the current thread. Nested
+    operation never gets more time than the enclosing one.
+    '''
+
+    def __init__(self) -> None:
+        self._local = threading.local()
+
+    @property
+    def current(self) -> Optional[Deadline]:
+        return getattr(self._local, 'deadline', None)
+
+    @contextlib.contextmanager
+    def budget(self, seconds: Optional[float]) -> Iterator[Optional[Deadline]]:
+        outer = self.current
+        if seconds is None or (
+            outer is not None and outer.remaining() <= seconds
+        ):
+            yield outer
+            return
+        self._local.deadline = Deadline(seconds)
+        try:
+            yield self._local.deadline
+        finally:
+            self._local.deadline = outer
+
+    def expired(self) -> bool:
+        deadline = self.current
+        return deadline is not None and deadline.remaining() <= 0
+
+    def timeout(self, timeout: float) -> float:
+        '''
+        Returns timeout for the next request, which does not exceed
+        the current deadline.
+        '''
+        deadline = self.current
+        if deadline is None:
+            return timeout
+        remaining = deadline.remaining()
+        if remaining <= 0:
+            raise DeadlineExceeded('Deadline of the operation has passed')
+        return min(timeout, remaining)
+
+
+class LatencyTracker(object):
+    '''
+    Keeps durations of the last `window` requests.
+    '''
+
+    def __init__(self, window: int = 200) -> None:
+        self._samples = collections.deque(maxlen=window)  # type: collections.deque
+        self._lock = threading.Lock()
+
+    def record(self, seconds: float) -> None:
+        with self._lock:
+            self._samples.append(seconds)
+
+    def percentile(self, p: float) -> Optional[float]:
+        with self._lock:
+            samples = sorted(self._samples)
+        if not samples:
+            return None
+        i = min(len(samples) - 1, int(len(samples) * p / 100.0))
+        return samples[i]
+
+    def __len__(self) -> int:
+        return len(self._samples)
+
+
+class Hedger(object):
+    '''
+    Sends request to the primary endpoint and when it does not answer
+    within `percentile` of recent latencies, sends the same request
+    to the secondary endpoint. The first answer wins. Until `min_samples`
+    latencies are known, `delay` is used.
+
+    Requests are sent by up to `workers` threads. Delay is measured from
+    the start of the primary request, so requests waiting for a free
+    thread are not hedged.
+    '''
+
+    def __init__(
+            self,
+            percentile: float = 95.0,
+            delay: float = 0.5,
+            min_samples: int = 20,
+            workers: int = 16
+    ) -> None:
+        self.percentile = percentile
+        self.delay = delay
+        self.min_samples = min_samples
+        self.latency = LatencyTracker()
+        self.hedged = 0
+        self._executor = ThreadPoolExecutor(max_workers=workers)
+
+    def hedge_delay(self) -> float:
+        if len(self.latency) < self.min_samples:
+            return self.delay
+        return self.latency.percentile(self.percentile)
+
+    def _timed(
+            self,
+            get: Callable[[], Dict[str, Any]],
+            started: threading.Event
+    ) -> Dict[str, Any]:
+        started.set()
+        start = time.monotonic()
+        result = get()
+        self.latency.record(time.monotonic() - start)
+        return result
+
+    def get(
+            self,
+            primary: Callable[[], Dict[str, Any]],
+            secondary: Callable[[], Dict[str, Any]],
+            timeout: float
+    ) -> Dict[str, Any]:
+        expires = time.monotonic() + timeout
+        started = threading.Event()
+        pending = {self._executor.submit(self._timed, primary, started)}
+        started.wait(timeout)
+        remaining = max(0.0, expires - time.monotonic())
+        done, _ = wait(pending, timeout=min(self.hedge_delay(), remaining))
+        if not done or next(iter(done)).exception() is not None:
+            self.hedged += 1
+            pending.add(self._executor.submit(secondary))
+
+        error = None
+        while pending:
+            remaining = expires - time.monotonic()
+            if remaining <= 0:
+                break
+            done, pending = wait(
+                pending,
+                timeout=remaining,
+                return_when=FIRST_COMPLETED
+            )
+            for future in done:
+                if future.exception() is None:
+                    return future.result()
+                error = future.exception()
+        if error is not None:
+            raise error
+        raise DeadlineExceeded('No endpoint answered in time')
+
+    def close(self) -> None:
+        self._executor.shutdown(wait=False)
@@ -0,0 +1,143 @@
+'''
+Keeping fetched data of pages within memory budget.
+
+Sizes are only estimates based on lengths of fetched strings and rough
+sizes of the objects holding them.
+'''
+import collections
+import sys
+import threading
+import weakref
+from typing import Dict, Any, Tuple, List, Optional
+
+# Approximate size of WikipediaPage without any fetched data
+PAGE_SIZE = 1800
+# Approximate size of WikipediaPageSection without title and text
+SECTION_SIZE = 400
+
+# Calls, whose data are large enough to be evicted. Sections, summary
+# and section titles share their data, so they are tracked as one.
+HEAVY_CALLS = {
+    'structured': 'structured',
+    'intro': 'structured',
+    'outline': 'structured',
+    'langlinks': 'langlinks',
+    'links': 'links',
+    'backlinks': 'backlinks',
+    'categories': 'categories',
+    'categorymembers': 'categorymembers',
+}
+
+
+def _tracked(call) -> Optional[Any]:
+    '''
+    Returns key of tracked data of `call`. Filtered lists are tracked
+    under their (call, filters) key.
+    '''
+    if isinstance(call, tuple):
+        return call if call[0] in HEAVY_CALLS else None
+    return HEAVY_CALLS.get(call)
+
+
+def _sections_size(sections) -> int:
+    size = 0
+    for section in sections:
+        size += SECTION_SIZE
+        size += sys.getsizeof(section.title) + sys.getsizeof(section.text)
+        size += _sections_size(section.sections)
+    return size
+
+
+def footprint(page, call: str) -> int:
+    '''
+    Returns approximate size of data fetched by `call` in bytes, `call`
+    can be (call, filters) key of filtered list.
+    '''
+    if isinstance(call, tuple):
+        pages = page._filtered.get(call, {})
+        return sum(sys.getsizeof(k) + PAGE_SIZE for k in pages.keys())
+    call = HEAVY_CALLS.get(call, call)
+    if call == 'structured':
+        return (
+            sys.getsizeof(page._summary) +
+            sum(sys.getsizeof(t) for t in page._section_titles) +
+            _sections_size(page._sections) +
+            _sections_size(page._lazy_sections.values())
+        )
+    return sum(
+        sys.getsizeof(k) + PAGE_SIZE
+        for k in getattr(page, '_' + call).keys()
+    )
+
+
+class MemoryBudget(object):
+    '''
+    Tracks approximate size of fetched data and when it exceeds `limit`,
+    drops the least recently used data. Dropped data are fetched again
+    on the next access.
+
+    Pages are referenced weakly, so tracking does not keep them alive.
+    '''
+
+    def __init__(self, limit: int) -> None:
+        self.limit = limit
+        self.footprint = 0
+        self._lock = threading.RLock()
+        # (id(page), call) -> (weak reference to page, size)
+        self._entries = collections.OrderedDict()  # type: Dict[Tuple[int, Any], Tuple[weakref.ref, int]]
+
+    def fetched(self, page, call: str) -> None:
+        call = _tracked(call)
+        if call is None:
+            return
+        key = (id(page), call)
+        size = footprint(page, call)
+
+        with self._lock:
+            self._remove(key)
+            self._entries[key] = (
+                weakref.ref(page, lambda _: self._remove(key)),
+                size
+            )
+            self.footprint += size
+
+            victims = []  # type: List[Tuple[object, Any]]
+            while self.footprint > self.limit and len(self._entries) > 1:
+                victim_key = next(iter(self._entries))
+                if victim_key == key:
+                    break
+                ref, _ = self._entries[victim_key]
+                self._remove(victim_key)
+                victim = ref()
+                if victim is not None:
+                    victims.append((victim, victim_key[1]))
+
+        # pages are invalidated without holding the lock, since they
+        # acquire their own locks
+        for victim, victim_call in victims:
+            victim._invalidate(victim_call)
+
+    def touch(self, page, call: str) -> None:
+        call = _tracked(call)
+        if call is None:
+            return
+        with self._lock:
+            key = (id(page), call)
+            if key in self._entries:
+                self._entries.move_to_end(key)
+
+    def forget(self, page, call: str) -> None:
+        call = _tracked(call)
+        if call is None:
+            return
+        with self._lock:
+            self._remove((id(page), call))
+
+    def _remove(self, key: Tuple[int, Any]) -> None:
+        with self._lock:
+            entry = self._entries.pop(key, None)
+            if entry is not None:
+                self.footprint -= entry[1]
+
+    def __len__(self) -> int:
+        return len(self._entries)
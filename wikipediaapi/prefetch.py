@@ -0,0 +1,144 @@
+'''
+Fetching properties of the page before they are accessed.
+
+Prefetcher remembers, which properties were accessed after each other
+on the same page. When a property of the page is accessed for the first
+time, properties, which followed it on at least `threshold` of previous
+pages, are fetched in background threads, while the caller works with
+the first one. Properties can be declared by `plan` instead:
+
+    prefetcher = Prefetcher(plan={'structured': ['categories', 'langlinks']})
+    wiki = Wikipedia('en', prefetcher=prefetcher)
+
+Properties are named by calls of `WikipediaPage`, e.g. `summary` and
+`sections` are `structured`.
+'''
+import collections
+import logging
+import threading
+import weakref
+from concurrent.futures import Future, ThreadPoolExecutor, wait
+from typing import Dict, Iterable, List, Tuple, Union
+
+log = logging.getLogger(__name__)
+
+Plan = Union[Dict[str, Iterable[str]], Iterable[str]]
+
+
+def _plan(plan: Plan) -> Dict[str, List[str]]:
+    '''
+    Sequence of calls means, that all of them are accessed together.
+    '''
+    if isinstance(plan, dict):
+        return {call: list(calls) for call, calls in plan.items()}
+    calls = list(plan)
+    return {call: [c for c in calls if c != call] for call in calls}
+
+
+class Prefetcher(object):
+    '''
+    Fetches properties predicted from accesses to previous pages or by
+    `plan`. Predictions are made after `min_pages` pages accessed the
+    property, before that nothing is prefetched.
+
+    Pages are referenced weakly, so tracking does not keep them alive.
+    '''
+
+    def __init__(
+            self,
+            plan: Plan = None,
+            threshold: float = 0.6,
+            min_pages: int = 5,
+            workers: int = 4
+    ) -> None:
+        self.plan = _plan(plan) if plan is not None else None
+        self.threshold = threshold
+        self.min_pages = min_pages
+        self.prefetched = 0
+        self._lock = threading.Lock()
+        # call -> number of pages, where it was accessed
+        self._seen = collections.Counter()  # type: collections.Counter
+        # call -> call accessed after it -> number of pages
+        self._follows = collections.defaultdict(collections.Counter)  # type: Dict[str, collections.Counter]
+        # page -> calls in the order of the first access
+        self._accessed = weakref.WeakKeyDictionary()  # type: weakref.WeakKeyDictionary
+        # (id(page), call) -> running fetch
+        self._pending = {}  # type: Dict[Tuple[int, str], Future]
+        self._executor = ThreadPoolExecutor(max_workers=workers)
+
+    def accessed(self, page, call: str) -> bool:
+        '''
+        Records access to the property and returns True, when it is
+        the first access on the page.
+        '''
+        with self._lock:
+            calls = self._accessed.setdefault(page, [])
+            if call in calls:
+                return False
+            for previous in calls:
+                self._follows[previous][call] += 1
+            calls.append(call)
+            self._seen[call] += 1
+            return True
+
+    def predict(self, call: str) -> List[str]:
+        '''
+        Returns calls likely accessed after `call`, the most likely first.
+        '''
+        if self.plan is not None:
+            return list(self.plan.get(call, []))
+        with self._lock:
+            seen = self._seen[call]
+            if seen < self.min_pages:
+                return []
+            return [
+                c for c, n in self._follows[call].most_common()
+                if n >= self.threshold * seen
+            ]
+
+    def prefetch(self, page, call: str) -> List[str]:
+        '''
+        Starts fetching of calls predicted after `call`, which were not
+        fetched yet, and returns them.
+        '''
+        started = []
+        for predicted in self.predict(call):
+            if page._called[predicted]:
+                continue
+            key = (id(page), predicted)
+            with self._lock:
+                if key in self._pending:
+                    continue
+                future = self._executor.submit(self._fetch, page, predicted)
+                self._pending[key] = future
+                self.prefetched += 1
+            future.add_done_callback(
+                lambda _, key=key: self._done(key)
+            )
+            started.append(predicted)
+        return started
+
+    def _fetch(self, page, call: str) -> None:
+        try:
+            page._fetch(call)
+        except Exception as e:
+            # it is fetched again, when it is accessed
+            log.debug('Prefetching %s of %s failed: %r', call, page.title, e)
+
+    def _done(self, key: Tuple[int, str]) -> None:
+        with self._lock:
+            self._pending.pop(key, None)
+
+    def wait(self, timeout: float = None) -> None:
+        '''
+        Waits until all started prefetches are finished.
+        '''
+        with self._lock:
+            pending = list(self._pending.values())
+        wait(pending, timeout=timeout)
+
+    def close(self) -> None:
+        self._executor.shutdown(wait=False)
+
+    def __len__(self) -> int:
+        return len(self._pending)
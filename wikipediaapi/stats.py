@@ -0,0 +1,203 @@
+'''
+Text statistics of many sections at once.
+
+Sections of many pages are flattened into columns kept in `array.array`
+buffers and all texts are concatenated into one UTF-8 buffer with
+offsets, the same layout as Arrow uses for strings. Statistics are
+computed over whole columns, with NumPy when it is installed.
+
+Columns can be passed to NumPy, pandas or Arrow without copying.
+'''
+import array
+import re
+from typing import Dict, Any, Iterable, List, Tuple
+
+from .wikipedia import WikipediaPage
+
+# Bytes separating words, other Unicode spaces are part of words
+SPACES = b'\t\n\x0b\x0c\r '
+WORD_PATTERN = re.compile(b'[^' + re.escape(SPACES) + b']+')
+
+COLUMNS = ['page', 'level', 'parent', 'start', 'end', 'length']
+
+
+def _numpy():
+    try:
+        import numpy
+    except ImportError:
+        return None
+    return numpy
+
+
+class SectionTable(object):
+    '''
+    One row for summary (level 0) and one for every section of each page.
+
+    * `page` - position of the page in `titles`
+    * `level` - level of the section, 0 for summary
+    * `parent` - row of the parent section, -1 for top level sections
+    * `start`, `end` - offsets of the section within the extract
+    * `length` - number of characters of the text
+    * `text`, `text_offsets` - UTF-8 encoded texts, text of row `i` is
+      `text[text_offsets[i]:text_offsets[i + 1]]`
+    '''
+
+    def __init__(self) -> None:
+        self.titles = []  # type: List[Tuple[str, str]]
+        for name in COLUMNS:
+            setattr(self, name, array.array('q'))
+        self.text = bytearray()
+        self.text_offsets = array.array('q', [0])
+
+    @classmethod
+    def from_pages(cls, pages: Iterable[WikipediaPage]) -> 'SectionTable':
+        '''
+        Pages are consumed one by one, so they can come from `map`,
+        `fetch_all` or `iter_pages` of a dump.
+        '''
+        table = cls()
+        for page in pages:
+            table.add(page)
+        return table
+
+    def add(self, page: WikipediaPage) -> None:
+        index = page.section_index
+        page_row = len(self.titles)
+        self.titles.append((page.language, page.title))
+
+        first = len(self)
+        summary_end = index.starts[0] if len(index) else -1
+        self._add_row(page_row, 0, -1, 0, summary_end, page.summary)
+        for i in range(len(index)):
+            parent = index.parents[i]
+            self._add_row(
+                page_row,
+                index.levels[i],
+                first + 1 + parent if parent >= 0 else -1,
+                index.starts[i],
+                index.ends[i],
+                index[i].text
+            )
+
+    def _add_row(self, page, level, parent, start, end, text) -> None:
+        self.page.append(page)
+        self.level.append(level)
+        self.parent.append(parent)
+        self.start.append(start)
+        self.end.append(end)
+        self.length.append(len(text))
+        self.text += text.encode('utf-8')
+        self.text_offsets.append(len(self.text))
+
+    def __len__(self) -> int:
+        return len(self.page)
+
+    def words(self):
+        '''
+        Number of words of every row.
+        '''
+        np = _numpy()
+        if np is None:
+            offsets = self.text_offsets
+            return array.array('q', (
+                len(WORD_PATTERN.findall(self.text, offsets[i], offsets[i + 1]))
+                for i in range(len(self))
+            ))
+
+        data = np.frombuffer(self.text, dtype=np.uint8)
+        offsets = np.frombuffer(self.text_offsets, dtype=np.int64)
+        space = np.isin(data, np.frombuffer(SPACES, dtype=np.uint8))
+        word_start = ~space
+        word_start[1:] &= space[:-1]
+        # words continue over boundary of rows only in the buffer
+        starts = offsets[:-1][offsets[:-1] < len(data)]
+        word_start[starts] = ~space[starts]
+        counts = np.concatenate(([0], np.cumsum(word_start, dtype=np.int64)))
+        return counts[offsets[1:]] - counts[offsets[:-1]]
+
+    def density(self):
+        '''
+        Words per character of every row, 0 for empty rows.
+        '''
+        words = self.words()
+        np = _numpy()
+        if np is None:
+            return array.array('d', (
+                w / l if l else 0.0 for w, l in zip(words, self.length)
+            ))
+        lengths = np.frombuffer(self.length, dtype=np.int64)
+        return np.divide(
+            words, lengths,
+            out=np.zeros(len(lengths)),
+            where=lengths > 0
+        )
+
+    def per_page(self, values) -> List[Any]:
+        '''
+        Sums values of rows for every page.
+        '''
+        np = _numpy()
+        if np is None:
+            totals = [0] * len(self.titles)
+            for page, value in zip(self.page, values):
+                totals[page] += value
+            return totals
+        return np.bincount(
+            np.frombuffer(self.page, dtype=np.int64),
+            weights=values,
+            minlength=len(self.titles)
+        )
+
+    def statistics(self) -> Dict[str, Any]:
+        return {
+            'length': self.length,
+            'words': self.words(),
+            'density': self.density(),
+        }
+
+    def to_numpy(self) -> Dict[str, Any]:
+        '''
+        Returns NumPy arrays sharing memory with the columns.
+        '''
+        np = _numpy()
+        if np is None:
+            raise ImportError('to_numpy requires numpy: pip install numpy')
+        return {
+            name: np.frombuffer(getattr(self, name), dtype=np.int64)
+            for name in COLUMNS
+        }
+
+    def to_pandas(self):
+        try:
+            import pandas
+        except ImportError:
+            raise ImportError('to_pandas requires pandas: pip install pandas')
+        columns = self.to_numpy()
+        columns['words'] = self.words()
+        return pandas.DataFrame(columns, copy=False)
+
+    def to_arrow(self):
+        '''
+        Returns Arrow record batch sharing memory with the columns.
+        '''
+        try:
+            import pyarrow
+        except ImportError:
+            raise ImportError('to_arrow requires pyarrow: pip install pyarrow')
+        n = len(self)
+        arrays = [
+            pyarrow.Array.from_buffers(
+                pyarrow.int64(), n,
+                [None, pyarrow.py_buffer(getattr(self, name))]
+            )
+            for name in COLUMNS
+        ]
+        arrays.append(pyarrow.Array.from_buffers(
+            pyarrow.large_string(), n,
+            [
+                None,
+                pyarrow.py_buffer(self.text_offsets),
+                pyarrow.py_buffer(self.text)
+            ]
+        ))
+        return pyarrow.RecordBatch.from_arrays(arrays, COLUMNS + ['text'])
@@ -0,0 +1,205 @@
+'''
+Handling of page titles.
+
+`TitleCache` remembers normalizations, redirects and page ids from
+`normalized`, `redirects` and `pages` blocks of API responses, so
+aliases of already seen pages are resolved locally.
+
+`TitlePool` keeps single copy of every title, so titles of pages linked
+from many other pages are stored only once.
+
+https://www.mediawiki.org/wiki/API:Query#Resolving_redirects
+https://www.mediawiki.org/wiki/Manual:Page_title
+'''
+import json
+import os
+import re
+import threading
+from typing import Dict, Any, Iterable, Optional, Tuple
+
+Key = Tuple[str, str]
+
+SPACES_PATTERN = re.compile('[ _]+')
+
+# Languages with their own upper case of the first letter
+FIRST_LETTER = {
+    'az': {'i': '\u0130'},
+    'crh': {'i': '\u0130'},
+    'kaa': {'i': '\u0130'},
+    'tr': {'i': '\u0130'},
+}
+
+# Wikipedias, whose titles may start with lower case letter
+CASE_SENSITIVE = frozenset(['jbo'])
+
+
+class TitlePool(object):
+    '''
+    Keeps single copy of every title, equal titles of the same language
+    are the same object. Titles returned by the API are already
+    canonical, so they are only interned by `intern`. Titles given by
+    users are normalized by `title`.
+
+    When `max_size` is given, the oldest titles are dropped, when there
+    are more of them. Otherwise they are kept until `clear` is called.
+    '''
+
+    def __init__(
+            self,
+            case_sensitive: Iterable[str] = CASE_SENSITIVE,
+            max_size: int = None
+    ) -> None:
+        self.case_sensitive = set(case_sensitive)
+        self.max_size = max_size
+        self._titles = {}  # type: Dict[Key, str]
+        self._lock = threading.Lock()
+
+    def intern(self, language: str, title: str) -> str:
+        '''
+        Returns the pooled copy of the title.
+        '''
+        key = (language, title)
+        pooled = self._titles.get(key)
+        if pooled is not None:
+            return pooled
+        with self._lock:
+            pooled = self._titles.setdefault(key, title)
+            if self.max_size is not None:
+                while len(self._titles) > self.max_size:
+                    del self._titles[next(iter(self._titles))]
+        return pooled
+
+    def title(self, language: str, title: str) -> str:
+        '''
+        Returns the pooled copy of normalized title.
+        '''
+        return self.intern(language, self.normalize(language, title))
+
+    def normalize(self, language: str, title: str) -> str:
+        '''
+        Underscores are replaced by spaces and the first letter is upper
+        case, unless the language is listed in `case_sensitive`.
+        '''
+        title = SPACES_PATTERN.sub(' ', title).strip(' ')
+        if title and language not in self.case_sensitive:
+            first = FIRST_LETTER.get(language, {}).get(title[0])
+            if first is None:
+                # title case, e.g. 'ǆ' becomes 'ǅ' and not 'Ǆ'
+                first = title[0].title()
+            # e.g. 'ß' would become 'Ss'
+            if len(first) == 1:
+                title = first + title[1:]
+        return title
+
+    def clear(self) -> None:
+        with self._lock:
+            self._titles = {}
+
+    def __len__(self) -> int:
+        return len(self._titles)
+
+
+class TitleCache(object):
+    '''
+    When `path` is given, learned entries are appended to this file as
+    JSON lines and loaded again on the next start.
+
+    Page ids are cached as well, so they may become stale, when pages
+    are created or deleted.
+    '''
+
+    def __init__(self, path: str = None) -> None:
+        self.path = path
+        self._normalized = {}  # type: Dict[Key, str]
+        self._redirects = {}  # type: Dict[Key, str]
+        self._pageids = {}  # type: Dict[Key, int]
+        self._lock = threading.Lock()
+        self._file = None
+
+        if path is not None:
+            if os.path.exists(path):
+                with open(path, encoding='utf-8') as f:
+                    for line in f:
+                        if line.strip():
+                            self._set(*json.loads(line))
+            self._file = open(path, 'a', encoding='utf-8')
+
+    def _set(self, kind: str, language: str, title: str, value) -> bool:
+        table = {
+            'n': self._normalized,
+            'r': self._redirects,
+            'p': self._pageids,
+        }[kind]
+        key = (language, title)
+        if table.get(key) == value:
+            return False
+        table[key] = value
+        return True
+
+    def learn(self, language: str, query: Dict[str, Any]) -> None:
+        entries = []
+        for block in ['normalized', 'converted']:
+            for rename in query.get(block, []):
+                if rename['from'] != rename['to']:
+                    entries.append(('n', language, rename['from'], rename['to']))
+        for rename in query.get('redirects', []):
+            entries.append(('r', language, rename['from'], rename['to']))
+        for v in query.get('pages', {}).values():
+            if 'title' not in v:
+                continue
+            if 'pageid' in v:
+                entries.append(('p', language, v['title'], v['pageid']))
+            elif 'missing' in v:
+                entries.append(('p', language, v['title'], -1))
+
+        with self._lock:
+            changed = [e for e in entries if self._set(*e)]
+            if changed and self._file is not None:
+                for e in changed:
+                    self._file.write(json.dumps(e) + '\n')
+                self._file.flush()
+
+    def normalized(self, language: str, title: str) -> str:
+        return self._normalized.get((language, title), title)
+
+    def redirect(self, language: str, title: str) -> Optional[str]:
+        '''
+        Returns final redirect target of normalized title or None.
+        '''
+        target = None
+        seen = set()
+        while (language, title) in self._redirects and title not in seen:
+            seen.add(title)
+            title = target = self._redirects[(language, title)]
+        return target
+
+    def canonical(self, language: str, title: str) -> str:
+        '''
+        Returns title of the page, which the title leads to.
+        '''
+        normalized = self.normalized(language, title)
+        return self.redirect(language, normalized) or normalized
+
+    def lookup(
+            self,
+            language: str,
+            title: str
+    ) -> Optional[Tuple[str, Optional[str], int]]:
+        '''
+        Returns normalized title, redirect target and page id, when all
+        of them are known.
+        '''
+        normalized = self.normalized(language, title)
+        redirect = self.redirect(language, normalized)
+        pageid = self._pageids.get((language, redirect or normalized))
+        if pageid is None:
+            return None
+        return normalized, redirect, pageid
+
+    def close(self) -> None:
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def __len__(self) -> int:
+        return len(self._normalized) + len(self._redirects) + len(self._pageids)
@@ -0,0 +1,127 @@
+'''
+Transports sending requests to the MediaWiki API.
+
+Every transport is safe to share between threads and keeps pool of
+connections per host. Libraries sending requests are imported only,
+when the transport is created.
+'''
+import collections
+import threading
+from typing import Dict, Any
+from urllib.parse import urlsplit
+
+# Number of hosts with their own connection pool, there is roughly
+# 300 language editions of Wikipedia.
+POOL_HOSTS = 350
+
+
+class RequestsTransport(object):
+    '''
+    HTTP/1.1 transport based on `requests`_.
+
+    .. _requests: http://docs.python-requests.org/
+    '''
+
+    def __init__(self, pool_size: int = 10) -> None:
+        import requests
+        import requests.adapters
+        self.session = requests.Session()
+        adapter = requests.adapters.HTTPAdapter(
+            pool_connections=POOL_HOSTS,
+            pool_maxsize=pool_size
+        )
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
+
+    def get(
+            self,
+            url: str,
+            params: Dict[str, Any],
+            headers: Dict[str, str],
+            timeout: float
+    ) -> Dict[str, Any]:
+        r = self.session.get(
+            url,
+            params=params,
+            headers=headers,
+            timeout=timeout,
+        )
+        return r.json()
+
+    def close(self) -> None:
+        self.session.close()
+
+
+class HttpxTransport(object):
+    '''
+    Transport based on `httpx`_, which multiplexes concurrent requests
+    to the same host over a few HTTP/2 connections.
+    It requires ``pip install httpx[http2]``.
+
+    Like in `RequestsTransport`, every host has its own pool with up to
+    `pool_size` connections and pools of `POOL_HOSTS` most recently used
+    hosts are kept.
+
+    .. _httpx: https://www.python-httpx.org/
+    '''
+
+    def __init__(
+            self,
+            pool_size: int = 10,
+            http2: bool = True
+    ) -> None:
+        try:
+            import httpx
+        except ImportError:
+            raise ImportError(
+                'HttpxTransport requires httpx: pip install httpx[http2]'
+            )
+        self._httpx = httpx
+        self.pool_size = pool_size
+        self.http2 = http2
+        self._lock = threading.Lock()
+        # (scheme, host) -> client, the least recently used first
+        self._clients = collections.OrderedDict()  # type: collections.OrderedDict
+
+    def _client(self, url: str):
+        parts = urlsplit(url)
+        key = (parts.scheme, parts.netloc)
+        with self._lock:
+            client = self._clients.get(key)
+            if client is not None:
+                self._clients.move_to_end(key)
+                return client
+            client = self._httpx.Client(
+                http2=self.http2,
+                limits=self._httpx.Limits(
+                    max_connections=self.pool_size,
+                    max_keepalive_connections=self.pool_size
+                )
+            )
+            self._clients[key] = client
+            if len(self._clients) > POOL_HOSTS:
+                _, evicted = self._clients.popitem(last=False)
+                evicted.close()
+            return client
+
+    def get(
+            self,
+            url: str,
+            params: Dict[str, Any],
+            headers: Dict[str, str],
+            timeout: float
+    ) -> Dict[str, Any]:
+        r = self._client(url).get(
+            url,
+            params=params,
+            headers=headers,
+            timeout=timeout,
+        )
+        return r.json()
+
+    def close(self) -> None:
+        with self._lock:
+            clients = list(self._clients.values())
+            self._clients.clear()
+        for client in clients:
+            client.close()
@@ -1,15 +1,107 @@
+import array
+import collections
 import logging
+import os
 import re
-import requests
-import html
-from typing import Dict, Any, List
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Dict, Any, List, Callable, Iterable, Iterator, Optional, Sequence, Set, Tuple
 
-import wikipediaapi.natlang
+from wikipediaapi.cursor import Cursor, PREFIXES
+from wikipediaapi.latency import DeadlineExceeded, Deadlines, Hedger
+from wikipediaapi.memory import MemoryBudget
 log = logging.getLogger(__name__)
 
 # https://www.mediawiki.org/wiki/API:Main_page
 
-PagesDict = Dict[str, 'WikipediaPage']
+# Maximum number of titles in a single query for regular users.
+BATCH_SIZE = 50
+
+# Page properties, which `fetch_all` requests for many titles at once.
+# Limit is shared by all titles, so the rest comes with continuation.
+BATCHED_PROPS = {
+    'langlinks': {'lllimit': 500, 'llprop': 'url'},
+    'links': {'pllimit': 500},
+    'categories': {'cllimit': 500},
+}
+
+# Result of `Wikipedia.resolve`, redirect is None for regular pages.
+Resolution = collections.namedtuple(
+    'Resolution',
+    ['title', 'exists', 'pageid', 'normalized', 'redirect']
+)
+
+def _join(values) -> str:
+    if isinstance(values, (str, int)):
+        return str(values)
+    return '|'.join(str(v) for v in values)
+
+
+# Default endpoint, `{language}` is replaced by language of the page.
+API_URL = 'https://{language}.wikipedia.org/w/api.php'
+
+# https://www.mediawiki.org/w/api.php?action=help&modules=query%2Binfo
+# Values of inprop in the order, in which they are requested.
+# `watchers`, `visitingwatchers` and `preload` are expensive for servers.
+INFO_PROPS = [
+    'protection',
+    'talkid',
+    'watched',
+    'watchers',
+    'visitingwatchers',
+    'notificationtimestamp',
+    'subjectid',
+    'url',
+    'readable',
+    'preload',
+    'displaytitle'
+]
+
+# Attributes, which are returned only when the inprop value is requested.
+# Other attributes of prop=info are always returned.
+INFO_ATTRIBUTES = {
+    'protection': 'protection',
+    'restrictiontypes': 'protection',
+    'talkid': 'talkid',
+    'watched': 'watched',
+    'watchers': 'watchers',
+    'visitingwatchers': 'visitingwatchers',
+    'notificationtimestamp': 'notificationtimestamp',
+    'subjectid': 'subjectid',
+    'fullurl': 'url',
+    'editurl': 'url',
+    'canonicalurl': 'url',
+    'readable': 'readable',
+    'preload': 'preload',
+    'displaytitle': 'displaytitle',
+}
+
+
+def info_props(attributes: Iterable[str]) -> List[str]:
+    """
+    Returns minimal list of inprop values needed for `attributes`.
+    """
+    needed = set(
+        INFO_ATTRIBUTES[a] for a in attributes if a in INFO_ATTRIBUTES
+    )
+    return [p for p in INFO_PROPS if p in needed]
+
+
+class PagesDict(dict):
+    """
+    Dictionary of pages, which can fetch data for all of them at once.
+    """
+
+    def __init__(self, wiki: 'Wikipedia') -> None:
+        super(PagesDict, self).__init__()
+        self.wiki = wiki
+
+    def fetch_all(
+            self,
+            props: Sequence[str] = ('info',),
+            workers: int = 8
+    ) -> Iterator['WikipediaPage']:
+        return self.wiki.fetch_all(list(self.values()), props, workers)
 
 
 class ExtractFormat(object):  # (Enum):
@@ -78,6 +170,73 @@ HTML_PATTERN = re.compile(
 HTML_TITLE = lambda match: match.group(5)
 HTML_LEVEL = lambda match: int(match.group(1).strip())
 
+# Heading is tuple of start, end, title and level
+Heading = Tuple[int, int, str, int]
+
+
+def wiki_headings(extract: str) -> Iterator[Heading]:
+    for match in WIKI_PATTERN.finditer(extract):
+        yield match.start(), match.end(), WIKI_TITLE(match), WIKI_LEVEL(match)
+
+
+HTML_TITLE_PREFIX = re.compile(
+    r'(<span[^>]*></span>)? *(<span[^>]*>)? *(<span[^>]*></span>)? *'
+)
+# Example page with 'Edit' erroneous links: https://bit.ly/2ui4FWs
+HTML_EDIT_SPAN = '<span>Edit</span>'
+
+
+def html_headings(extract: str) -> Iterator[Heading]:
+    """
+    Finds headings in HTML extract in linear time. It returns the same
+    headings as `HTML_PATTERN`, but it does not backtrack over the text.
+    """
+    prev_end = 0
+    pos = extract.find('<h')
+    while pos != -1:
+        level = extract[pos + 2:pos + 3]
+        open_end = extract.find('>', pos + 3)
+        if not level.isdigit() or open_end == -1:
+            pos = extract.find('<h', pos + 2)
+            continue
+
+        line_end = extract.find('\n', open_end)
+        if line_end == -1:
+            line_end = len(extract)
+        close = extract.find('</h', open_end, line_end)
+        while close != -1 and not (
+            extract[close + 3:close + 4].isdigit() and
+            extract[close + 4:close + 5] == '>'
+        ):
+            close = extract.find('</h', close + 3, line_end)
+        if close == -1:
+            # headings opened later on the same line, whose tag ends
+            # before `line_end`, have no closing tag either
+            last = extract.rfind('>', open_end, line_end)
+            pos = extract.find('<h', max(pos + 2, last - 2))
+            continue
+
+        start = pos
+        while start > prev_end and extract[start - 1] == ' ':
+            start -= 1
+        if start > prev_end and extract[start - 1] == '\n':
+            start -= 1
+        end = close + 5
+        if extract[end:end + 1] == '\n':
+            end += 1
+
+        title = extract[open_end + 1:close]
+        title = title[HTML_TITLE_PREFIX.match(title).end():]
+        if title.endswith(HTML_EDIT_SPAN):
+            title = title[:-len(HTML_EDIT_SPAN)]
+        if title.endswith('</span>'):
+            title = title[:-len('</span>')]
+        title = title.rstrip(' ')
+
+        yield start, end, title, int(level)
+        prev_end = end
+        pos = extract.find('<h', end)
+
 
 def wiki_query(params):
     p = dict(params)
@@ -86,20 +245,9 @@ def wiki_query(params):
     return p
 
 
-RE_SECTION = {
-    ExtractFormat.WIKI: re.compile(r'\n\n *(===*) (.*?) (===*) *\n'),
-    ExtractFormat.HTML: re.compile(
-        r'\n? *<h(\d)[^>]*?>(<span[^>]*><\/span>)? *' +
-        '(<span[^>]*>)? *(<span[^>]*><\/span>)? *(.*?) *' +
-        '(<\/span>)?(<span>Edit<\/span>)?<\/h\d>\n?'
-        #                  ^^^^
-        # Example page with 'Edit' erroneous links: https://bit.ly/2ui4FWs
-    ),
-    # ExtractFormat.PLAIN.value: re.compile(r'\n\n *(===*) (.*?) (===*) *\n'),
-}
-
-
 def natlang_html_cleanup(html):
+    # html.parser is imported only, when NATLANG format is used
+    import wikipediaapi.natlang
     nl = wikipediaapi.natlang.HtmlParser()
     nl.feed(html)
     return nl.get_text()
@@ -113,41 +261,179 @@ class Wikipedia(object):
             user_agent=(
             'Wikipedia-API (https://github.com/martin-majlis/Wikipedia-API)'
             ),
-            timeout=10.0
+            timeout=10.0,
+            pool_size=10,
+            lazy_sections=False,
+            api_url=API_URL,
+            transport=None,
+            info_attributes=None,
+            memory_budget=None,
+            title_cache=None,
+            operation_timeout=None,
+            hedge_api_url=None,
+            hedge_percentile=95.0,
+            title_pool=None,
+            prefetcher=None
     ) -> None:
         '''
         Language of the API being requested.
         Select language from `list of all Wikipedias:
             <http://meta.wikimedia.org/wiki/List_of_Wikipedias>`.
+
+        Instance can be shared between threads. All requests go through
+        one `transport`, by default `RequestsTransport` keeping up to
+        `pool_size` connections per host. Requests are sent to `api_url`,
+        so it can point to a local mirror.
+
+        `info_attributes` lists attributes, which should be fetched with
+        `info`. Only inprop values needed for them are requested and the
+        others are requested later, when they are accessed. By default,
+        all of them are requested at once.
+
+        With `memory_budget` (in bytes), approximate size of fetched
+        sections and links is tracked and the least recently used ones
+        are dropped, when it is exceeded. They are fetched again, when
+        they are accessed.
+
+        With `title_cache` (see `wikipediaapi.titles.TitleCache`),
+        normalizations and redirects from all responses are remembered.
+        `page` then returns pages with canonical titles and `resolve`
+        answers already known titles without any request.
+
+        `timeout` limits every request, `operation_timeout` limits all
+        requests needed for one property of the page, e.g. all rounds
+        of continuation of `backlinks`. When it passes, `DeadlineExceeded`
+        is raised. Longer operations can be limited with `deadline`.
+
+        With `hedge_api_url`, requests slower than `hedge_percentile` of
+        recent latencies are sent again to this endpoint and the first
+        answer is used.
+
+        With `title_pool` (see `wikipediaapi.titles.TitlePool`), titles
+        of linked pages are shared, so every title is stored only once.
+        Titles given to `page` are normalized and shared as well. One
+        pool can be shared by several instances.
+
+        With `prefetcher` (see `wikipediaapi.prefetch.Prefetcher`),
+        properties likely accessed after the accessed one are fetched
+        in background.
+
+        With `lazy_sections`, `summary` downloads only the introduction,
+        `section_titles` only the outline of the page and `section_by_title`
+        only the section itself. Whole extract is downloaded when all
+        sections are needed.
         '''
         self.language = language.strip().lower()
         self.user_agent = user_agent
         self.extract_format = extract_format
         self.timeout = timeout
+        self.lazy_sections = lazy_sections
+        self.titles = title_cache
+        self.title_pool = title_pool
+        self.memory = None
+        if memory_budget is not None:
+            self.memory = MemoryBudget(memory_budget)
+        if info_attributes is None:
+            self.info_props = INFO_PROPS
+        else:
+            self.info_props = info_props(info_attributes)
+        self.api_url = api_url
+        self.operation_timeout = operation_timeout
+        self.deadlines = Deadlines()
+        self.hedge_api_url = hedge_api_url
+        self.hedger = None
+        if hedge_api_url is not None:
+            # primary and hedged request of every connection
+            self.hedger = Hedger(hedge_percentile, workers=2 * pool_size)
+        self.prefetcher = prefetcher
+        self.pool_size = pool_size
+        self._transport = transport
+        self._own_transport = False
+        self._transport_lock = threading.Lock()
         self.cleanup = str.strip
         self.combine_sections = lambda title, level: title
 
         if self.extract_format == ExtractFormat.WIKI:
             self.extend_query = wiki_query
-            self.pattern = WIKI_PATTERN
-            self.extract_title = WIKI_TITLE
-            self.extract_level = WIKI_LEVEL
+            self.headings = wiki_headings
         elif self.extract_format == ExtractFormat.HTML or self.extract_format == ExtractFormat.NATLANG:
             self.extend_query = lambda q: q
-            self.pattern = HTML_PATTERN
-            self.extract_title = HTML_TITLE
-            self.extract_level = HTML_LEVEL
+            self.headings = html_headings
 
             if self.extract_format == ExtractFormat.NATLANG:
                 self.cleanup = natlang_html_cleanup
             elif self.extract_format == ExtractFormat.HTML:
                 self.combine_sections = lambda title, level: "<h{}>{}</h{}>".format(level, title, level)
 
+    @property
+    def transport(self):
+        """
+        Default transport is created on the first request, so `requests`
+        is not imported by users, who do not send any.
+        """
+        if self._transport is None:
+            with self._transport_lock:
+                if self._transport is None:
+                    from wikipediaapi.transport import RequestsTransport
+                    self._transport = RequestsTransport(self.pool_size)
+                    self._own_transport = True
+        return self._transport
+
+    @transport.setter
+    def transport(self, transport) -> None:
+        self._transport = transport
+        self._own_transport = False
+
+    def close(self) -> None:
+        """
+        Stops threads of the hedger and closes the default transport.
+        Transport and prefetcher given by the user may be shared with
+        other instances, so they stay open.
+        """
+        if self.hedger is not None:
+            self.hedger.close()
+        with self._transport_lock:
+            if self._own_transport:
+                self._transport.close()
+                self._transport = None
+                self._own_transport = False
+
+    def __enter__(self) -> 'Wikipedia':
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.close()
+
+    @property
+    def memory_footprint(self) -> int:
+        """
+        Approximate size of tracked data in bytes, it is tracked only
+        with `memory_budget`.
+        """
+        if self.memory is None:
+            return 0
+        return self.memory.footprint
+
+    def deadline(self, seconds: float):
+        """
+        Context manager limiting time of all requests sent by the current
+        thread within it to `seconds`.
+
+            with wiki.deadline(2.0):
+                page.summary
+                page.backlinks
+        """
+        return self.deadlines.budget(seconds)
+
     def page(
             self,
             title: str,
             ns: int = 0
     ) -> 'WikipediaPage':
+        if self.titles is not None:
+            title = self.titles.canonical(self.language, title)
+        if self.title_pool is not None:
+            title = self.title_pool.title(self.language, title)
         return WikipediaPage(
             self,
             title=title,
@@ -155,6 +441,60 @@ class Wikipedia(object):
             language=self.language
         )
 
+    def map(
+            self,
+            fn: Callable[['WikipediaPage'], Any],
+            titles: Iterable[str],
+            workers: int = 4,
+            ns: int = 0
+    ) -> List[Any]:
+        """
+        Applies `fn` on pages with given titles using pool of `workers`
+        threads. Results are returned in the same order as titles.
+        """
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            return list(executor.map(
+                lambda title: fn(self.page(title, ns)),
+                titles
+            ))
+
+    def fetch_all(
+            self,
+            pages: Iterable['WikipediaPage'],
+            props: Sequence[str] = ('info',),
+            workers: int = 8
+    ) -> Iterator['WikipediaPage']:
+        """
+        Fetches `props` of pages, which may be in different languages.
+        Pages are grouped by language and every language is fetched in
+        its own thread. `info` and `BATCHED_PROPS` are requested in
+        batches, other props page by page. Pages are yielded as soon as
+        all pages of their language are done.
+        """
+        by_language = {}  # type: Dict[str, List[WikipediaPage]]
+        for page in pages:
+            by_language.setdefault(page.language, []).append(page)
+
+        def fetch_language(language_pages):
+            for prop in props:
+                if prop == 'info':
+                    self.fetch_info(language_pages)
+                elif prop in BATCHED_PROPS:
+                    self._fetch_batched(language_pages, prop)
+                else:
+                    for page in language_pages:
+                        page._fetch(prop)
+            return language_pages
+
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            futures = [
+                executor.submit(fetch_language, language_pages)
+                for language_pages in by_language.values()
+            ]
+            for future in as_completed(futures):
+                for page in future.result():
+                    yield page
+
     def _structured(
         self,
         page: 'WikipediaPage'
@@ -176,52 +516,423 @@ class Wikipedia(object):
         pages = raw['query']['pages']
         for k, v in pages.items():
             if k == '-1':
-                page._attributes['pageid'] = -1
+                page.pageid = -1
                 return page
             else:
                 return self._build_structured(v, page)
         return page
 
-    def _info(
+    def _intro(
         self,
         page: 'WikipediaPage'
     ) -> 'WikipediaPage':
         """
-        https://www.mediawiki.org/w/api.php?action=help&modules=query%2Binfo
-        https://www.mediawiki.org/wiki/API:Info
+        https://www.mediawiki.org/wiki/Extension:TextExtracts#API
         """
-        params = {
+        v = self._extract(page, {'exintro': 1})
+        if v is not None:
+            page._summary = self.cleanup(v['extract'])
+        return page
+
+    def _extract(
+        self,
+        page: 'WikipediaPage',
+        limits: Dict[str, Any]
+    ):
+        params = self.extend_query({
             'action': 'query',
-            'prop': 'info',
-            'titles': page.title,
-            'inprop': '|'.join([
-                'protection',
-                'talkid',
-                'watched',
-                'watchers',
-                'visitingwatchers',
-                'notificationtimestamp',
-                'subjectid',
-                'url',
-                'readable',
-                'preload',
-                'displaytitle'
-            ])
+            'prop': 'extracts',
+            'titles': page.title
+        })
+        params.update(limits)
+        raw = self._query(
+            page,
+            params
+        )
+        self._common_attributes(raw['query'], page)
+        pages = raw['query']['pages']
+        for k, v in pages.items():
+            if k == '-1':
+                page.pageid = -1
+                return None
+            else:
+                self._common_attributes(v, page)
+                return v
+        return None
+
+    def _outline(
+        self,
+        page: 'WikipediaPage'
+    ) -> 'WikipediaPage':
+        """
+        https://www.mediawiki.org/w/api.php?action=help&modules=parse
+        https://www.mediawiki.org/wiki/API:Parsing_wikitext
+        """
+        params = {
+            'action': 'parse',
+            'page': page.title,
+            'prop': 'sections',
         }
         raw = self._query(
             page,
             params
         )
+        if 'parse' not in raw:
+            page.pageid = -1
+            return page
+
+        import html
+        self._common_attributes(raw['parse'], page)
+        page._section_titles = []
+        page._outline = []
+        for section in raw['parse']['sections']:
+            title = html.unescape(re.sub(r'<[^>]*>', '', section['line']))
+            page._section_titles.append(title)
+            # sections transcluded from templates have index 'T-1'
+            if section['index'].isdigit():
+                page._outline.append(
+                    (int(section['index']), int(section['level']) - 1, title)
+                )
+        return page
+
+    def _section(
+        self,
+        page: 'WikipediaPage',
+        index: int
+    ) -> Optional[str]:
+        """
+        Returns text of the section with given index without texts of
+        its subsections.
+
+        https://www.mediawiki.org/w/api.php?action=help&modules=parse
+        """
+        params = {
+            'action': 'parse',
+            'page': page.title,
+            'prop': 'text',
+            'section': index,
+            'disableeditsection': 1,
+            'disabletoc': 1,
+        }
+        raw = self._query(
+            page,
+            params
+        )
+        if 'parse' not in raw:
+            page.pageid = -1
+            return None
+
+        text = raw['parse']['text']['*']
+        # text starts with heading of the section, its subsections follow
+        headings = list(html_headings(text))
+        if headings:
+            end = headings[1][0] if len(headings) > 1 else len(text)
+            text = text[headings[0][1]:end]
+        if self.extract_format == ExtractFormat.HTML:
+            return text.strip()
+        return natlang_html_cleanup(text).strip()
+
+    def _info(
+        self,
+        page: 'WikipediaPage',
+        props: List[str] = None
+    ) -> 'WikipediaPage':
+        """
+        https://www.mediawiki.org/w/api.php?action=help&modules=query%2Binfo
+        https://www.mediawiki.org/wiki/API:Info
+        """
+        if props is None:
+            props = self.info_props
+        params = self._info_params(page.title, props)
+        page._info_props.update(props)
+        raw = self._query(
+            page,
+            params
+        )
         self._common_attributes(raw['query'], page)
         pages = raw['query']['pages']
         for k, v in pages.items():
             if k == '-1':
-                page._attributes['pageid'] = -1
+                page.pageid = -1
                 return page
             else:
                 return self._build_info(v, page)
         return page
 
+    def _info_params(
+        self,
+        titles: str,
+        props: List[str]
+    ) -> Dict[str, Any]:
+        params = {
+            'action': 'query',
+            'prop': 'info',
+            'titles': titles,
+        }
+        if props:
+            params['inprop'] = '|'.join(props)
+        return params
+
+    def fetch_info(
+        self,
+        pages: List['WikipediaPage'],
+        attributes: Iterable[str] = None
+    ) -> List['WikipediaPage']:
+        """
+        Resolves attributes of all given pages with as few requests as
+        possible. Titles are sent in groups of `BATCH_SIZE` per language.
+        When `attributes` are given, only inprop values needed for them
+        are requested.
+
+        https://www.mediawiki.org/wiki/API:Query#Specifying_pages
+        """
+        for group in self._group_pages(
+            [p for p in pages if not p._called['info']]
+        ):
+            props = self.info_props
+            if attributes is not None:
+                props = info_props(attributes)
+            params = self._info_params(
+                '|'.join(collections.OrderedDict.fromkeys(
+                    p.title for p in group
+                )),
+                props
+            )
+            raw = self._query(
+                group[0],
+                params
+            )
+            self._learn_titles(group[0].language, raw['query'])
+            for page, v in self._match_pages(raw['query'], group):
+                with page._lock:
+                    if page._called['info']:
+                        continue
+                    page._info_props.update(props)
+                    if v is None or 'pageid' not in v:
+                        page.pageid = -1
+                    else:
+                        self._build_info(v, page)
+                    page._called['info'] = True
+
+        return pages
+
+    def _fetch_batched(
+        self,
+        pages: List['WikipediaPage'],
+        call: str
+    ) -> List['WikipediaPage']:
+        """
+        Fetches one of `BATCHED_PROPS` for groups of `BATCH_SIZE` titles.
+        Items of every page are collected over all continuation rounds
+        before the page is built.
+        """
+        for group in self._group_pages(
+            [p for p in pages if not p._called[call]]
+        ):
+            params = dict(BATCHED_PROPS[call])
+            params.update({
+                'action': 'query',
+                'prop': call,
+                'titles': '|'.join(collections.OrderedDict.fromkeys(
+                    p.title for p in group
+                )),
+            })
+            query = None
+            entries = {}  # type: Dict[str, Dict[str, Any]]
+            while True:
+                raw = self._query(group[0], params)
+                if query is None:
+                    query = raw['query']
+                for k, v in raw['query'].get('pages', {}).items():
+                    entry = entries.setdefault(k, dict(v, **{call: []}))
+                    entry[call].extend(v.get(call, []))
+                if 'continue' not in raw:
+                    break
+                params = dict(params, **raw['continue'])
+
+            query = dict(query, pages=entries)
+            self._learn_titles(group[0].language, query)
+            fetched = []
+            for page, v in self._match_pages(query, group):
+                with page._lock:
+                    if page._called[call]:
+                        continue
+                    if v is None or 'missing' in v or 'invalid' in v:
+                        page.pageid = -1
+                    else:
+                        getattr(self, '_build_' + call)(v, page)
+                    page._called[call] = True
+                    fetched.append(page)
+            if self.memory is not None:
+                for page in fetched:
+                    self.memory.fetched(page, call)
+
+        return pages
+
+    def _group_pages(
+        self,
+        pages: List['WikipediaPage']
+    ) -> List[List['WikipediaPage']]:
+        by_language = {}  # type: Dict[str, List[WikipediaPage]]
+        for page in pages:
+            by_language.setdefault(page.language, []).append(page)
+
+        groups = []
+        for language_pages in by_language.values():
+            for i in range(0, len(language_pages), BATCH_SIZE):
+                groups.append(language_pages[i:i + BATCH_SIZE])
+        return groups
+
+    def _match_pages(
+        self,
+        query,
+        pages: List['WikipediaPage']
+    ):
+        """
+        Pairs requested pages with entries of `query['pages']` by following
+        `normalized` and `redirects` from the requested title.
+        """
+        resolved = self._resolve_titles(query, [p.title for p in pages])
+        for page, (_, _, _, v) in zip(pages, resolved):
+            yield page, v
+
+    def _resolve_titles(
+        self,
+        query,
+        titles: List[str]
+    ) -> Iterator[Tuple[str, str, Any, Any]]:
+        """
+        Yields requested title, normalized title, redirect target (or None)
+        and entry of `query['pages']` (or None) for every title.
+        """
+        normalized = {}
+        for block in ['normalized', 'converted']:
+            for rename in query.get(block, []):
+                normalized[rename['from']] = rename['to']
+        redirects = {}
+        for rename in query.get('redirects', []):
+            redirects[rename['from']] = rename['to']
+
+        by_title = {}
+        for v in query.get('pages', {}).values():
+            by_title[v['title']] = v
+
+        for title in titles:
+            name = normalized.get(title, title)
+            target = None
+            seen = set()
+            while name in redirects and name not in seen:
+                seen.add(name)
+                name = target = redirects[name]
+            yield title, normalized.get(title, title), target, by_title.get(name)
+
+    def resolve(
+        self,
+        titles: Iterable[str],
+        workers: int = 4,
+        results: Dict[str, 'Resolution'] = None
+    ) -> Dict[str, 'Resolution']:
+        """
+        Finds out whether pages exist, their page ids, normalized titles
+        and redirect targets. Titles are sent in groups of `BATCH_SIZE`
+        by `workers` threads.
+
+        Results are stored into `results`, titles already present there
+        are skipped. With persistent mapping, e.g. `shelve`, interrupted
+        resolution continues where it stopped.
+
+        With `title_cache`, known titles are resolved locally and from
+        titles leading to the same page only one is requested.
+        """
+        if results is None:
+            results = {}
+        pending = []
+        deferred = []
+        canonical_titles = set()
+        seen = set()
+        for title in titles:
+            if title in results or title in seen:
+                continue
+            seen.add(title)
+            if self.titles is not None:
+                if self._resolve_cached(title, results):
+                    continue
+                canonical = self.titles.canonical(self.language, title)
+                if canonical in canonical_titles:
+                    deferred.append(title)
+                    continue
+                canonical_titles.add(canonical)
+            pending.append(title)
+
+        def resolve_batch(batch):
+            params = {
+                'action': 'query',
+                'titles': '|'.join(batch),
+            }
+            raw = self._query(
+                WikipediaPage(self, title='', language=self.language),
+                params
+            )
+            self._learn_titles(self.language, raw['query'])
+            return [
+                Resolution(
+                    title=title,
+                    exists=v is not None and 'missing' not in v and 'invalid' not in v,
+                    pageid=v.get('pageid', -1) if v is not None else -1,
+                    normalized=normalized,
+                    redirect=target
+                )
+                for title, normalized, target, v in self._resolve_titles(
+                    raw['query'], batch
+                )
+            ]
+
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            futures = [
+                executor.submit(resolve_batch, pending[i:i + BATCH_SIZE])
+                for i in range(0, len(pending), BATCH_SIZE)
+            ]
+            for future in as_completed(futures):
+                for resolution in future.result():
+                    results[resolution.title] = resolution
+
+        remaining = [
+            title for title in deferred
+            if not self._resolve_cached(title, results)
+        ]
+        if remaining:
+            self.resolve(remaining, workers, results)
+
+        return results
+
+    def _resolve_cached(
+        self,
+        title: str,
+        results: Dict[str, 'Resolution']
+    ) -> bool:
+        cached = self.titles.lookup(self.language, title)
+        if cached is None:
+            return False
+        normalized, target, pageid = cached
+        results[title] = Resolution(
+            title=title,
+            exists=pageid != -1,
+            pageid=pageid,
+            normalized=normalized,
+            redirect=target
+        )
+        return True
+
+    def exists_many(
+        self,
+        titles: Iterable[str],
+        workers: int = 4
+    ) -> Dict[str, bool]:
+        return {
+            title: resolution.exists
+            for title, resolution in self.resolve(titles, workers).items()
+        }
+
     def _langlinks(
         self,
         page: 'WikipediaPage'
@@ -246,7 +957,7 @@ class Wikipedia(object):
         pages = raw['query']['pages']
         for k, v in pages.items():
             if k == '-1':
-                page._attributes['pageid'] = -1
+                page.pageid = -1
                 return page
             else:
                 return self._build_langlinks(v, page)
@@ -260,35 +971,15 @@ class Wikipedia(object):
         https://www.mediawiki.org/w/api.php?action=help&modules=query%2Blinks
         https://www.mediawiki.org/wiki/API:Links
         """
-
-        params = {
-            'action': 'query',
-            'prop': 'links',
-            'titles': page.title,
-            'pllimit': 500,
-        }
-        raw = self._query(
-            page,
-            params
+        cursor = self._continue(page, 'links')
+        if cursor.missing:
+            page.pageid = -1
+            return page
+        return self._build_links(
+            dict(cursor.attributes, links=cursor.items),
+            page
         )
-        self._common_attributes(raw['query'], page)
-        pages = raw['query']['pages']
-        for k, v in pages.items():
-            if k == '-1':
-                page._attributes['pageid'] = -1
-                return page
-            else:
-                while 'continue' in raw:
-                    params['plcontinue'] = raw['continue']['plcontinue']
-                    raw = self._query(
-                        page,
-                        params
-                    )
-                    v['links'] += raw['query']['pages'][k]['links']
-
-                return self._build_links(v, page)
-        return page
-    
+
     def _backlinks(
         self,
         page: 'WikipediaPage'
@@ -297,29 +988,9 @@ class Wikipedia(object):
         https://www.mediawiki.org/w/api.php?action=help&modules=query%2Bbacklinks
         https://www.mediawiki.org/wiki/API:Backlinks
         """
+        cursor = self._continue(page, 'backlinks')
+        return self._build_backlinks({'backlinks': cursor.items}, page)
 
-        params = {
-            'action': 'query',
-            'list': 'backlinks',
-            'bltitle': page.title,
-            'bllimit': 500,
-        }
-        raw = self._query(
-            page,
-            params
-        )
-        self._common_attributes(raw['query'], page)
-        v = raw['query']
-        while 'continue' in raw:
-            params['blcontinue'] = raw['continue']['blcontinue']
-            raw = self._query(
-                page,
-                params
-            )
-            v['backlinks'] += raw['query']['backlinks']
-        return self._build_backlinks(v, page)
-    
-    
     def _categories(
         self,
         page: 'WikipediaPage'
@@ -343,7 +1014,7 @@ class Wikipedia(object):
         pages = raw['query']['pages']
         for k, v in pages.items():
             if k == '-1':
-                page._attributes['pageid'] = -1
+                page.pageid = -1
                 return page
             else:
                 return self._build_categories(v, page)
@@ -357,35 +1028,213 @@ class Wikipedia(object):
         https://www.mediawiki.org/w/api.php?action=help&modules=query%2Bcategorymembers
         https://www.mediawiki.org/wiki/API:Categorymembers
         """
-
-        params = {
-            'action': 'query',
-            'list': 'categorymembers',
-            'cmtitle': page.title,
-            'cmlimit': 500,
-        }
-        raw = self._query(
-            page,
-            params
+        cursor = self._continue(page, 'categorymembers')
+        return self._build_categorymembers(
+            {'categorymembers': cursor.items},
+            page
         )
-        self._common_attributes(raw['query'], page)
-        v = raw['query']
-        while 'continue' in raw:
-            params['cmcontinue'] = raw['continue']['cmcontinue']
+
+    def cursor(
+        self,
+        page: 'WikipediaPage',
+        call: str,
+        filters: Dict[str, str] = None,
+        path: str = None
+    ) -> Cursor:
+        """
+        Returns new cursor for `links`, `backlinks` or `categorymembers`
+        of the page. With `path`, it is saved there after every round.
+        """
+        prefix = PREFIXES[call]
+        if call == 'links':
+            params = {
+                'action': 'query',
+                'prop': 'links',
+                'titles': page.title,
+                'pllimit': 500,
+            }
+        else:
+            params = {
+                'action': 'query',
+                'list': call,
+                prefix + 'title': page.title,
+                prefix + 'limit': 500,
+            }
+        params.update(filters or {})
+        return Cursor(call, page.language, page.title, params, path)
+
+    def advance(
+        self,
+        cursor: Cursor,
+        rounds: int = None,
+        page: 'WikipediaPage' = None
+    ) -> Cursor:
+        """
+        Requests next `rounds` of continuation (all of them by default)
+        and adds received items into the cursor. When request fails,
+        the cursor keeps items and token of all previous rounds, so
+        calling `advance` again continues with the failed round.
+        """
+        if page is None:
+            page = WikipediaPage(
+                self,
+                title=cursor.title,
+                language=cursor.language
+            )
+        done = 0
+        while not cursor.done and (rounds is None or done < rounds):
+            params = dict(cursor.params)
+            if cursor.token is not None:
+                params[cursor.token_name] = cursor.token
             raw = self._query(
                 page,
                 params
             )
-            v['categorymembers'] += raw['query']['categorymembers']
+            self._common_attributes(raw['query'], page)
+            if cursor.call == 'links':
+                items = []
+                for k, v in raw['query']['pages'].items():
+                    if k == '-1':
+                        cursor.missing = True
+                    else:
+                        items = v.get('links', [])
+                        cursor.attributes = {
+                            a: v[a] for a in ['pageid', 'ns', 'title'] if a in v
+                        }
+            else:
+                items = raw['query'][cursor.call]
+            cursor.update(items, raw)
+            done += 1
+        return cursor
+
+    def harvest(
+        self,
+        page: 'WikipediaPage',
+        call: str,
+        path: str
+    ) -> PagesDict:
+        """
+        Fetches `links`, `backlinks` or `categorymembers` of the page and
+        saves progress into `path` after every round. When the file
+        exists, fetching continues from the saved round.
+        """
+        with page._lock:
+            if not page._called[call] and (call, ()) not in page._cursors:
+                if os.path.exists(path):
+                    cursor = Cursor.load(path)
+                    if (cursor.call, cursor.language, cursor.title) != \
+                            (call, page.language, page.title):
+                        raise ValueError(
+                            'Cursor in {} belongs to {}'.format(path, cursor)
+                        )
+                else:
+                    cursor = self.cursor(page, call, path=path)
+                page._cursors[(call, ())] = cursor
+        return getattr(page, call)
+
+    def partial(
+        self,
+        page: 'WikipediaPage',
+        call: str
+    ) -> PagesDict:
+        """
+        Returns pages received so far by unfinished `links`, `backlinks`
+        or `categorymembers` of the page, e.g. after failed request.
+        """
+        if page._called[call]:
+            return getattr(page, '_' + call)
+        cursor = page._cursors.get((call, ()))
+        if cursor is None:
+            return PagesDict(self)
+        return self._pages(page.language, cursor.items)
+
+    def _continue(
+        self,
+        page: 'WikipediaPage',
+        call: str,
+        filters: Dict[str, str] = None
+    ) -> Cursor:
+        """
+        Finishes cursor of the page. Cursor stays in the page, until it
+        is done, so the next attempt continues after failed round.
+        """
+        key = (call, tuple(sorted((filters or {}).items())))
+        cursor = page._cursors.get(key)
+        if cursor is None:
+            cursor = page._cursors[key] = self.cursor(page, call, filters)
+        self.advance(cursor, page=page)
+        del page._cursors[key]
+        return cursor
+
+    def _pages(
+        self,
+        language: str,
+        items: List[Dict[str, Any]]
+    ) -> PagesDict:
+        pages = PagesDict(self)
+        for member in items:
+            title = self._intern(language, member['title'])
+            p = WikipediaPage(
+                wiki=self,
+                title=title,
+                ns=member['ns'],
+                language=language
+            )
+            if 'pageid' in member:
+                p.pageid = member['pageid']
+            pages[title] = p
+        return pages
 
-        return self._build_categorymembers(v, page)
+    def _filtered(
+        self,
+        page: 'WikipediaPage',
+        call: str,
+        filters: Dict[str, str]
+    ) -> PagesDict:
+        """
+        Fetches `backlinks` or `categorymembers` restricted by API
+        parameters in `filters`, so only matching pages are transferred.
+        When all of them were already fetched, namespace filter is
+        applied locally.
+
+        https://www.mediawiki.org/wiki/API:Backlinks
+        https://www.mediawiki.org/wiki/API:Categorymembers
+        """
+        if page._called[call]:
+            pages = self._filter_locally(getattr(page, '_' + call), filters)
+            if pages is not None:
+                return pages
+
+        cursor = self._continue(page, call, filters)
+        return self._pages(page.language, cursor.items)
+
+    def _filter_locally(
+        self,
+        pages: PagesDict,
+        filters: Dict[str, str]
+    ) -> Optional[PagesDict]:
+        """
+        Returns pages in namespaces from the filter or None, when other
+        filters are used.
+        """
+        if len(filters) != 1:
+            return None
+        key, value = next(iter(filters.items()))
+        if key not in ['blnamespace', 'cmnamespace']:
+            return None
+        namespaces = {int(ns) for ns in value.split('|')}
+        result = PagesDict(self)
+        for title, p in pages.items():
+            if p.ns in namespaces:
+                result[title] = p
+        return result
 
     def _query(
         self,
         page: 'WikipediaPage',
         params: Dict[str, Any]
     ):
-        base_url = 'http://' + page.language + '.wikipedia.org/w/api.php'
+        base_url = self.api_url.format(language=page.language)
         headers = {
             'User-Agent': self.user_agent,
             'Accept-Encoding': 'gzip',
@@ -398,13 +1247,28 @@ class Wikipedia(object):
         )
         params['format'] = 'json'
         params['redirects'] = 1
-        r = requests.get(
-            base_url,
-            params=params,
-            headers=headers,
-            timeout=self.timeout,
-        )
-        return r.json()
+        timeout = self.deadlines.timeout(self.timeout)
+        try:
+            if self.hedger is None:
+                return self.transport.get(
+                    base_url,
+                    params,
+                    headers,
+                    timeout
+                )
+            hedge_url = self.hedge_api_url.format(language=page.language)
+            return self.hedger.get(
+                lambda: self.transport.get(base_url, params, headers, timeout),
+                lambda: self.transport.get(hedge_url, params, headers, timeout),
+                timeout
+            )
+        except Exception as e:
+            # timeout of the transport was shortened by the deadline
+            if self.deadlines.expired():
+                raise DeadlineExceeded(
+                    'Deadline of the operation has passed'
+                ) from e
+            raise
 
     def _build_structured(
         self,
@@ -412,50 +1276,78 @@ class Wikipedia(object):
         page
     ):
         self._common_attributes(extract, page)
+        page._sections = []
+        page._section_index = SectionIndex()
+        page._section_titles = []
         section_stack = [page]
-        section = None
-        prev_pos = 0
+        # ids of sections in section_stack, the page itself has -1
+        id_stack = [-1]
 
-        for match in re.finditer(
-            self.pattern,
-            extract['extract']
-        ):
-            # print(match.start(), match.end())
-            if page._summary == '':
-                page._summary = self.cleanup(extract['extract'][0:match.start()])
-            else:
-                section._text = self.cleanup(extract['extract'][prev_pos:match.start()])
+        for section, text, start, end in self._iter_extract(extract['extract']):
+            if section is None:
+                page._summary = text
+                continue
 
-            section = self._create_section(match)
+            section._text = text
             sec_level = section.level + 1
 
             if sec_level > len(section_stack):
                 section_stack.append(section)
             elif sec_level == len(section_stack):
                 section_stack.pop()
+                id_stack.pop()
                 section_stack.append(section)
             else:
                 for _ in range(len(section_stack) - sec_level + 1):
                     section_stack.pop()
+                    id_stack.pop()
                 section_stack.append(section)
 
             section_stack[len(section_stack) - 2]._sections.append(section)
-            # section_stack[sec_level - 1]._sections.append(section)
 
-            # section_stack_pos = sec_level
-
-            prev_pos = match.end()
-            page._section_mapping[section._title] = section
+            id_stack.append(page._section_index.add(
+                section, id_stack[-1], start, end
+            ))
             page._section_titles.append(section._title)
 
-        if prev_pos > 0:
-            section._text = self.cleanup(extract['extract'][prev_pos:])
-
         return page
 
-    def _create_section(self, match):
-        sec_title = self.cleanup(self.extract_title(match))
-        sec_level = self.extract_level(match)
+    def _iter_extract(
+        self,
+        extract: str
+    ) -> Iterator[Any]:
+        """
+        Yields section, its text and offsets of its heading start and its
+        text end in the order of the extract, each one as soon as
+        the following heading is found. Summary is yielded first with
+        section None, when there is any heading.
+        """
+        section = None
+        section_start = 0
+        prev_pos = 0
+
+        for start, end, title, level in self.headings(extract):
+            if section is None:
+                yield None, self.cleanup(extract[0:start]), 0, start
+            else:
+                yield (
+                    section, self.cleanup(extract[prev_pos:start]),
+                    section_start, start
+                )
+
+            section = self._create_section(title, level)
+            section_start = start
+            prev_pos = end
+
+        if prev_pos > 0:
+            yield (
+                section, self.cleanup(extract[prev_pos:]),
+                section_start, len(extract)
+            )
+
+    def _create_section(self, title, level):
+        sec_title = self.cleanup(title)
+        sec_level = level
 
         section = WikipediaPageSection(
             sec_title,
@@ -470,7 +1362,10 @@ class Wikipedia(object):
     ):
         self._common_attributes(extract, page)
         for k, v in extract.items():
-            page._attributes[k] = v
+            # unknown keys could overwrite methods or state of the page
+            if 'info' in page.ATTRIBUTES_MAPPING.get(k, []) or \
+                    k in INFO_ATTRIBUTES:
+                setattr(page, k, v)
 
         return page
 
@@ -483,7 +1378,7 @@ class Wikipedia(object):
         for langlink in extract['langlinks']:
             p = WikipediaPage(
                 wiki=self,
-                title=langlink['*'],
+                title=self._intern(langlink['lang'], langlink['*']),
                 ns=0,
                 language=langlink['lang'],
                 url=langlink['url']
@@ -499,9 +1394,10 @@ class Wikipedia(object):
     ):
         self._common_attributes(extract, page)
         for link in extract['links']:
-            page._links[link['title']] = WikipediaPage(
+            title = self._intern(page.language, link['title'])
+            page._links[title] = WikipediaPage(
                 wiki=self,
-                title=link['title'],
+                title=title,
                 ns=link['ns'],
                 language=page.language
             )
@@ -515,9 +1411,10 @@ class Wikipedia(object):
     ):
         self._common_attributes(extract, page)
         for backlink in extract['backlinks']:
-            page._backlinks[backlink['title']] = WikipediaPage(
+            title = self._intern(page.language, backlink['title'])
+            page._backlinks[title] = WikipediaPage(
                 wiki=self,
-                title=backlink['title'],
+                title=title,
                 ns=backlink['ns'],
                 language=page.language
             )
@@ -532,9 +1429,10 @@ class Wikipedia(object):
     ):
         self._common_attributes(extract, page)
         for category in extract['categories']:
-            page._categories[category['title']] = WikipediaPage(
+            title = self._intern(page.language, category['title'])
+            page._categories[title] = WikipediaPage(
                 wiki=self,
-                title=category['title'],
+                title=title,
                 ns=category['ns'],
                 language=page.language
             )
@@ -548,15 +1446,16 @@ class Wikipedia(object):
     ):
         self._common_attributes(extract, page)
         for member in extract['categorymembers']:
+            title = self._intern(page.language, member['title'])
             p = WikipediaPage(
                 wiki=self,
-                title=member['title'],
+                title=title,
                 ns=member['ns'],
                 language=page.language
             )
             p.pageid = member['pageid']
 
-            page._categorymembers[member['title']] = p
+            page._categorymembers[title] = p
 
         return page
 
@@ -569,12 +1468,32 @@ class Wikipedia(object):
             'title',
             'pageid',
             'ns',
-            'redirects'
+            'redirects',
+            'normalized'
         ]
 
         for attr in common_attributes:
             if attr in extract:
-                page._attributes[attr] = extract[attr]
+                setattr(page, attr, extract[attr])
+        if 'title' in extract:
+            page.title = self._intern(page.language, extract['title'])
+
+        self._learn_titles(page.language, extract)
+
+    def _intern(self, language: str, title: str) -> str:
+        if self.title_pool is None:
+            return title
+        return self.title_pool.intern(language, title)
+
+    def _learn_titles(
+        self,
+        language: str,
+        extract
+    ) -> None:
+        if self.titles is None:
+            return
+        if 'pages' in extract or 'normalized' in extract or 'redirects' in extract:
+            self.titles.learn(language, extract)
 
     def article(
             self,
@@ -626,6 +1545,108 @@ class WikipediaPageSection(object):
         )
 
 
+class SectionIndex(object):
+    """
+    Flat index of all sections of the page in the order of the extract.
+
+    Position of the section in the index is its id. Every section keeps
+    id of its parent (-1 for top level sections), its path (tuple of
+    titles from the top level section) and offsets of its heading start
+    and its text end within the extract.
+    """
+
+    def __init__(self) -> None:
+        self.sections = []  # type: List[WikipediaPageSection]
+        self.paths = []  # type: List[Tuple[str, ...]]
+        self.parents = array.array('l')
+        self.levels = array.array('l')
+        self.starts = array.array('l')
+        self.ends = array.array('l')
+        self._by_path = {}  # type: Dict[Tuple[str, ...], int]
+        self._by_title = {}  # type: Dict[str, List[int]]
+        self._by_level = {}  # type: Dict[int, List[int]]
+
+    def add(
+            self,
+            section: WikipediaPageSection,
+            parent: int = -1,
+            start: int = -1,
+            end: int = -1
+    ) -> int:
+        i = len(self.sections)
+        path = (self.paths[parent] if parent >= 0 else ()) + (section.title,)
+        self.sections.append(section)
+        self.paths.append(path)
+        self.parents.append(parent)
+        self.levels.append(section.level)
+        self.starts.append(start)
+        self.ends.append(end)
+        # of sibling sections with the same title, the last one is found
+        # by path, as by `section_by_title`, the others only by id
+        self._by_path[path] = i
+        self._by_title.setdefault(section.title, []).append(i)
+        self._by_level.setdefault(section.level, []).append(i)
+        return i
+
+    def by_path(self, path: Sequence[str]) -> WikipediaPageSection:
+        return self.sections[self._by_path[tuple(path)]]
+
+    def by_title(self, title: str) -> List[WikipediaPageSection]:
+        return [self.sections[i] for i in self._by_title.get(title, [])]
+
+    def at_level(self, level: int) -> List[WikipediaPageSection]:
+        return [self.sections[i] for i in self._by_level.get(level, [])]
+
+    def id(self, path: Sequence[str]) -> int:
+        return self._by_path[tuple(path)]
+
+    def __getitem__(self, i: int) -> WikipediaPageSection:
+        return self.sections[i]
+
+    def __len__(self) -> int:
+        return len(self.sections)
+
+
+class PageAttribute(object):
+    """
+    Attribute of the page, which is fetched on the first access.
+
+    It is a non-data descriptor, so once the value is stored in the
+    instance dictionary, it is read directly without calling this class.
+    """
+
+    def __init__(
+            self,
+            name: str,
+            calls: List[str]
+    ) -> None:
+        self.name = name
+        self.calls = calls
+
+    def __get__(self, page, owner=None):
+        if page is None:
+            return self
+
+        for call in self.calls:
+            if not page._called[call]:
+                page._use(call)
+                if self.name in page.__dict__:
+                    return page.__dict__[self.name]
+
+        prop = INFO_ATTRIBUTES.get(self.name)
+        if prop is not None:
+            page._fetch_info_props([prop])
+            if self.name in page.__dict__:
+                return page.__dict__[self.name]
+
+        raise AttributeError(
+            "'{}' object has no attribute '{}'".format(
+                type(page).__name__,
+                self.name
+            )
+        )
+
+
 class WikipediaPage(object):
     ATTRIBUTES_MAPPING = {
         "language": [],
@@ -662,18 +1683,30 @@ class WikipediaPage(object):
             url: str = None
     ) -> None:
         self.wiki = wiki
+        self._lock = threading.RLock()
         self._summary = '' # type: str
         self._sections = [] # type: List[WikipediaPageSection]
-        self._section_mapping = {} # type: Dict[str, WikipediaPageSection]
+        self._section_index = SectionIndex()
         self._section_titles = []
-        self._langlinks = {} # type: PagesDict
-        self._links = {} # type: PagesDict
-        self._backlinks = {} # type: PagesDict
-        self._categories = {} # type: PagesDict
-        self._categorymembers = {} # type: PagesDict
-
+        # index, level and title of sections from outline
+        self._outline = []  # type: List[Tuple[int, int, str]]
+        # sections fetched one by one, index -> section
+        self._lazy_sections = {}  # type: Dict[int, WikipediaPageSection]
+        self._langlinks = PagesDict(wiki)
+        self._links = PagesDict(wiki)
+        self._backlinks = PagesDict(wiki)
+        self._categories = PagesDict(wiki)
+        self._categorymembers = PagesDict(wiki)
+
+        self._info_props = set()  # type: Set[str]
+        # unfinished continuations, (call, filters) -> cursor
+        self._cursors = {}  # type: Dict[Tuple[str, Tuple[Tuple[str, str], ...]], Cursor]
+        # (call, filters) -> pages
+        self._filtered = {}  # type: Dict[Tuple[str, Tuple[Tuple[str, str], ...]], PagesDict]
         self._called = {
             'structured': False,
+            'intro': False,
+            'outline': False,
             'info': False,
             'langlinks': False,
             'links': False,
@@ -682,55 +1715,134 @@ class WikipediaPage(object):
             'categorymembers': False,
         }
 
-        self._attributes = {
-            'title': title,
-            'ns': ns,
-            'language': language
-        }
+        self.title = title
+        self.ns = ns
+        self.language = language
 
         if url is not None:
-            self._attributes['fullurl'] = url
-
-    def __getattr__(self, name):
-        if name not in self.ATTRIBUTES_MAPPING:
-            return self.__getattribute__(name)
-
-        if name in self._attributes:
-            return self._attributes[name]
-
-        for call in self.ATTRIBUTES_MAPPING[name]:
-            if not self._called[call]:
-                getattr(self, "_fetch")(call)
-                return self._attributes[name]
+            self.fullurl = url
 
     def exists(self) -> bool:
         return self.pageid != -1
 
     @property
     def summary(self) -> str:
-        if not self._called['structured']:
-            self._fetch('structured')
+        if self._called['structured'] or not self.wiki.lazy_sections:
+            self._use('structured')
+        else:
+            self._use('intro')
         return self._summary
 
     @property
     def sections(self) -> List[WikipediaPageSection]:
-        if not self._called['structured']:
-            self._fetch('structured')
+        self._use('structured')
         return self._sections
 
     @property
     def section_titles(self) -> [str]:
-        if not self._called['structured']:
-            self._fetch('structured')
+        if self._called['structured'] or not self.wiki.lazy_sections:
+            self._use('structured')
+        else:
+            self._use('outline')
         return self._section_titles
 
     def section_by_title(self, title: str) -> WikipediaPageSection:
-        if not self._called['structured']:
-            self._fetch('structured')
-        return self._section_mapping[title]
+        """
+        Returns the last section with given title. Use `section_by_path`
+        or `sections_by_title`, when titles repeat, e.g. "History".
+
+        With `lazy_sections`, only this section is fetched, unless the
+        whole page was already fetched. Such section has no subsections.
+        """
+        if self.wiki.lazy_sections and not self._called['structured']:
+            return self._use_section(title)
+        self._use('structured')
+        sections = self._section_index.by_title(title)
+        if not sections:
+            raise KeyError(title)
+        return sections[-1]
+
+    def sections_by_title(self, title: str) -> List[WikipediaPageSection]:
+        self._use('structured')
+        return self._section_index.by_title(title)
+
+    def section_by_path(self, *path: str) -> WikipediaPageSection:
+        """
+        Returns section by titles of its parents and its own title:
+
+            page.section_by_path('History', 'References')
+
+        When sibling sections have the same title, the last one is
+        returned, as by `section_by_title`.
+        """
+        self._use('structured')
+        return self._section_index.by_path(path)
+
+    def sections_at_level(self, level: int) -> List[WikipediaPageSection]:
+        """
+        Returns all sections of given level (top level sections have 1)
+        in the order of the page.
+        """
+        self._use('structured')
+        return self._section_index.at_level(level)
+
+    @property
+    def section_index(self) -> SectionIndex:
+        self._use('structured')
+        return self._section_index
+
+    def iter_sections(self) -> Iterator[Any]:
+        """
+        Yields pairs of section path (tuple of titles) and section.
+
+        When sections were not fetched yet, the extract is requested and
+        scanned one section after another without building the tree of
+        sections. Such sections have no subsections and they are not
+        stored in the page, so they can be discarded after processing.
+        The response itself is still decoded at once.
+        """
+        if self._called['structured']:
+            index = self._section_index
+            for i in range(len(index)):
+                yield index.paths[i], index.sections[i]
+            return
+
+        v = self.wiki._extract(self, {})
+        if v is None:
+            return
+
+        path = []  # type: List[Tuple[int, str]]
+        for section, text, _, _ in self.wiki._iter_extract(v['extract']):
+            if section is None:
+                continue
+            section._text = text
+            while path and path[-1][0] >= section.level:
+                path.pop()
+            path.append((section.level, section.title))
+            yield tuple(title for _, title in path), section
+
+    def extract(
+            self,
+            chars: int = None,
+            sentences: int = None
+    ) -> str:
+        """
+        Returns beginning of the page limited to given number of
+        characters or sentences. Result is not cached.
+        """
+        limits = {}
+        if chars is not None:
+            limits['exchars'] = chars
+        if sentences is not None:
+            limits['exsentences'] = sentences
+        v = self.wiki._extract(self, limits)
+        if v is None:
+            return ''
+        return self.wiki.cleanup(v['extract'])
 
     @property
     def text(self) -> str:
+        self._use('structured')
         txt = self.summary
         if len(txt) > 0:
             txt += "\n\n"
@@ -754,37 +1866,186 @@ class WikipediaPage(object):
 
     @property
     def langlinks(self) -> PagesDict:
-        if not self._called['langlinks']:
-            self._fetch('langlinks')
+        self._use('langlinks')
         return self._langlinks
 
     @property
     def links(self) -> PagesDict:
-        if not self._called['links']:
-            self._fetch('links')
+        self._use('links')
         return self._links
 
     @property
     def backlinks(self) -> PagesDict:
-        if not self._called['backlinks']:
-            self._fetch('backlinks')
+        self._use('backlinks')
         return self._backlinks
 
     @property
     def categories(self) -> PagesDict:
-        if not self._called['categories']:
-            self._fetch('categories')
+        self._use('categories')
         return self._categories
 
     @property
     def categorymembers(self) -> PagesDict:
-        if not self._called['categorymembers']:
-            self._fetch('categorymembers')
+        self._use('categorymembers')
         return self._categorymembers
 
+    def filtered_backlinks(
+            self,
+            namespace=None,
+            redirects: bool = None
+    ) -> PagesDict:
+        """
+        Returns only backlinks from pages in `namespace` (one or more
+        of `Namespace`). With `redirects` True, only redirects are
+        returned, with False only regular pages.
+        """
+        filters = {}
+        if namespace is not None:
+            filters['blnamespace'] = _join(namespace)
+        if redirects is not None:
+            filters['blfilterredir'] = 'redirects' if redirects else 'nonredirects'
+        return self._use_filtered('backlinks', filters)
+
+    def filtered_categorymembers(
+            self,
+            namespace=None,
+            type=None,
+            sort: str = None,
+            start: str = None,
+            end: str = None
+    ) -> PagesDict:
+        """
+        Returns only members in `namespace` and of `type` (one or more
+        of 'page', 'subcat' and 'file'). With `sort` 'timestamp',
+        `start` and `end` limit time of adding to the category,
+        otherwise they are prefixes of sort keys.
+        """
+        filters = {}
+        if namespace is not None:
+            filters['cmnamespace'] = _join(namespace)
+        if type is not None:
+            filters['cmtype'] = _join(type)
+        if sort is not None:
+            filters['cmsort'] = sort
+        suffix = '' if sort == 'timestamp' else 'sortkeyprefix'
+        if start is not None:
+            filters['cmstart' + suffix] = start
+        if end is not None:
+            filters['cmend' + suffix] = end
+        return self._use_filtered('categorymembers', filters)
+
+    def _use_section(self, title: str) -> WikipediaPageSection:
+        self._use('outline')
+        fetched = False
+        with self._lock, self.wiki.deadline(self.wiki.operation_timeout):
+            matches = [s for s in self._outline if s[2] == title]
+            if not matches:
+                raise KeyError(title)
+            index, level, _ = matches[-1]
+            section = self._lazy_sections.get(index)
+            if section is None:
+                section = WikipediaPageSection(
+                    title,
+                    level,
+                    self.wiki._section(self, index) or ''
+                )
+                self._lazy_sections[index] = section
+                fetched = True
+        if fetched and self.wiki.memory is not None:
+            self.wiki.memory.fetched(self, 'outline')
+        return section
+
+    def _use_filtered(self, call: str, filters: Dict[str, str]) -> PagesDict:
+        if not filters:
+            return getattr(self, call)
+        key = (call, tuple(sorted(filters.items())))
+        fetched = False
+        with self._lock, self.wiki.deadline(self.wiki.operation_timeout):
+            pages = self._filtered.get(key)
+            if pages is None:
+                pages = self.wiki._filtered(self, call, filters)
+                self._filtered[key] = pages
+                fetched = True
+        if self.wiki.memory is not None:
+            if fetched:
+                self.wiki.memory.fetched(self, key)
+            else:
+                self.wiki.memory.touch(self, key)
+        return pages
+
     def _fetch(self, call) -> 'WikipediaPage':
-        getattr(self.wiki, '_' + call)(self)
-        self._called[call] = True
+        fetched = False
+        with self._lock, self.wiki.deadline(self.wiki.operation_timeout):
+            if not self._called[call]:
+                getattr(self.wiki, '_' + call)(self)
+                self._called[call] = True
+                fetched = True
+        # memory budget may invalidate other pages, so it is updated
+        # without holding the lock of this page
+        if fetched and self.wiki.memory is not None:
+            self.wiki.memory.fetched(self, call)
+        return self
+
+    def _use(self, call) -> 'WikipediaPage':
+        prefetcher = self.wiki.prefetcher
+        first = prefetcher is not None and prefetcher.accessed(self, call)
+        if not self._called[call]:
+            self._fetch(call)
+        elif self.wiki.memory is not None:
+            self.wiki.memory.touch(self, call)
+        if first:
+            prefetcher.prefetch(self, call)
+        return self
+
+    def _fetch_info_props(self, props: List[str]) -> 'WikipediaPage':
+        with self._lock:
+            missing = [p for p in props if p not in self._info_props]
+            if missing:
+                self.wiki._info(self, missing)
+                self._called['info'] = True
+        return self
+
+    def _invalidate(self, call) -> 'WikipediaPage':
+        """
+        Drops data fetched by `call`, so they are fetched again on the
+        next access. `call` can be (call, filters) key of filtered list.
+        """
+        if isinstance(call, tuple):
+            with self._lock:
+                self._filtered.pop(call, None)
+            if self.wiki.memory is not None:
+                self.wiki.memory.forget(self, call)
+            return self
+
+        dropped = []  # type: List[Tuple[str, Tuple[Tuple[str, str], ...]]]
+        with self._lock:
+            if call in ['structured', 'intro', 'outline']:
+                self._summary = ''
+                self._sections = []
+                self._section_index = SectionIndex()
+                self._section_titles = []
+                self._outline = []
+                self._lazy_sections = {}
+                for c in ['structured', 'intro', 'outline']:
+                    self._called[c] = False
+            elif call == 'info':
+                for name, calls in self.ATTRIBUTES_MAPPING.items():
+                    if calls == ['info']:
+                        self.__dict__.pop(name, None)
+                self._info_props = set()
+            else:
+                setattr(self, '_' + call, PagesDict(self.wiki))
+                dropped = [k for k in self._filtered if k[0] == call]
+                for key in dropped:
+                    del self._filtered[key]
+                self._cursors = {
+                    k: v for k, v in self._cursors.items() if k[0] != call
+                }
+            self._called[call] = False
+        if self.wiki.memory is not None:
+            self.wiki.memory.forget(self, call)
+            for key in dropped:
+                self.wiki.memory.forget(self, key)
         return self
 
     def __repr__(self):
@@ -799,3 +2060,7 @@ class WikipediaPage(object):
                 self.title,
                 self.ns
             )
+
+
+for _name, _calls in WikipediaPage.ATTRIBUTES_MAPPING.items():
+    setattr(WikipediaPage, _name, PageAttribute(_name, _calls))